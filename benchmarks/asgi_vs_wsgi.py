@@ -0,0 +1,165 @@
+"""Benchmark the game endpoints on the WSGI and ASGI request paths.
+
+Each simulated player starts a game, plays it out with a binary search and
+opens the leaderboard. The WSGI path runs players on a fixed pool of threads,
+like gunicorn sync workers; the ASGI path runs every player concurrently on one
+event loop with the async views. ``--db-latency-ms`` adds a delay to every
+query to model a networked database, which is where the paths differ.
+
+Usage:
+    uv run python benchmarks/asgi_vs_wsgi.py --players 100 --workers 4 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from common import setup_django
+
+
+def seed_players(count: int) -> list[tuple[dict, int, int, tuple[int, int]]]:
+    """Create players with a game each; return (cookies, game id, target, range)."""
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from games.models import Game
+
+    players = []
+    for n in range(count):
+        user = User.objects.create_user(f'bench{n}', f'bench{n}@example.com', 'bench-password')
+        client = Client()
+        client.force_login(user)
+        game = Game.create_game(user, 'expert')
+        players.append((dict(client.cookies), game.pk, game.target_number, game.get_range()))
+    return players
+
+
+def guesses_for(target: int, value_range: tuple[int, int]) -> list[int]:
+    """Binary-search guesses a player makes before hitting the target."""
+    low, high = value_range
+    guesses = []
+    while True:
+        guess = (low + high) // 2
+        guesses.append(guess)
+        if guess == target:
+            return guesses
+        if guess < target:
+            low = guess + 1
+        else:
+            high = guess - 1
+
+
+def player_requests(game_id: int, target: int, value_range: tuple[int, int]):
+    """Yield (method, path, data) for one player's session."""
+    play = f'/game/{game_id}/play/'
+    yield 'post', '/game/new/', {'difficulty': 'easy'}
+    yield 'get', play, None
+    for guess in guesses_for(target, value_range):
+        yield 'post', play, {'guess': guess}
+        if guess != target:
+            yield 'get', play, None
+    yield 'get', '/leaderboard/', None
+
+
+def run_wsgi(players, workers: int) -> list[float]:
+    """Play all sessions on a fixed thread pool through the WSGI handler."""
+    from django.test import Client
+
+    def play(player):
+        cookies, game_id, target, value_range = player
+        client = Client()
+        client.cookies.update(cookies)
+        timings = []
+        for method, path, data in player_requests(game_id, target, value_range):
+            started = time.perf_counter()
+            getattr(client, method)(path, data)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [t for timings in pool.map(play, players) for t in timings]
+
+
+def run_asgi(players) -> list[float]:
+    """Play all sessions concurrently on one event loop through the ASGI handler."""
+    from asgiref.sync import ThreadSensitiveContext
+    from django.test import AsyncClient
+
+    async def play(player):
+        cookies, game_id, target, value_range = player
+        client = AsyncClient()
+        client.cookies.update(cookies)
+        timings = []
+        for method, path, data in player_requests(game_id, target, value_range):
+            started = time.perf_counter()
+            # The ASGI handler gives every request its own sync thread context.
+            async with ThreadSensitiveContext():
+                await getattr(client, method)(path, data)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    async def main():
+        results = await asyncio.gather(*(play(player) for player in players))
+        return [t for timings in results for t in timings]
+
+    return asyncio.run(main())
+
+
+def run_mode(args) -> dict:
+    """Run one benchmark mode in this process and return its statistics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bench.sqlite3'), args.db_latency_ms)
+        players = seed_players(args.players)
+        started = time.perf_counter()
+        if args.mode == 'wsgi':
+            timings = run_wsgi(players, args.workers)
+        else:
+            timings = run_asgi(players)
+        elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        'mode': args.mode,
+        'requests': len(timings),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(timings) / elapsed, 1),
+        'p50_ms': round(statistics.median(timings) * 1000, 2),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def main() -> None:
+    """Run both modes in fresh processes and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4, help='WSGI worker threads.')
+    parser.add_argument('--db-latency-ms', type=float, default=2.0)
+    parser.add_argument('--mode', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args)))
+        return
+
+    for mode in ('wsgi', 'asgi'):
+        env = dict(os.environ, ASYNC_GAME_VIEWS='1' if mode == 'asgi' else '0')
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--players', str(args.players),
+             '--workers', str(args.workers), '--db-latency-ms', str(args.db_latency_ms)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{result['mode']:>5}: {result['requests']} requests in {result['seconds']}s "
+            f"({result['requests_per_second']} req/s, p50 {result['p50_ms']} ms, "
+            f"p95 {result['p95_ms']} ms)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Shared setup for the benchmark scripts."""
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path: str, db_latency_ms: float = 0, keep_debug: bool = False) -> None:
+    """Configure Django against a scratch database with optional query latency.
+
+    ``db_latency_ms`` adds a delay to every query to model a networked database.
+    ``DEBUG`` is turned off unless ``keep_debug`` is set. Rate limits are
+    disabled, since every simulated player shares one client address.
+    """
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'the_guess_game.settings')
+    import django
+    from django.conf import settings
+
+    if not keep_debug:
+        settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.RATE_LIMITS = {}
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.DATABASES['default']['OPTIONS'] = {'timeout': 60}
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db.backends.signals import connection_created
+
+    call_command('migrate', verbosity=0)
+    if db_latency_ms:
+        def delay(execute, sql, params, many, context):
+            time.sleep(db_latency_ms / 1000)
+            return execute(sql, params, many, context)
+
+        def add_delay(sender, connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        connection_created.connect(add_delay, weak=False)
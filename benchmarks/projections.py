@@ -0,0 +1,86 @@
+"""Benchmark materializing leaderboard pages as models versus ``GameRow``s.
+
+Seeds won games, then times fetching pages of the leaderboard as ``Game``
+instances with ``select_related('user')``, as the list views used to, and as
+``GameRow`` projections, and measures the memory each page allocates with
+``tracemalloc``.
+
+Usage:
+    uv run python benchmarks/projections.py --games 20000 --page-size 500
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from common import setup_django
+
+
+def seed(games: int, players: int) -> None:
+    """Create players and won games with bulk inserts."""
+    from django.contrib.auth.models import User
+    from games.models import Game
+
+    users = User.objects.bulk_create(
+        [User(username=f'bench{n}', email=f'bench{n}@example.com') for n in range(players)]
+    )
+    rng = random.Random(0)
+    difficulties = list(Game.DIFFICULTY_RANGES)
+    batch = []
+    for _ in range(games):
+        attempts = rng.randint(1, 10)
+        difficulty = rng.choice(difficulties)
+        batch.append(Game(
+            user=rng.choice(users),
+            difficulty_level=difficulty,
+            target_number=1,
+            attempts_made=attempts,
+            is_won=True,
+            score=(11 - attempts) * 100 * Game.DIFFICULTY_MULTIPLIERS[difficulty],
+        ))
+    Game.objects.bulk_create(batch, batch_size=1000)
+
+
+def measure(fetch, repeat: int) -> dict:
+    """Median wall time and peak traced memory of fetching one page."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    rows = fetch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'rows': len(rows), 'median_ms': round(statistics.median(times) * 1000, 2), 'peak_kib': round(peak / 1024, 1)}
+
+
+def main() -> None:
+    """Seed a scratch database and compare the two page materializations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=20000)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, 'bench.sqlite3'))
+        from games.models import Game
+        from games.projections import Projection
+
+        seed(args.games, args.players)
+        queryset = Game.get_leaderboard()
+        results = {
+            'models': measure(lambda: list(queryset[:args.page_size]), args.repeat),
+            'projection': measure(lambda: Projection(queryset)[:args.page_size], args.repeat),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
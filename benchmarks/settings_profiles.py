@@ -0,0 +1,129 @@
+"""Compare request cost of the main views under the dev and prod settings profiles.
+
+Each profile runs in a fresh process against a scratch SQLite database seeded
+with players and games. For every view the script reports the median and p95
+request time and the number of queries per request.
+
+Usage:
+    uv run python benchmarks/settings_profiles.py --requests 200
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import setup_django
+
+VIEWS = [
+    ('home', '/', False),
+    ('contact', '/contact/', False),
+    ('leaderboard', '/leaderboard/', False),
+    ('profile', '/profile/', True),
+    ('game_play', '/game/{game_id}/play/', True),
+]
+
+
+def seed(players: int) -> tuple:
+    """Create players with finished and active games; return (user, active game)."""
+    from django.contrib.auth.models import User
+    from games.models import Game
+
+    for n in range(players):
+        user = User.objects.create_user(f'bench{n}', f'bench{n}@example.com', 'bench-password')
+        for difficulty in Game.DIFFICULTY_RANGES:
+            game = Game.create_game(user, difficulty)
+            game.check_guess(game.target_number)
+        game = Game.create_game(user, 'expert')
+    return user, game
+
+
+def run_profile(args) -> dict:
+    """Time every view under the current settings profile."""
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    if settings.PRODUCTION:
+        call_command('collectstatic', interactive=False, verbosity=0)
+    user, game = seed(args.players)
+    anonymous = Client()
+    player = Client()
+    player.force_login(user)
+
+    results = {}
+    for name, path, logged_in in VIEWS:
+        client = player if logged_in else anonymous
+        path = path.format(game_id=game.pk)
+        for _ in range(5):
+            client.get(path)
+        timings = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            client.get(path)
+            timings.append(time.perf_counter() - started)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(path)
+        timings.sort()
+        results[name] = {
+            'status': response.status_code,
+            'median_ms': statistics.median(timings) * 1000,
+            'p95_ms': timings[int(len(timings) * 0.95) - 1] * 1000,
+            'queries': len(queries),
+        }
+    return results
+
+
+def main() -> None:
+    """Run both profiles in fresh processes and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--profile', choices=['development', 'production'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        with tempfile.TemporaryDirectory() as tmp:
+            setup_django(str(Path(tmp) / 'bench.sqlite3'), keep_debug=True)
+            print(json.dumps(run_profile(args)))
+        return
+
+    results = {}
+    for profile in ('development', 'production'):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DJANGO_ENV=profile,
+                SECRET_KEY=os.environ.get('SECRET_KEY', 'benchmark-only-secret-key'),
+                STATIC_ROOT=str(Path(tmp) / 'static'),
+                CACHE_DIR=str(Path(tmp) / 'cache'),
+            )
+            output = subprocess.run(
+                [sys.executable, __file__, '--profile', profile,
+                 '--requests', str(args.requests), '--players', str(args.players)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        results[profile] = json.loads(output.strip().splitlines()[-1])
+
+    for profile, views in results.items():
+        failed = {name: view['status'] for name, view in views.items() if view['status'] != 200}
+        if failed:
+            print(f'{profile}: non-200 responses {failed}')
+    print(f"{'view':<12} {'dev median':>11} {'prod median':>12} {'dev p95':>9} {'prod p95':>9} {'queries':>9}")
+    for name, _, _ in VIEWS:
+        dev, prod = results['development'][name], results['production'][name]
+        print(
+            f"{name:<12} {dev['median_ms']:>9.2f}ms {prod['median_ms']:>10.2f}ms "
+            f"{dev['p95_ms']:>7.2f}ms {prod['p95_ms']:>7.2f}ms "
+            f"{dev['queries']:>4}/{prod['queries']:<4}"
+        )
+
+
+if __name__ == '__main__':
+    main()
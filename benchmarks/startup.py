@@ -0,0 +1,78 @@
+"""Measure cold-start cost of the WSGI application.
+
+Each run starts a fresh interpreter, imports ``the_guess_game.wsgi`` and sends
+requests straight to the WSGI callable, reporting import time, first- and
+second-request latency and peak memory. Run it with the same environment as
+production to measure what a gunicorn worker pays at boot.
+
+Usage:
+    uv run python benchmarks/startup.py --runs 5 --path /
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = '''
+import json, os, resource, sys, time
+from wsgiref.util import setup_testing_defaults
+sys.path.insert(0, {base_dir!r})
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'the_guess_game.settings')
+
+started = time.perf_counter()
+from the_guess_game.wsgi import application
+imported = time.perf_counter()
+
+def request():
+    environ = {{'PATH_INFO': {path!r}}}
+    setup_testing_defaults(environ)
+    status = []
+    started = time.perf_counter()
+    body = b''.join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+    return time.perf_counter() - started, status[0]
+
+first, status = request()
+second, _ = request()
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'first_request_ms': first * 1000,
+    'second_request_ms': second * 1000,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'status': status,
+    'modules': len(sys.modules),
+}}))
+'''
+
+
+def main() -> None:
+    """Run the probe in fresh interpreters and print median figures."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/')
+    args = parser.parse_args()
+
+    code = PROBE.format(base_dir=str(BASE_DIR), path=args.path)
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code], check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"GET {args.path} -> {results[0]['status']} ({results[0]['modules']} modules loaded)")
+    for key, label in (
+        ('import_ms', 'import'),
+        ('first_request_ms', 'first request'),
+        ('second_request_ms', 'second request'),
+        ('max_rss_mb', 'peak RSS (MB)'),
+    ):
+        values = [result[key] for result in results]
+        print(f'{label:>15}: median {statistics.median(values):8.2f}  min {min(values):8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Page caching for core app."""
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+
+
+@lru_cache(maxsize=1)
+def template_version() -> str:
+    """Get a version string that changes whenever a deploy changes templates.
+
+    ``TEMPLATE_VERSION`` (e.g. the release's git SHA) is used when set;
+    otherwise the names and modification times of all template files are hashed
+    once per process.
+    """
+    if settings.TEMPLATE_VERSION:
+        return settings.TEMPLATE_VERSION
+    directories = [Path(directory) for config in settings.TEMPLATES for directory in config['DIRS']]
+    directories += [Path(app.path) / 'templates' for app in apps.get_app_configs()]
+    digest = hashlib.sha256()
+    for directory in directories:
+        for path in sorted(directory.rglob('*.html')):
+            digest.update(f'{path}:{path.stat().st_mtime_ns}'.encode())
+    return digest.hexdigest()[:12]
+
+
+def page_cache_key(request) -> str:
+    """Build the cache key for an anonymous page request."""
+    url = hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()
+    return f'page:{template_version()}:{request.method}:{url}'
+
+
+class AnonymousPageCacheMixin:
+    """Serve whole rendered pages from the cache to anonymous visitors.
+
+    Requests are only cached or answered from the cache when the visitor is
+    anonymous and has no pending messages. Responses are only stored when they
+    are a 200, set no cookies and did not use a CSRF token, so per-visitor
+    output never leaks between visitors. Keys include the template version,
+    so a deploy invalidates every cached page.
+    """
+    page_cache_timeout = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return a cached page or render and cache it."""
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = caches[settings.PAGE_CACHE_ALIAS]
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            response.headers['X-Page-Cache'] = 'hit'
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        if (
+            response.status_code == 200
+            and not response.cookies
+            and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        ):
+            timeout = self.page_cache_timeout or settings.PAGE_CACHE_TIMEOUT
+            cache.set(key, response, timeout)
+        response.headers['X-Page-Cache'] = 'miss'
+        return response
+
+    def is_page_cacheable(self, request) -> bool:
+        """Check if the request may be answered from the page cache."""
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            and not len(messages.get_messages(request))
+        )
@@ -0,0 +1,222 @@
+"""Append-only gameplay event log kept off the request database.
+
+``emit()`` queues an event for a background writer thread that appends it
+to size-rotated NDJSON segments in ``EVENT_LOG_DIR``. The queue is bounded:
+when the writer falls behind, emitters wait up to ``EVENT_LOG_BLOCK_SECONDS``
+and the event is then dropped and counted, so a slow disk never stalls
+gameplay for long. Each process writes its own segments, named by their
+start time, and ``read_events()`` merges them back into time order for
+replay and aggregation.
+"""
+import atexit
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+GAME_CREATED = 'game_created'
+GUESS_MADE = 'guess_made'
+GAME_WON = 'game_won'
+GAME_LOST = 'game_lost'
+FEEDBACK_SUBMITTED = 'feedback_submitted'
+EVENT_TYPES = (GAME_CREATED, GUESS_MADE, GAME_WON, GAME_LOST, FEEDBACK_SUBMITTED)
+
+_STOP = object()
+
+
+class EventLog:
+    """Buffered writer of one process's event log segments."""
+
+    def __init__(self, directory: str, max_bytes: int, queue_size: int, block_seconds: float):
+        """Configure the log; the writer thread starts on the first event."""
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.block_seconds = block_seconds
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._pid = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._file = None
+
+    def emit(self, event_type: str, **fields) -> bool:
+        """Queue an event; return False if it was dropped because the queue stayed full."""
+        self._ensure_started()
+        try:
+            self.queue.put({'ts': round(time.time(), 3), 'type': event_type, **fields}, timeout=self.block_seconds)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _ensure_started(self) -> None:
+        """Start the writer thread, again in a process forked after it started."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._file = None
+            self._thread = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        """Write queued events in batches until stopped."""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            events = [event for event in batch if event is not _STOP]
+            if events:
+                try:
+                    self._write(''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in events))
+                except OSError:
+                    self._file = None
+                    self.dropped += len(events)
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                return
+
+    def _write(self, data: str) -> None:
+        """Append lines to the current segment, starting a new one when it is full."""
+        if self._file is None or self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        """Close the current segment and open a new one."""
+        if self._file is not None:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f'events-{time.time_ns()}-{os.getpid()}.ndjson'
+        self._file = open(self.directory / name, 'a', encoding='utf-8')
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued events and stop the writer thread."""
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog | None:
+    """The process-wide event log, or None if ``EVENT_LOG_DIR`` is empty."""
+    global _event_log
+    if not settings.EVENT_LOG_DIR:
+        return None
+    if _event_log is None:
+        with _event_log_lock:
+            if _event_log is None:
+                _event_log = EventLog(
+                    settings.EVENT_LOG_DIR,
+                    settings.EVENT_LOG_MAX_BYTES,
+                    settings.EVENT_LOG_QUEUE_SIZE,
+                    settings.EVENT_LOG_BLOCK_SECONDS,
+                )
+                atexit.register(_event_log.close)
+    return _event_log
+
+
+def emit(event_type: str, **fields) -> None:
+    """Record a gameplay event if the event log is enabled."""
+    event_log = get_event_log()
+    if event_log is not None:
+        event_log.emit(event_type, **fields)
+
+
+def _read_segment(path: Path):
+    """Yield the events of one segment, skipping a torn final line."""
+    with open(path, encoding='utf-8') as segment:
+        for line in segment:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def read_events(directory: str | None = None, since: float | None = None,
+                until: float | None = None, types: set[str] | None = None):
+    """Replay logged events in time order, optionally filtered by time and type.
+
+    ``since`` and ``until`` are POSIX timestamps; ``until`` is exclusive.
+    Segments that started at or after ``until`` are not opened.
+    """
+    directory = Path(directory or settings.EVENT_LOG_DIR)
+    segments = sorted(directory.glob('events-*.ndjson'))
+    if until is not None:
+        segments = [path for path in segments if int(path.stem.split('-')[1]) < until * 1e9]
+    # Each process's segments are in time order; merge all of them by timestamp.
+    by_process = {}
+    for path in segments:
+        by_process.setdefault(path.stem.rsplit('-', 1)[1], []).append(path)
+    streams = [
+        (event for path in paths for event in _read_segment(path))
+        for paths in by_process.values()
+    ]
+    for event in heapq.merge(*streams, key=lambda event: event['ts']):
+        if since is not None and event['ts'] < since:
+            continue
+        if until is not None and event['ts'] >= until:
+            break
+        if types and event['type'] not in types:
+            continue
+        yield event
+
+
+def summarize_events(events) -> dict:
+    """Aggregate replayed events into per-type counts and per-difficulty game stats."""
+    counts = dict.fromkeys(EVENT_TYPES, 0)
+    games = {}
+    ratings = []
+    for event in events:
+        event_type = event['type']
+        counts[event_type] = counts.get(event_type, 0) + 1
+        if event_type == FEEDBACK_SUBMITTED:
+            if event.get('rating') is not None:
+                ratings.append(event['rating'])
+            continue
+        stats = games.setdefault(event['difficulty'], {
+            'created': 0, 'guesses': 0, 'won': 0, 'lost': 0, 'abandoned': 0, 'win_attempts': 0,
+        })
+        if event_type == GAME_CREATED:
+            stats['created'] += 1
+        elif event_type == GUESS_MADE:
+            stats['guesses'] += 1
+        elif event_type == GAME_WON:
+            stats['won'] += 1
+            stats['win_attempts'] += event['attempts']
+        elif event_type == GAME_LOST:
+            stats['lost'] += 1
+            stats['abandoned'] += bool(event.get('abandoned'))
+    for stats in games.values():
+        finished = stats['won'] + stats['lost']
+        stats['win_rate'] = round(stats['won'] / finished * 100, 2) if finished else 0.0
+        stats['mean_attempts_per_win'] = round(stats.pop('win_attempts') / stats['won'], 2) if stats['won'] else None
+    return {
+        'events': counts,
+        'games': games,
+        'feedback': {
+            'count': len(ratings),
+            'mean_rating': round(sum(ratings) / len(ratings), 2) if ratings else None,
+        },
+    }
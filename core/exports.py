@@ -0,0 +1,174 @@
+"""Streaming CSV and NDJSON exports of games, guesses, archived games and feedback."""
+import csv
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.db import models
+from django.utils import timezone
+
+from feedback.models import Feedback
+from games.models import ArchivedGame, Game, Guess
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Columns and filter lookups of one exportable dataset."""
+    model: type[models.Model]
+    columns: dict[str, str]
+    user_lookup: str
+    date_lookup: str
+    difficulty_lookup: str | None = None
+
+
+DATASETS = {
+    'games': ExportSpec(
+        model=Game,
+        columns={
+            'id': 'pk',
+            'user_id': 'user_id',
+            'username': 'user__username',
+            'difficulty': 'difficulty_level',
+            'target_number': 'target_number',
+            'attempts_made': 'attempts_made',
+            'max_attempts': 'max_attempts',
+            'score': 'score',
+            'is_won': 'is_won',
+            'started_at': 'started_at',
+            'completed_at': 'completed_at',
+        },
+        user_lookup='user_id',
+        date_lookup='started_at',
+        difficulty_lookup='difficulty_level',
+    ),
+    'guesses': ExportSpec(
+        model=Guess,
+        columns={
+            'id': 'pk',
+            'game_id': 'game_id',
+            'user_id': 'game__user_id',
+            'difficulty': 'game__difficulty_level',
+            'attempt_number': 'attempt_number',
+            'guess_number': 'guess_number',
+            'feedback': 'feedback',
+            'created_at': 'created_at',
+        },
+        user_lookup='game__user_id',
+        date_lookup='created_at',
+        difficulty_lookup='game__difficulty_level',
+    ),
+    'archived_games': ExportSpec(
+        model=ArchivedGame,
+        columns={
+            'id': 'pk',
+            'user_id': 'user_id',
+            'username': 'user__username',
+            'difficulty': 'difficulty_level',
+            'target_number': 'target_number',
+            'attempts_made': 'attempts_made',
+            'max_attempts': 'max_attempts',
+            'score': 'score',
+            'is_won': 'is_won',
+            'started_at': 'started_at',
+            'completed_at': 'completed_at',
+            'guesses': 'guesses',
+        },
+        user_lookup='user_id',
+        date_lookup='started_at',
+        difficulty_lookup='difficulty_level',
+    ),
+    'feedback': ExportSpec(
+        model=Feedback,
+        columns={
+            'id': 'pk',
+            'user_id': 'user_id',
+            'name': 'name',
+            'email': 'email',
+            'subject': 'subject',
+            'message': 'message',
+            'rating': 'rating',
+            'is_reviewed': 'is_reviewed',
+            'created_at': 'created_at',
+        },
+        user_lookup='user_id',
+        date_lookup='created_at',
+    ),
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_queryset(
+    dataset: str,
+    user_id: int | None = None,
+    difficulty: str | None = None,
+    since: date | None = None,
+    until: date | None = None,
+) -> models.QuerySet:
+    """Rows of a dataset as ``values_list`` tuples in primary key order.
+
+    ``since`` and ``until`` are inclusive calendar days in the current time zone.
+    """
+    spec = DATASETS[dataset]
+    queryset = spec.model._default_manager.values_list(*spec.columns.values()).order_by('pk')
+    if user_id is not None:
+        queryset = queryset.filter(**{spec.user_lookup: user_id})
+    if difficulty:
+        queryset = queryset.filter(**{spec.difficulty_lookup: difficulty})
+    if since:
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        queryset = queryset.filter(**{f'{spec.date_lookup}__gte': start})
+    if until:
+        end = timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min))
+        queryset = queryset.filter(**{f'{spec.date_lookup}__lt': end})
+    return queryset
+
+
+class _LineBuffer:
+    """File-like object that hands back what ``csv.writer`` writes."""
+
+    def write(self, value: str) -> str:
+        """Return the written line instead of storing it."""
+        return value
+
+
+def _json_default(value):
+    """Serialize datetimes in NDJSON rows."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def stream_export(queryset: models.QuerySet, columns: list[str], fmt: str, chunk_size: int = 2000):
+    """Yield a queryset's rows as CSV or NDJSON lines.
+
+    Rows are read with ``iterator(chunk_size)``, which uses a server-side
+    cursor where the database supports one, so memory does not grow with the
+    size of the export.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    if fmt == 'csv':
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), default=_json_default) + '\n'
+
+
+async def aiterate(lines, batch_size: int = 500):
+    """Serve a synchronous export from an async response.
+
+    Batches of lines are pulled on the request's sync thread, where the
+    database cursor lives, and yielded joined together.
+    """
+    iterator = iter(lines)
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)))
+    while batch := await next_batch():
+        yield ''.join(batch)
@@ -0,0 +1,51 @@
+"""Forms for core app."""
+from django import forms
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+
+from games.models import Game
+from .exports import CONTENT_TYPES, DATASETS
+
+
+class ExportForm(forms.Form):
+    """Dataset, format and filters of a data export."""
+    dataset = forms.ChoiceField(choices=[(name, name) for name in DATASETS])
+    format = forms.ChoiceField(choices=[(name, name) for name in CONTENT_TYPES], required=False)
+    user = forms.CharField(required=False, help_text='Username to export data for.')
+    difficulty = forms.ChoiceField(choices=[('', 'All')] + Game.DIFFICULTY_CHOICES, required=False)
+    since = forms.DateField(required=False)
+    until = forms.DateField(required=False)
+
+    def clean_format(self) -> str:
+        """Default to CSV."""
+        return self.cleaned_data.get('format') or 'csv'
+
+    def clean_user(self) -> int | None:
+        """Resolve the username to a user id."""
+        username = self.cleaned_data.get('user')
+        if not username:
+            return None
+        user_id = User.objects.filter(username=username).values_list('pk', flat=True).first()
+        if user_id is None:
+            raise ValidationError(f'No user named {username}.')
+        return user_id
+
+    def clean(self) -> dict:
+        """Validate that the filters apply to the dataset."""
+        cleaned_data = super().clean()
+        dataset = cleaned_data.get('dataset')
+        if dataset and cleaned_data.get('difficulty') and DATASETS[dataset].difficulty_lookup is None:
+            self.add_error('difficulty', f'{dataset.capitalize()} cannot be filtered by difficulty.')
+        since, until = cleaned_data.get('since'), cleaned_data.get('until')
+        if since and until and since > until:
+            raise ValidationError('The start date must not be after the end date.')
+        return cleaned_data
+
+    def filters(self) -> dict:
+        """Keyword arguments for ``export_queryset``."""
+        return {
+            'user_id': self.cleaned_data['user'],
+            'difficulty': self.cleaned_data['difficulty'] or None,
+            'since': self.cleaned_data['since'],
+            'until': self.cleaned_data['until'],
+        }
@@ -0,0 +1,68 @@
+"""Replay or summarize the gameplay event log."""
+import json
+import sys
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.events import EVENT_TYPES, read_events, summarize_events
+
+
+class Command(BaseCommand):
+    """Read the append-only event log without touching the database.
+
+    Segments of every process are merged in time order (see ``core.events``).
+    By default the events are aggregated into per-type counts and
+    per-difficulty game statistics; ``--replay`` writes the matching events
+    back out as NDJSON instead.
+    """
+    help = 'Replay or summarize the gameplay event log.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--dir', default=None,
+            help='Event log directory (default: EVENT_LOG_DIR).',
+        )
+        parser.add_argument(
+            '--since',
+            help='Only events at or after this date, as YYYY-MM-DD.',
+        )
+        parser.add_argument(
+            '--until',
+            help='Only events before this date, as YYYY-MM-DD.',
+        )
+        parser.add_argument(
+            '--type', action='append', choices=EVENT_TYPES, dest='types',
+            help='Only events of this type (repeatable).',
+        )
+        parser.add_argument(
+            '--replay', action='store_true',
+            help='Write the matching events as NDJSON instead of a summary.',
+        )
+
+    def handle(self, *args, **options):
+        """Replay or summarize the log."""
+        directory = options['dir'] or settings.EVENT_LOG_DIR
+        if not directory:
+            raise CommandError('The event log is disabled; set EVENT_LOG_DIR or pass --dir.')
+        since, until = (self.parse_date(options[name], name) for name in ('since', 'until'))
+        events = read_events(directory, since, until, set(options['types'] or ()))
+
+        if options['replay']:
+            for event in events:
+                sys.stdout.write(json.dumps(event, separators=(',', ':')) + '\n')
+            return
+        json.dump(summarize_events(events), sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    def parse_date(self, value: str | None, name: str) -> float | None:
+        """Convert a YYYY-MM-DD option to a POSIX timestamp."""
+        if not value:
+            return None
+        try:
+            return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d')).timestamp()
+        except ValueError as exc:
+            raise CommandError(f'--{name} must look like YYYY-MM-DD.') from exc
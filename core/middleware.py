@@ -0,0 +1,110 @@
+"""Middleware for core app."""
+import math
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .ratelimit import check_rate_limit
+
+# ManifestStaticFilesStorage inserts a 12-character hex digest before the extension.
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=300'
+
+
+class PrecompressedStaticMiddleware:
+    """Serve collected static files, preferring precompressed variants.
+
+    Requests under ``STATIC_URL`` are answered from ``STATIC_ROOT`` before the
+    rest of the middleware stack runs. The ``.br`` or ``.gz`` sibling written by
+    ``CompressedManifestStaticFilesStorage`` is picked by ``Accept-Encoding``,
+    and fingerprinted names are sent with far-future immutable caching. Other
+    files carry ``Last-Modified`` and revalidate with ``If-Modified-Since``.
+    """
+
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        """Store the next handler and the static URL prefix."""
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.root = str(settings.STATIC_ROOT)
+
+    def __call__(self, request):
+        """Serve a static file or pass the request on."""
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name: str):
+        """Build a response for a static file, or None if it does not exist."""
+        try:
+            path = safe_join(self.root, name)
+        except ValueError:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        mtime = os.stat(path).st_mtime
+        headers = {
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': IMMUTABLE_CACHE_CONTROL if HASHED_NAME_RE.search(name) else DEFAULT_CACHE_CONTROL,
+            'Last-Modified': http_date(mtime),
+        }
+        if not was_modified_since(request.headers.get('If-Modified-Since'), mtime):
+            return HttpResponseNotModified(headers=headers)
+
+        content_type, _ = mimetypes.guess_type(path)
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for candidate, suffix in self.ENCODINGS:
+            if re.search(rf'\b{candidate}\b', accepted) and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, candidate
+                break
+
+        response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+        # FileResponse names the file after the open handle; assets need no disposition.
+        del response['Content-Disposition']
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        for header, value in headers.items():
+            response.headers[header] = value
+        return response
+
+
+class RateLimitMiddleware:
+    """Reject writes that exceed the token buckets configured in ``RATE_LIMITS``.
+
+    Only views whose URL name appears in ``RATE_LIMITS`` and requests whose
+    method is in ``RATE_LIMIT_METHODS`` are charged. A rejected request gets a
+    429 with ``Retry-After`` before the view touches the database.
+    """
+
+    def __init__(self, get_response):
+        """Store the next handler."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Pass the request on; limits are applied once the view is resolved."""
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Charge the request against its buckets, returning 429 when empty."""
+        view_name = request.resolver_match.view_name
+        if request.method not in settings.RATE_LIMIT_METHODS or view_name not in settings.RATE_LIMITS:
+            return None
+        wait = check_rate_limit(request, view_name)
+        if not wait:
+            return None
+        response = HttpResponse('Too many requests. Please slow down.', status=429, content_type='text/plain')
+        response.headers['Retry-After'] = str(math.ceil(wait))
+        return response
@@ -1,3 +1,81 @@
-from django.db import models
+"""Shared model utilities for the guessing game application."""
+from typing import Any
 
-# Create your models here.
+
+class DirtyFieldsMixin:
+    """Model mixin that only writes the columns changed since the row was loaded.
+
+    Field values are snapshotted when an instance is loaded from the database
+    and after every save; fields deferred at load time count as changed once
+    they are assigned. A plain ``save()`` on an existing row becomes an
+    ``update_fields`` save of the changed columns (plus any ``auto_now``
+    fields), and is skipped entirely when nothing changed. New instances and
+    explicit ``force_insert``/``update_fields`` saves behave as usual.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Snapshot loaded field values."""
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_fields()
+        return instance
+
+    def _snapshot_fields(self, fields=None) -> None:
+        """Record current values of the given (or all loaded) concrete fields."""
+        snapshot = getattr(self, '_loaded_field_values', None)
+        if snapshot is None or fields is None:
+            snapshot = {}
+        for field in self._meta.concrete_fields:
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+            if field.attname in self.__dict__:
+                snapshot[field.name] = getattr(self, field.attname)
+        self._loaded_field_values = snapshot
+
+    def get_dirty_fields(self) -> dict[str, Any]:
+        """Get changed fields mapped to their current values."""
+        snapshot = getattr(self, '_loaded_field_values', None)
+        if snapshot is None:
+            return {}
+        dirty = {}
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            value = getattr(self, field.attname)
+            # A field missing from the snapshot was deferred at load time and
+            # has been assigned since, so it must be written.
+            if field.name not in snapshot or value != snapshot[field.name]:
+                dirty[field.name] = value
+        return dirty
+
+    def is_dirty(self) -> bool:
+        """Check if any field changed since the instance was loaded or saved."""
+        return bool(self.get_dirty_fields())
+
+    def save(self, *args, **kwargs):
+        """Save only the changed fields of an existing row."""
+        update_fields = kwargs.get('update_fields')
+        tracked = (
+            not args
+            and not self._state.adding
+            and not kwargs.get('force_insert')
+            and update_fields is None
+            and getattr(self, '_loaded_field_values', None) is not None
+        )
+        if tracked:
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            kwargs['update_fields'] = set(dirty) | {
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False)
+            }
+        super().save(*args, **kwargs)
+        self._snapshot_fields(update_fields)
+
+    save.alters_data = True
+
+    def refresh_from_db(self, *args, **kwargs):
+        """Reload fields from the database and snapshot the reloaded values."""
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_fields(kwargs.get('fields'))
@@ -0,0 +1,118 @@
+"""Query-plan inspection for asserting that hot queries use their indexes.
+
+``explain()`` runs ``EXPLAIN QUERY PLAN`` on SQLite or ``EXPLAIN (FORMAT
+JSON)`` on PostgreSQL for a queryset and reports full table scans and sorts
+that spill into a temporary B-tree; ``core.testing.QueryPlanTestCase`` turns
+those into test failures that name a covering index to add.
+"""
+import json
+from dataclasses import dataclass, field
+
+from django.db import connections
+from django.db.models import QuerySet
+
+
+@dataclass
+class QueryPlan:
+    """The plan of one query and the problems found in it."""
+    sql: str
+    lines: list[str]
+    full_scans: list[str] = field(default_factory=list)
+    temp_sorts: list[str] = field(default_factory=list)
+
+    @property
+    def problems(self) -> list[str]:
+        """Plan steps that fall back to a full scan or a temporary sort."""
+        return self.full_scans + self.temp_sorts
+
+
+def _explain_sqlite(cursor, sql: str, params) -> QueryPlan:
+    """Plan a query with SQLite's ``EXPLAIN QUERY PLAN``."""
+    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+    lines = [row[-1] for row in cursor.fetchall()]
+    plan = QueryPlan(sql, lines)
+    # Subqueries run as co-routines or are materialized; scanning their
+    # output is not a table scan.
+    derived = {line.split(' ', 1)[1] for line in lines if line.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+    for line in lines:
+        # "SCAN t USING [COVERING] INDEX i" walks an index in order; a bare
+        # "SCAN t" reads the whole table.
+        if line.startswith('SCAN ') and ' USING ' not in line and line[5:] not in derived:
+            plan.full_scans.append(line)
+        elif line.startswith('USE TEMP B-TREE'):
+            plan.temp_sorts.append(line)
+    return plan
+
+
+def _explain_postgresql(cursor, sql: str, params) -> QueryPlan:
+    """Plan a query with PostgreSQL's ``EXPLAIN``, with sequential scans and sorts discouraged.
+
+    Test tables are tiny, so the planner would otherwise prefer a sequential
+    scan even where an index exists.
+    """
+    cursor.execute('SET LOCAL enable_seqscan = off')
+    cursor.execute('SET LOCAL enable_sort = off')
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+    raw = cursor.fetchone()[0]
+    root = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+    plan = QueryPlan(sql, [])
+    nodes = [(root, 0)]
+    while nodes:
+        node, depth = nodes.pop()
+        line = node['Node Type'] + (f" on {node['Relation Name']}" if 'Relation Name' in node else '')
+        if 'Index Name' in node:
+            line += f" using {node['Index Name']}"
+        plan.lines.append('  ' * depth + line)
+        if node['Node Type'] == 'Seq Scan':
+            plan.full_scans.append(line)
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            plan.temp_sorts.append(f"{line} by {', '.join(node.get('Sort Key', []))}")
+        nodes.extend((child, depth + 1) for child in reversed(node.get('Plans', [])))
+    return plan
+
+
+EXPLAINERS = {
+    'postgresql': _explain_postgresql,
+    'sqlite': _explain_sqlite,
+}
+
+
+def explain(queryset: QuerySet) -> QueryPlan:
+    """Plan a queryset on its database.
+
+    Raises ValueError on database vendors without a plan reader.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor not in EXPLAINERS:
+        raise ValueError(f'Query plans are not supported on {connection.vendor}.')
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        return EXPLAINERS[connection.vendor](cursor, sql, params)
+
+
+def suggest_index(queryset: QuerySet) -> str:
+    """Covering index for a queryset: equality filters, then ordering, then range filters.
+
+    Boolean and null-check filters become a partial index condition rather
+    than leading columns, since SQLite cannot seek on a bare boolean column.
+    """
+    equal, other, condition = [], [], []
+    for child in queryset.query.where.children:
+        target = getattr(getattr(child, 'lhs', None), 'target', None)
+        if target is None:
+            continue
+        lookup = getattr(child, 'lookup_name', None)
+        if lookup in ('exact', 'isnull') and isinstance(child.rhs, bool):
+            suffix = '' if lookup == 'exact' else '__isnull'
+            condition.append(f'{target.name}{suffix}={child.rhs!r}')
+        else:
+            (equal if lookup == 'exact' else other).append(target.name)
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    fields = []
+    for name in equal + ordering + other:
+        if name.lstrip('-') not in {existing.lstrip('-') for existing in fields}:
+            fields.append(name)
+    if condition:
+        return f"models.Index(fields={fields!r}, condition=models.Q({', '.join(condition)}))"
+    return f'models.Index(fields={fields!r})'
+
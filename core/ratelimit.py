@@ -0,0 +1,149 @@
+"""Token-bucket rate limiting for core app."""
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    """Bucket capacity and how long a full refill takes."""
+    capacity: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> 'Rate':
+        """Parse a rate such as '30/m' (30 requests per minute)."""
+        count, _, period = value.partition('/')
+        return cls(int(count), PERIODS[period[:1].lower()])
+
+    @property
+    def refill_per_second(self) -> float:
+        """Tokens added back per second."""
+        return self.capacity / self.period
+
+
+class LocalBucketStore:
+    """In-process bucket store; only suitable for a single process or tests."""
+
+    def __init__(self):
+        """Initialize empty buckets and counters."""
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._counters = {}
+
+    def consume(self, key: str, rate: Rate, now: float) -> float:
+        """Take a token; return 0 on success or seconds until one is available."""
+        with self._lock:
+            state = self._buckets.get(key)
+            wait, self._buckets[key] = take_token(state, rate, now)
+            return wait
+
+    def increment(self, key: str) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def get_counter(self, key: str) -> int:
+        """Get a counter value."""
+        return self._counters.get(key, 0)
+
+
+class CacheBucketStore:
+    """Bucket store in a Django cache shared by all workers.
+
+    Updates are read-modify-write, so concurrent requests for the same bucket
+    may occasionally both pass; limits are approximate under contention.
+    """
+
+    def __init__(self, alias: str):
+        """Use the given cache alias."""
+        self.cache = caches[alias]
+
+    def consume(self, key: str, rate: Rate, now: float) -> float:
+        """Take a token; return 0 on success or seconds until one is available."""
+        wait, state = take_token(self.cache.get(key), rate, now)
+        # Expire once the bucket would have refilled completely anyway.
+        self.cache.set(key, state, math.ceil(rate.period) + 1)
+        return wait
+
+    def increment(self, key: str) -> None:
+        """Increment a counter."""
+        self.cache.add(key, 0, None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, None)
+
+    def get_counter(self, key: str) -> int:
+        """Get a counter value."""
+        return self.cache.get(key, 0)
+
+
+def take_token(state, rate: Rate, now: float) -> tuple[float, tuple[float, float]]:
+    """Refill a bucket state and take one token.
+
+    Return the seconds to wait (0 when a token was taken) and the new state.
+    """
+    tokens, updated = state if state else (rate.capacity, now)
+    tokens = min(rate.capacity, tokens + (now - updated) * rate.refill_per_second)
+    if tokens >= 1:
+        return 0, (tokens - 1, now)
+    return (1 - tokens) / rate.refill_per_second, (tokens, now)
+
+
+_local_store = LocalBucketStore()
+
+
+def get_store():
+    """Get the configured bucket store."""
+    alias = settings.RATE_LIMIT_CACHE_ALIAS
+    return CacheBucketStore(alias) if alias else _local_store
+
+
+def get_client_ip(request) -> str:
+    """Get the client IP, honouring the configured proxy header."""
+    header = settings.RATE_LIMIT_IP_HEADER
+    if header and header in request.META:
+        return request.META[header].split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate_limit(request, view_name: str) -> float:
+    """Charge the request against its user and IP buckets.
+
+    Return 0 if the request may proceed, otherwise seconds until it may retry.
+    Hit and reject counters are recorded per view name.
+    """
+    config = settings.RATE_LIMITS[view_name]
+    store = get_store()
+    now = time.time()
+    buckets = [('ip', get_client_ip(request))]
+    if request.user.is_authenticated:
+        buckets.append(('user', request.user.pk))
+
+    wait = 0
+    for scope, identity in buckets:
+        if scope in config:
+            key = f'ratelimit:{view_name}:{scope}:{identity}'
+            wait = max(wait, store.consume(key, Rate.parse(config[scope]), now))
+
+    store.increment(f'ratelimit:count:{view_name}:{"reject" if wait else "hit"}')
+    return wait
+
+
+def get_counters() -> dict[str, dict[str, int]]:
+    """Get hit and reject counters for every rate-limited view."""
+    store = get_store()
+    return {
+        view_name: {
+            outcome: store.get_counter(f'ratelimit:count:{view_name}:{outcome}')
+            for outcome in ('hit', 'reject')
+        }
+        for view_name in settings.RATE_LIMITS
+    }
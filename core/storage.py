@@ -0,0 +1,47 @@
+"""Static file storage for core app."""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes gzip and brotli siblings.
+
+    ``collectstatic`` fingerprints every file as usual, then writes
+    ``<name>.gz`` (and ``<name>.br`` when the ``brotli`` package is installed)
+    next to each compressible file, so the serving layer never compresses at
+    request time. Variants that do not save at least 5% are skipped.
+    """
+    COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico'}
+    MIN_SIZE = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        """Fingerprint files, then write compressed variants."""
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() in self.COMPRESSIBLE_EXTENSIONS and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name: str) -> None:
+        """Write precompressed variants of a stored file."""
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            content = source.read()
+        if len(content) < self.MIN_SIZE:
+            return
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(content, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(content) * 0.95:
+                with open(path + suffix, 'wb') as target:
+                    target.write(compressed)
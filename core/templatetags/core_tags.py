@@ -0,0 +1,32 @@
+"""Template tags for core app."""
+import json
+import os
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+
+register = template.Library()
+
+COMPILED_CSS_DIR = 'css/dist'
+COMPILED_CSS_MANIFEST = 'manifest.json'
+
+
+@lru_cache(maxsize=1)
+def _read_compiled_css(manifest_path: str, mtime: float) -> str:
+    """Read the compiled stylesheet path from a manifest version."""
+    with open(manifest_path) as manifest:
+        return json.load(manifest).get('app.css', '')
+
+
+@register.simple_tag
+def compiled_css() -> str:
+    """Get the static path of the compiled stylesheet, or '' if it is not built.
+
+    The manifest is re-read only when its modification time changes, so a
+    rebuild is picked up without a restart and a missing build is not cached.
+    """
+    manifest_path = finders.find(f'{COMPILED_CSS_DIR}/{COMPILED_CSS_MANIFEST}')
+    if not manifest_path:
+        return ''
+    return _read_compiled_css(manifest_path, os.path.getmtime(manifest_path))
@@ -0,0 +1,31 @@
+"""Test support for core app."""
+from unittest import SkipTest
+
+from django.db import connections
+from django.db.models import QuerySet
+from django.test import TestCase
+
+from .query_plans import EXPLAINERS, QueryPlan, explain, suggest_index
+
+
+class QueryPlanTestCase(TestCase):
+    """Test case with assertions on the plans of hot queries."""
+
+    def assertIndexedPlan(self, queryset: QuerySet, name: str) -> QueryPlan:
+        """Fail if the query scans a whole table or sorts in a temporary B-tree.
+
+        Skips the test on database vendors whose plans cannot be read.
+        """
+        vendor = connections[queryset.db].vendor
+        if vendor not in EXPLAINERS:
+            raise SkipTest(f'Query plans are not supported on {vendor}.')
+        plan = explain(queryset)
+        if plan.problems:
+            self.fail(
+                f'{name} is not fully served by an index:\n'
+                + '\n'.join(f'  {line}' for line in plan.problems)
+                + '\nPlan:\n' + '\n'.join(f'  {line}' for line in plan.lines)
+                + f'\nSQL: {plan.sql}'
+                + f'\nConsider adding to {queryset.model.__name__}.Meta.indexes: {suggest_index(queryset)}'
+            )
+        return plan
@@ -1,3 +1,408 @@
-from django.test import TestCase
+"""Tests for core app."""
+import csv
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from feedback.models import Feedback
+from games.models import Game
+from users.models import UserProfile
+from . import events
+from .middleware import PrecompressedStaticMiddleware
+from .ratelimit import get_counters
+from .templatetags.core_tags import compiled_css
+from .views import HomeView
+
+
+class DirtyFieldsMixinTests(TestCase):
+    """Saves write only the columns changed since load."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a player with a profile and a game."""
+        cls.user = User.objects.create_user('player', password='pw')
+        cls.game = Game.objects.create(user=cls.user, difficulty_level='easy', target_number=5)
+
+    def test_no_op_save_is_skipped(self):
+        """Saving an unchanged row runs no query."""
+        profile = UserProfile.objects.get(user=self.user)
+        with self.assertNumQueries(0):
+            profile.save()
+
+    def test_changed_fields_are_written(self):
+        """Only changed columns, plus auto_now ones, are in the UPDATE."""
+        profile = UserProfile.objects.get(user=self.user)
+        updated_at = profile.updated_at
+        profile.total_wins = 3
+        self.assertEqual(profile.get_dirty_fields(), {'total_wins': 3})
+        with self.assertNumQueries(1) as queries:
+            profile.save()
+        sql = queries.captured_queries[0]['sql']
+        self.assertIn('"total_wins"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"total_games_played"', sql)
+        self.assertFalse(profile.is_dirty())
+        self.assertGreater(UserProfile.objects.get(pk=profile.pk).updated_at, updated_at)
+
+    def test_explicit_update_fields(self):
+        """An explicit update_fields subset is honoured and leaves other changes dirty."""
+        profile = UserProfile.objects.get(user=self.user)
+        profile.total_wins = 4
+        profile.total_games_played = 9
+        profile.save(update_fields=['total_wins'])
+        stored = UserProfile.objects.get(pk=profile.pk)
+        self.assertEqual((stored.total_wins, stored.total_games_played), (4, 0))
+        self.assertEqual(profile.get_dirty_fields(), {'total_games_played': 9})
+
+    def test_deferred_field_assignment_is_saved(self):
+        """Assigning a field deferred with only() or defer() writes it."""
+        profile = UserProfile.objects.only('pk', 'user_id').get(user=self.user)
+        profile.total_wins = 77
+        profile.save()
+        self.assertEqual(UserProfile.objects.get(pk=profile.pk).total_wins, 77)
+
+        game = Game.objects.defer('score').get(pk=self.game.pk)
+        game.score = 450
+        game.save()
+        self.assertEqual(Game.objects.get(pk=self.game.pk).score, 450)
+
+    def test_deferred_field_read_is_not_dirty(self):
+        """Loading a deferred field on access does not mark it changed."""
+        game = Game.objects.defer('score').get(pk=self.game.pk)
+        self.assertIsNone(game.score)
+        self.assertFalse(game.is_dirty())
+
+
+class RateLimitMiddlewareTests(TestCase):
+    """Rate-limited writes get a 429 with Retry-After once a bucket is empty."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create two players."""
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+
+    def setUp(self):
+        """Start from full buckets and zero counters."""
+        cache.clear()
+
+    def test_registration_limit(self):
+        """The eleventh registration attempt in an hour from one address is rejected."""
+        url = reverse('users:register')
+        for _ in range(10):
+            self.assertNotEqual(self.client.post(url, {}).status_code, 429)
+        response = self.client.post(url, {})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '360')
+        self.assertEqual(get_counters()['users:register'], {'hit': 10, 'reject': 1})
+        # Another address has its own bucket.
+        self.assertNotEqual(self.client.post(url, {}, REMOTE_ADDR='10.0.0.2').status_code, 429)
+
+    def test_get_is_not_limited(self):
+        """Reads of a rate-limited view are never charged."""
+        url = reverse('users:register')
+        for _ in range(15):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(get_counters()['users:register'], {'hit': 0, 'reject': 0})
+
+    @override_settings(RATE_LIMITS={'feedback:feedback': {'user': '2/h', 'ip': '3/h'}})
+    def test_user_and_ip_buckets(self):
+        """Each player and each address have their own bucket, and either can reject."""
+        url = reverse('feedback:feedback')
+        self.client.force_login(self.alice)
+        statuses = [self.client.post(url, {}, REMOTE_ADDR='10.0.0.1').status_code for _ in range(3)]
+        self.assertEqual([status == 429 for status in statuses], [False, False, True])
+        # Alice's bucket is empty whatever address she uses.
+        self.assertEqual(self.client.post(url, {}, REMOTE_ADDR='10.0.0.3').status_code, 429)
+
+        self.client.force_login(self.bob)
+        self.assertNotEqual(self.client.post(url, {}, REMOTE_ADDR='10.0.0.2').status_code, 429)
+        # The first address spent its three tokens on Alice's attempts.
+        self.assertEqual(self.client.post(url, {}, REMOTE_ADDR='10.0.0.1').status_code, 429)
+
+
+class AnonymousPageCacheTests(TestCase):
+    """Anonymous visitors get cached pages; players and visitors with messages never do."""
+
+    def setUp(self):
+        """Start from an empty page cache."""
+        cache.clear()
+
+    def test_miss_then_hit(self):
+        """The first anonymous request renders and stores the page, the next is served from the cache."""
+        for url in (reverse('core:home'), reverse('core:contact')):
+            first = self.client.get(url)
+            self.assertEqual(first.headers['X-Page-Cache'], 'miss')
+            second = self.client.get(url)
+            self.assertEqual(second.headers['X-Page-Cache'], 'hit')
+            self.assertEqual(second.content, first.content)
+
+    def test_logged_in_players_bypass_the_cache(self):
+        """Pages for logged-in players are rendered and never stored."""
+        self.client.force_login(User.objects.create_user('player', password='pw'))
+        response = self.client.get(reverse('core:home'))
+        self.assertNotIn('X-Page-Cache', response.headers)
+        self.assertContains(response, 'player')
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('core:home')).headers['X-Page-Cache'], 'miss')
+
+    def test_pending_messages_bypass_the_cache(self):
+        """A visitor with a pending message gets a fresh page that is not stored."""
+        request = RequestFactory().get(reverse('core:home'))
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        messages.info(request, 'You have been logged out.')
+        response = HomeView.as_view()(request)
+        response.render()
+        self.assertNotIn('X-Page-Cache', response.headers)
+        self.assertContains(response, 'You have been logged out.')
+        self.assertEqual(self.client.get(reverse('core:home')).headers['X-Page-Cache'], 'miss')
+
+
+class ExportViewTests(TestCase):
+    """Staff exports stream the filtered rows of a dataset as CSV or NDJSON."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a staff member and games on two days for two players."""
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+        cls.games = {}
+        for name, user, difficulty, day in (
+            ('alice_easy', cls.alice, 'easy', 1),
+            ('alice_expert', cls.alice, 'expert', 2),
+            ('bob_easy', cls.bob, 'easy', 2),
+        ):
+            game = Game.objects.create(user=user, difficulty_level=difficulty, target_number=5)
+            started_at = timezone.make_aware(datetime(2026, 3, day, 23, 30))
+            Game.objects.filter(pk=game.pk).update(started_at=started_at)
+            cls.games[name] = game.pk
+        Feedback.objects.create(user=cls.alice, name='Alice', email='a@example.com', subject='Hi', message='Fun', rating=5)
+
+    def setUp(self):
+        """Log in as staff."""
+        self.client.force_login(self.staff)
+
+    def export(self, **params) -> list[dict]:
+        """Request an export and parse its rows."""
+        response = self.client.get(reverse('core:export'), params)
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content).decode()
+        if params.get('format') == 'ndjson':
+            self.assertEqual(response.headers['Content-Type'], 'application/x-ndjson')
+            return [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(response.headers['Content-Type'], 'text/csv')
+        self.assertIn(f'filename="{params["dataset"]}-', response.headers['Content-Disposition'])
+        return list(csv.DictReader(body.splitlines()))
+
+    def ids(self, **params) -> list[int]:
+        """Primary keys of the exported rows."""
+        return [int(row['id']) for row in self.export(**params)]
+
+    def test_staff_only(self):
+        """Players are sent to the login page."""
+        self.client.force_login(self.alice)
+        self.assertEqual(self.client.get(reverse('core:export'), {'dataset': 'games'}).status_code, 302)
+
+    def test_filters(self):
+        """Rows are filtered by player, difficulty and inclusive local days, in primary key order."""
+        games = self.games
+        self.assertEqual(self.ids(dataset='games'), [games['alice_easy'], games['alice_expert'], games['bob_easy']])
+        self.assertEqual(self.ids(dataset='games', user='alice'), [games['alice_easy'], games['alice_expert']])
+        self.assertEqual(self.ids(dataset='games', difficulty='easy'), [games['alice_easy'], games['bob_easy']])
+        self.assertEqual(self.ids(dataset='games', since='2026-03-02'), [games['alice_expert'], games['bob_easy']])
+        self.assertEqual(self.ids(dataset='games', until='2026-03-01'), [games['alice_easy']])
+        self.assertEqual(self.ids(dataset='games', user='bob', since='2026-03-02', until='2026-03-02'), [games['bob_easy']])
+
+    def test_ndjson(self):
+        """NDJSON rows are objects keyed by column with ISO datetimes."""
+        rows = self.export(dataset='games', format='ndjson', user='bob')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]['username'], rows[0]['difficulty'], rows[0]['is_won']), ('bob', 'easy', False))
+        self.assertEqual(datetime.fromisoformat(rows[0]['started_at']), timezone.make_aware(datetime(2026, 3, 2, 23, 30)))
+        feedback = self.export(dataset='feedback', format='ndjson')
+        self.assertEqual([(row['user_id'], row['rating']) for row in feedback], [(self.alice.pk, 5)])
+
+    def test_invalid_filters(self):
+        """Unknown players, difficulties on feedback and reversed ranges are rejected."""
+        for params in (
+            {'dataset': 'games', 'user': 'nobody'},
+            {'dataset': 'feedback', 'difficulty': 'easy'},
+            {'dataset': 'games', 'since': '2026-03-02', 'until': '2026-03-01'},
+            {'dataset': 'players'},
+        ):
+            self.assertEqual(self.client.get(reverse('core:export'), params).status_code, 400, params)
+
+
+class EventLogTests(TestCase):
+    """Events are appended to rotated segments and replayed in time order."""
+
+    def setUp(self):
+        """Log into a temporary directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_segment(self, start_ns: int, pid: int, lines: list[str]) -> None:
+        """Write a segment as the writer of another process would."""
+        (self.directory / f'events-{start_ns}-{pid}.ndjson').write_text(''.join(line + '\n' for line in lines))
+
+    def test_rotation(self):
+        """Segments are rotated at the size limit and replay returns every event in order."""
+        # A one-event buffer keeps the writer's batches smaller than a segment.
+        log = events.EventLog(self.directory, max_bytes=200, queue_size=1, block_seconds=1)
+        for number in range(20):
+            self.assertTrue(log.emit(events.GUESS_MADE, game_id=number, difficulty='easy'))
+        log.close()
+        segments = sorted(self.directory.glob('events-*.ndjson'))
+        self.assertGreater(len(segments), 1)
+        replayed = list(events.read_events(self.directory))
+        self.assertEqual([event['game_id'] for event in replayed], list(range(20)))
+        self.assertEqual(log.dropped, 0)
+
+    def test_replay_merges_processes_and_filters(self):
+        """Segments of different processes are merged by timestamp, filtered by time and type."""
+        self.write_segment(1_000_000_000_000, 1, [
+            '{"ts":1000.0,"type":"game_created","difficulty":"easy"}',
+            '{"ts":1002.0,"type":"game_won","difficulty":"easy","attempts":3}',
+        ])
+        self.write_segment(1_000_500_000_000, 2, [
+            '{"ts":1001.0,"type":"guess_made","difficulty":"easy"}',
+            '{"ts":1003.0,"type":"game_lost","difficulty":"easy","abandoned":true}',
+            '{"ts":1004.0,"type":"game_cre',
+        ])
+        self.write_segment(2_000_000_000_000, 1, ['{"ts":2000.0,"type":"game_created","difficulty":"expert"}'])
+        replay = lambda **kwargs: [event['ts'] for event in events.read_events(self.directory, **kwargs)]
+        self.assertEqual(replay(), [1000.0, 1001.0, 1002.0, 1003.0, 2000.0])
+        self.assertEqual(replay(since=1001, until=1003), [1001.0, 1002.0])
+        self.assertEqual(replay(types={events.GAME_WON, events.GAME_LOST}), [1002.0, 1003.0])
+
+        summary = events.summarize_events(events.read_events(self.directory, until=1500))
+        self.assertEqual(summary['events'][events.GAME_CREATED], 1)
+        self.assertEqual(summary['games']['easy'], {
+            'created': 1, 'guesses': 1, 'won': 1, 'lost': 1, 'abandoned': 1,
+            'win_rate': 50.0, 'mean_attempts_per_win': 3.0,
+        })
+
+    def test_command(self):
+        """The command replays matching events as NDJSON or prints a summary."""
+        self.write_segment(1_000_000_000_000, 1, [
+            '{"ts":1000.0,"type":"game_created","difficulty":"easy"}',
+            '{"ts":1001.0,"type":"feedback_submitted","rating":4}',
+        ])
+        out = StringIO()
+        with redirect_stdout(out):
+            call_command('event_log', '--dir', str(self.directory), '--replay', '--type', 'feedback_submitted')
+        self.assertEqual([json.loads(line)['rating'] for line in out.getvalue().splitlines()], [4])
+        out = StringIO()
+        with redirect_stdout(out):
+            call_command('event_log', '--dir', str(self.directory))
+        self.assertEqual(json.loads(out.getvalue())['feedback'], {'count': 1, 'mean_rating': 4.0})
+
+    def test_disabled_outside_production(self):
+        """Without EVENT_LOG_DIR nothing is logged and the command refuses to run."""
+        self.assertIsNone(events.get_event_log())
+        with self.assertRaisesMessage(CommandError, 'The event log is disabled'):
+            call_command('event_log')
+
+
+class CompiledCssTagTests(TestCase):
+    """The compiled stylesheet path follows the build manifest."""
+
+    def setUp(self):
+        """Serve static files from an empty temporary directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.manifest = Path(directory.name) / 'css' / 'dist' / 'manifest.json'
+        override = override_settings(STATICFILES_DIRS=[directory.name])
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def write_manifest(self, name: str, mtime: int) -> None:
+        """Write a manifest naming the compiled stylesheet."""
+        self.manifest.parent.mkdir(parents=True, exist_ok=True)
+        self.manifest.write_text(json.dumps({'app.css': name}))
+        os.utime(self.manifest, (mtime, mtime))
+
+    def test_missing_build_is_not_cached(self):
+        """Without a manifest the tag is empty until a build appears."""
+        self.assertEqual(compiled_css(), '')
+        self.write_manifest('css/dist/app.0123456789ab.css', 1_000_000)
+        self.assertEqual(compiled_css(), 'css/dist/app.0123456789ab.css')
+
+    def test_rebuild_is_picked_up(self):
+        """A rebuilt manifest is re-read without a restart."""
+        self.write_manifest('css/dist/app.0123456789ab.css', 1_000_000)
+        self.assertEqual(compiled_css(), 'css/dist/app.0123456789ab.css')
+        self.write_manifest('css/dist/app.ba9876543210.css', 2_000_000)
+        self.assertEqual(compiled_css(), 'css/dist/app.ba9876543210.css')
+
+
+class PrecompressedStaticMiddlewareTests(TestCase):
+    """Static files are served precompressed, cached and revalidated."""
+
+    def setUp(self):
+        """Collect a fingerprinted stylesheet and an unfingerprinted script into a temporary root."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        root = Path(directory.name)
+        for name in ('app.0123456789ab.css', 'app.js'):
+            (root / name).write_text('body {}')
+            (root / f'{name}.gz').write_bytes(b'gzipped')
+            os.utime(root / name, (1_000_000, 1_000_000))
+        override = override_settings(STATIC_ROOT=root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.middleware = PrecompressedStaticMiddleware(lambda request: None)
+        self.factory = RequestFactory()
+
+    def get(self, name: str, **headers):
+        """Request a static file through the middleware."""
+        return self.middleware(self.factory.get(f'/static/{name}', headers=headers))
+
+    def test_precompressed_variant(self):
+        """The gzip sibling is sent when accepted, with Vary and no Content-Disposition."""
+        response = self.get('app.0123456789ab.css', accept_encoding='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'gzipped')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Content-Type'], 'text/css')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertNotIn('Content-Disposition', response.headers)
+
+        plain = self.get('app.0123456789ab.css')
+        self.assertEqual(b''.join(plain.streaming_content), b'body {}')
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+    def test_revalidation(self):
+        """Unfingerprinted files carry Last-Modified and answer 304 when unchanged."""
+        response = self.get('app.js')
+        self.assertEqual(response.headers['Cache-Control'], 'public, max-age=300')
+        self.assertEqual(response.headers['Last-Modified'], http_date(1_000_000))
+
+        response = self.get('app.js', if_modified_since=http_date(1_000_000), accept_encoding='gzip')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(response.headers['Last-Modified'], http_date(1_000_000))
+
+        self.assertEqual(self.get('app.js', if_modified_since=http_date(999_000)).status_code, 200)
+        self.assertIsNone(self.get('missing.js'))
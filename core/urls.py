@@ -7,6 +7,7 @@ app_name = 'core'
 urlpatterns = [
     path('', views.HomeView.as_view(), name='home'),
     path('contact/', views.ContactView.as_view(), name='contact'),
+    path('exports/', views.ExportView.as_view(), name='export'),
 ]
 
 
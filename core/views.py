@@ -1,12 +1,41 @@
 """Views for core app."""
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.generic import TemplateView
+from .cache import AnonymousPageCacheMixin
+from .exports import CONTENT_TYPES, DATASETS, aiterate, export_queryset, stream_export
+from .forms import ExportForm
 
 
-class HomeView(TemplateView):
+class HomeView(AnonymousPageCacheMixin, TemplateView):
     """Home page view."""
     template_name = 'core/home.html'
 
 
-class ContactView(TemplateView):
+class ContactView(AnonymousPageCacheMixin, TemplateView):
     """Contact page view."""
     template_name = 'core/contact.html'
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ExportView(View):
+    """Stream a CSV or NDJSON export of games, guesses or feedback to staff."""
+
+    def get(self, request):
+        """Validate the filters and stream the export."""
+        form = ExportForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text(), content_type='text/plain')
+        dataset, fmt = form.cleaned_data['dataset'], form.cleaned_data['format']
+        lines = stream_export(export_queryset(dataset, **form.filters()), list(DATASETS[dataset].columns), fmt)
+        if isinstance(request, ASGIRequest):
+            # An async server would otherwise buffer a sync iterator whole.
+            lines = aiterate(lines)
+        response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[fmt])
+        filename = f'{dataset}-{timezone.localdate():%Y%m%d}.{fmt}'
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -1,6 +1,6 @@
 """Admin configuration for feedback app."""
 from django.contrib import admin
-from .models import Feedback
+from .models import Feedback, FeedbackRollup
 
 
 @admin.register(Feedback)
@@ -24,3 +24,8 @@ class FeedbackAdmin(admin.ModelAdmin):
             'fields': ('is_reviewed', 'created_at')
         }),
     )
+
+    def changelist_view(self, request, extra_context=None):
+        """Show the rating rollup summary above the changelist."""
+        extra_context = {'rollup_summary': FeedbackRollup.summary(), **(extra_context or {})}
+        return super().changelist_view(request, extra_context)
@@ -0,0 +1,65 @@
+"""Repair drift in the feedback rating rollups."""
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+from feedback.models import Feedback, FeedbackRollup
+
+
+class Command(BaseCommand):
+    """Recount ``FeedbackRollup`` rows from the Feedback table.
+
+    Feedback is counted per ``(day, rating)`` with one grouped query and
+    compared with the stored rollups; only buckets that drifted (e.g. after
+    a bulk ``update()`` of ``is_reviewed``) are rewritten, in one
+    transaction. ``--dry-run`` only reports them.
+    """
+    help = 'Recount feedback rating rollups and fix any drift.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report drifted buckets without fixing them.',
+        )
+
+    def handle(self, *args, **options):
+        """Run the reconciliation."""
+        expected = {
+            (row['day'], row['rating']): (row['count'], row['reviewed'])
+            for row in (
+                Feedback.objects.annotate(day=TruncDate('created_at'))
+                .values('day', 'rating')
+                .annotate(count=Count('pk'), reviewed=Count('pk', filter=Q(is_reviewed=True)))
+                .order_by()
+            )
+        }
+        with transaction.atomic():
+            stored = {
+                (rollup.day, rollup.rating): rollup
+                for rollup in FeedbackRollup.objects.select_for_update()
+            }
+            changed, created = [], []
+            for key, (count, reviewed) in expected.items():
+                rollup = stored.pop(key, None)
+                if rollup is None:
+                    created.append(FeedbackRollup(day=key[0], rating=key[1], count=count, reviewed=reviewed))
+                elif (rollup.count, rollup.reviewed) != (count, reviewed):
+                    rollup.count, rollup.reviewed = count, reviewed
+                    changed.append(rollup)
+            stale = [rollup.pk for rollup in stored.values() if rollup.count or rollup.reviewed]
+            drifted = len(changed) + len(created) + len(stale)
+            if options['verbosity'] > 1:
+                for rollup in changed + created:
+                    self.stdout.write(f'{rollup.day} {rollup.rating} stars: {rollup.count} ({rollup.reviewed} reviewed)')
+            if not options['dry_run']:
+                FeedbackRollup.objects.bulk_update(changed, ['count', 'reviewed'], batch_size=500)
+                FeedbackRollup.objects.bulk_create(created, batch_size=500)
+                FeedbackRollup.objects.filter(pk__in=stale).delete()
+        if not options['dry_run']:
+            cache.delete(FeedbackRollup.CACHE_KEY)
+
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {drifted} drifted rollup buckets.'))
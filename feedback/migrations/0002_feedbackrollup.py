@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:15
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    """Roll up existing feedback per day and rating."""
+    Feedback = apps.get_model('feedback', 'Feedback')
+    FeedbackRollup = apps.get_model('feedback', 'FeedbackRollup')
+    rows = (
+        Feedback.objects.annotate(day=TruncDate('created_at'))
+        .values('day', 'rating')
+        .annotate(count=Count('pk'), reviewed=Count('pk', filter=Q(is_reviewed=True)))
+        .order_by()
+    )
+    FeedbackRollup.objects.bulk_create([FeedbackRollup(**row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('rating', models.IntegerField(choices=[(1, '1 Star'), (2, '2 Stars'), (3, '3 Stars'), (4, '4 Stars'), (5, '5 Stars')])),
+                ('count', models.IntegerField(default=0)),
+                ('reviewed', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day', 'rating'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'rating'), name='feedback_rollup_unique_day_rating')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
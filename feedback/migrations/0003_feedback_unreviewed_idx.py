@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0002_feedbackrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='feedback',
+            name='feedback_fe_is_revi_120a1c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('is_reviewed', False)), fields=['-created_at'], name='feedback_unreviewed_idx'),
+        ),
+    ]
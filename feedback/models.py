@@ -1,9 +1,17 @@
 """Feedback models for the guessing game application."""
-from django.db import models
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Sum
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.utils import timezone
+from core.models import DirtyFieldsMixin
 
 
-class Feedback(models.Model):
+class Feedback(DirtyFieldsMixin, models.Model):
     """User feedback model."""
     
     RATING_CHOICES = [
@@ -28,10 +36,124 @@ class Feedback(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', '-created_at']),
-            models.Index(fields=['is_reviewed', '-created_at']),
+            models.Index(
+                fields=['-created_at'],
+                name='feedback_unreviewed_idx',
+                condition=models.Q(is_reviewed=False),
+            ),
             models.Index(fields=['rating', '-created_at']),
         ]
 
     def __str__(self) -> str:
         """String representation of Feedback."""
         return f"Feedback from {self.name} - {self.subject} ({self.rating} stars)"
+
+    def save(self, *args, **kwargs):
+        """Save and move the feedback between rating rollups if it changed."""
+        previous = None
+        if not self._state.adding:
+            snapshot = getattr(self, '_loaded_field_values', None) or {}
+            if {'rating', 'is_reviewed', 'created_at'} & set(self.get_dirty_fields()):
+                previous = tuple(
+                    snapshot.get(field, getattr(self, field)) for field in ('created_at', 'rating', 'is_reviewed')
+                )
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                FeedbackRollup.record(self.created_at, self.rating, self.is_reviewed, 1)
+            elif previous is not None:
+                FeedbackRollup.record(*previous, -1)
+                FeedbackRollup.record(self.created_at, self.rating, self.is_reviewed, 1)
+
+    save.alters_data = True
+
+
+class FeedbackRollup(models.Model):
+    """Feedback count per day and rating, and how many of it was reviewed.
+
+    Rows are adjusted with ``F()`` updates whenever feedback is created,
+    re-rated, reviewed or deleted, so dashboards read a few hundred rollup
+    rows instead of aggregating the feedback table. Bulk ``update()`` calls
+    bypass the hooks; ``reconcile_feedback_rollups`` repairs any drift.
+    """
+
+    # Bounds how long a summary read racing a concurrent change can stay stale.
+    CACHE_TIMEOUT = 300
+    CACHE_KEY = 'feedback:rollup-summary'
+    SUMMARY_DAYS = 30
+
+    day = models.DateField()
+    rating = models.IntegerField(choices=Feedback.RATING_CHOICES)
+    count = models.IntegerField(default=0)
+    reviewed = models.IntegerField(default=0)
+
+    class Meta:
+        """Meta options for FeedbackRollup."""
+        ordering = ['-day', 'rating']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'rating'], name='feedback_rollup_unique_day_rating'),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of FeedbackRollup."""
+        return f"{self.day} {self.rating} stars: {self.count} ({self.reviewed} reviewed)"
+
+    @classmethod
+    def record(cls, created_at, rating: int, is_reviewed: bool, delta: int) -> None:
+        """Add ``delta`` feedback with this creation time, rating and review state."""
+        day = timezone.localdate(created_at)
+        reviewed = delta if is_reviewed else 0
+        bucket = cls.objects.filter(day=day, rating=rating)
+        changes = {'count': F('count') + delta, 'reviewed': F('reviewed') + reviewed}
+        if not bucket.update(**changes):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(day=day, rating=rating, count=delta, reviewed=reviewed)
+            except IntegrityError:
+                # Another request created the bucket first.
+                bucket.update(**changes)
+        transaction.on_commit(lambda: cache.delete(cls.CACHE_KEY))
+
+    @classmethod
+    def summary(cls) -> dict:
+        """Totals per rating, average, unreviewed backlog and recent daily buckets."""
+        summary = cache.get(cls.CACHE_KEY)
+        if summary is not None:
+            return summary
+        by_rating = dict.fromkeys(dict(Feedback.RATING_CHOICES), 0)
+        reviewed = 0
+        for rating, count, rating_reviewed in (
+            cls.objects.values('rating').annotate(total=Sum('count'), done=Sum('reviewed'))
+            .order_by().values_list('rating', 'total', 'done')
+        ):
+            by_rating[rating] = count
+            reviewed += rating_reviewed
+        total = sum(by_rating.values())
+        since = timezone.localdate() - timedelta(days=cls.SUMMARY_DAYS - 1)
+        daily = {}
+        for day, rating, count, day_reviewed in (
+            cls.objects.filter(day__gte=since).order_by('day')
+            .values_list('day', 'rating', 'count', 'reviewed')
+        ):
+            bucket = daily.setdefault(day, {'day': day, 'count': 0, 'rating_sum': 0, 'unreviewed': 0})
+            bucket['count'] += count
+            bucket['rating_sum'] += rating * count
+            bucket['unreviewed'] += count - day_reviewed
+        for bucket in daily.values():
+            bucket['average'] = round(bucket.pop('rating_sum') / bucket['count'], 2) if bucket['count'] else None
+        summary = {
+            'total': total,
+            'by_rating': by_rating,
+            'average': round(sum(r * c for r, c in by_rating.items()) / total, 2) if total else None,
+            'unreviewed': total - reviewed,
+            'daily': list(daily.values()),
+        }
+        cache.set(cls.CACHE_KEY, summary, cls.CACHE_TIMEOUT)
+        return summary
+
+
+@receiver(post_delete, sender=Feedback)
+def remove_from_rollup(sender, instance, **kwargs):
+    """Take deleted feedback out of its rating rollup."""
+    FeedbackRollup.record(instance.created_at, instance.rating, instance.is_reviewed, -1)
@@ -1,3 +1,98 @@
+"""Tests for feedback app."""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from core.testing import QueryPlanTestCase
+from .models import Feedback, FeedbackRollup
+
+
+class HotQueryPlanTests(QueryPlanTestCase):
+    """Feedback review queues and admin filters are served by indexes."""
+
+    def test_unreviewed_feedback(self):
+        """The review queue is read newest first from the review index."""
+        self.assertIndexedPlan(Feedback.objects.filter(is_reviewed=False)[:100], 'unreviewed feedback')
+
+    def test_feedback_by_rating(self):
+        """The admin rating filter is read newest first from the rating index."""
+        self.assertIndexedPlan(Feedback.objects.filter(rating=1)[:100], 'feedback by rating')
+
+
+class FeedbackRollupTests(TestCase):
+    """Rating rollups follow feedback as it is created, reviewed, re-rated and deleted."""
+
+    def setUp(self):
+        """Create feedback rated 5, 5 and 3 today."""
+        cache.clear()
+        self.feedback = [
+            Feedback.objects.create(name='Player', email='p@example.com', subject='Hi', message='...', rating=rating)
+            for rating in (5, 5, 3)
+        ]
+
+    def rollups(self) -> dict[int, tuple[int, int]]:
+        """Today's (count, reviewed) per rating."""
+        return {
+            rating: (count, reviewed)
+            for rating, count, reviewed in FeedbackRollup.objects.filter(day=timezone.localdate())
+            .values_list('rating', 'count', 'reviewed')
+            if count or reviewed
+        }
+
+    def test_create_review_rerate_and_delete(self):
+        """Each change moves the feedback between rollup buckets."""
+        self.assertEqual(self.rollups(), {5: (2, 0), 3: (1, 0)})
+        feedback = self.feedback[0]
+        feedback.is_reviewed = True
+        feedback.save()
+        self.assertEqual(self.rollups(), {5: (2, 1), 3: (1, 0)})
+        feedback.rating = 4
+        feedback.save()
+        self.assertEqual(self.rollups(), {5: (1, 0), 4: (1, 1), 3: (1, 0)})
+        feedback.is_reviewed = False
+        feedback.save()
+        self.assertEqual(self.rollups(), {5: (1, 0), 4: (1, 0), 3: (1, 0)})
+        feedback.delete()
+        self.feedback[2].delete()
+        self.assertEqual(self.rollups(), {5: (1, 0)})
+
+    def test_unrelated_changes_leave_rollups_alone(self):
+        """Saving feedback without changing its rating or review state runs no rollup update."""
+        feedback = Feedback.objects.get(pk=self.feedback[0].pk)
+        feedback.subject = 'Hello'
+        with self.assertNumQueries(3):
+            # SAVEPOINT, UPDATE, RELEASE
+            feedback.save()
+
+    def test_summary_is_cached_until_a_change(self):
+        """The summary is read from the cache and dropped when a rollup changes."""
+        summary = FeedbackRollup.summary()
+        self.assertEqual((summary['total'], summary['average'], summary['unreviewed']), (3, 4.33, 3))
+        self.assertEqual(summary['by_rating'], {1: 0, 2: 0, 3: 1, 4: 0, 5: 2})
+        with self.assertNumQueries(0):
+            FeedbackRollup.summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.feedback[1].is_reviewed = True
+            self.feedback[1].save()
+        self.assertEqual(FeedbackRollup.summary()['unreviewed'], 2)
+
+    def test_reconcile(self):
+        """The reconcile command repairs drift from bulk updates and stale buckets."""
+        Feedback.objects.filter(rating=5).update(is_reviewed=True)
+        FeedbackRollup.objects.create(day=timezone.localdate() - timedelta(days=400), rating=1, count=2)
+        out = StringIO()
+        call_command('reconcile_feedback_rollups', '--dry-run', stdout=out)
+        self.assertIn('Found 2 drifted rollup buckets.', out.getvalue())
+        self.assertEqual(self.rollups(), {5: (2, 0), 3: (1, 0)})
 
-# Create your tests here.
+        call_command('reconcile_feedback_rollups', stdout=out)
+        self.assertIn('Fixed 2 drifted rollup buckets.', out.getvalue())
+        self.assertEqual(self.rollups(), {5: (2, 2), 3: (1, 0)})
+        self.assertFalse(FeedbackRollup.objects.filter(rating=1).exists())
+        out = StringIO()
+        call_command('reconcile_feedback_rollups', stdout=out)
+        self.assertIn('Fixed 0 drifted rollup buckets.', out.getvalue())
@@ -6,6 +6,7 @@ app_name = 'feedback'
 
 urlpatterns = [
     path('feedback/', views.FeedbackCreateView.as_view(), name='feedback'),
+    path('feedback/dashboard/', views.FeedbackDashboardView.as_view(), name='dashboard'),
 ]
 
 
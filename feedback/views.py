@@ -3,8 +3,11 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.core.mail import send_mail
 from django.conf import settings
-from django.views.generic import CreateView
-from .models import Feedback
+from django.contrib.admin.views.decorators import staff_member_required
+from django.utils.decorators import method_decorator
+from django.views.generic import CreateView, TemplateView
+from core import events
+from .models import Feedback, FeedbackRollup
 from .forms import FeedbackForm, ContactForm
 
 
@@ -27,6 +30,12 @@ class FeedbackCreateView(CreateView):
         if self.request.user.is_authenticated:
             feedback.user = self.request.user
         feedback.save()
+        events.emit(
+            events.FEEDBACK_SUBMITTED,
+            feedback_id=feedback.pk,
+            user_id=feedback.user_id,
+            rating=feedback.rating,
+        )
         
         # Send email notification to admin
         try:
@@ -54,3 +63,23 @@ This is an automated message from the Number Guessing Game.
         
         messages.success(self.request, 'Thank you for your feedback!')
         return redirect(self.success_url)
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class FeedbackDashboardView(TemplateView):
+    """Staff dashboard of feedback ratings, read from the rating rollups."""
+    template_name = 'feedback/dashboard.html'
+
+    def get_context_data(self, **kwargs):
+        """Add the rollup summary."""
+        context = super().get_context_data(**kwargs)
+        summary = FeedbackRollup.summary()
+        total = summary['total']
+        context['summary'] = summary
+        # (label, count, percentage of all feedback) per rating, for the bars.
+        context['rating_rows'] = [
+            (label, summary['by_rating'][rating], round(summary['by_rating'][rating] / total * 100) if total else 0)
+            for rating, label in Feedback.RATING_CHOICES
+        ]
+        context['summary_days'] = FeedbackRollup.SUMMARY_DAYS
+        return context
@@ -1,15 +1,16 @@
 """Admin configuration for games app."""
 from django.contrib import admin
-from .models import Game, Guess
+from users.admin import PlayerSearchMixin
+from .models import ArchivedGame, Game, Guess
 
 
 @admin.register(Game)
-class GameAdmin(admin.ModelAdmin):
+class GameAdmin(PlayerSearchMixin, admin.ModelAdmin):
     """Admin configuration for Game model."""
     list_display = ('id', 'user', 'difficulty_level', 'target_number', 
                     'attempts_made', 'max_attempts', 'score', 'is_won', 'started_at')
-    list_filter = ('difficulty_level', 'is_won', 'started_at')
-    search_fields = ('user__username', 'user__email')
+    list_filter = ('difficulty_level', 'is_won', 'challenge_date', 'started_at')
+    search_fields = ('user__email',)
     readonly_fields = ('started_at', 'completed_at', 'score')
     date_hierarchy = 'started_at'
     
@@ -34,3 +35,32 @@ class GuessAdmin(admin.ModelAdmin):
     search_fields = ('game__user__username', 'guess_number')
     readonly_fields = ('created_at',)
     date_hierarchy = 'created_at'
+
+
+@admin.register(ArchivedGame)
+class ArchivedGameAdmin(PlayerSearchMixin, admin.ModelAdmin):
+    """Read-only admin for archived games."""
+    list_display = ('id', 'user', 'difficulty_level', 'attempts_made', 'max_attempts',
+                    'score', 'is_won', 'started_at', 'archived_at')
+    list_filter = ('difficulty_level', 'is_won')
+    search_fields = ('user__email',)
+    list_select_related = ('user',)
+    date_hierarchy = 'started_at'
+    readonly_fields = ('guess_history',)
+    exclude = ('guesses',)
+
+    @admin.display(description='Guesses')
+    def guess_history(self, obj):
+        """List the archived guesses."""
+        return ', '.join(
+            f'#{guess.attempt_number}: {guess.guess_number} ({guess.get_feedback_display()})'
+            for guess in obj.get_guesses()
+        ) or '-'
+
+    def has_add_permission(self, request):
+        """Archive rows are only written by archive_games."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Archive rows are read-only."""
+        return False
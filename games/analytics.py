@@ -0,0 +1,289 @@
+"""Vectorized analytics over game and guess history.
+
+Rows are streamed from the database in keyset-paginated ``values_list`` chunks
+and folded into NumPy accumulators, so memory stays bounded by the chunk size
+however many games and guesses are scanned. Archived games and their inlined
+guesses are read alongside the hot tables, so reports cover the whole history. NumPy is an optional dependency
+(the ``analytics`` extra), needed only by this module and the
+``game_analytics`` command.
+"""
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import chain
+
+import numpy as np
+from django.db.models import Q, QuerySet
+
+from .models import ArchivedGame, Game, Guess
+
+DIFFICULTIES = list(Game.DIFFICULTY_RANGES)
+DIFFICULTY_CODES = {difficulty: code for code, difficulty in enumerate(DIFFICULTIES)}
+DEFAULT_MAX_ATTEMPTS = Game._meta.get_field('max_attempts').default
+
+# Upper bounds (seconds) of the buckets for the time between consecutive guesses.
+INTERVAL_BUCKETS = [5, 15, 30, 60, 300, 3600]
+INTERVAL_LABELS = ['<5s', '5-15s', '15-30s', '30-60s', '1-5m', '5-60m', '>=60m']
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def iter_chunks(queryset: QuerySet, fields: tuple[str, ...], key: tuple[str, ...], chunk_size: int):
+    """Yield ``values_list`` rows in chunks, paginating on the ``key`` columns.
+
+    ``key`` must be a unique ordering and the leading columns of ``fields``.
+    Each chunk is fetched with ``WHERE key > last_key ORDER BY key LIMIT n``,
+    which stays an index range scan however deep into the table it gets.
+    """
+    queryset = queryset.order_by(*key).values_list(*fields)
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            after = Q()
+            for depth, field in enumerate(key):
+                after |= Q(**dict(zip(key[:depth], last[:depth])), **{f'{field}__gt': last[depth]})
+            page = page.filter(after)
+        rows = list(page[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][:len(key)]
+
+
+def archived_guess_chunks(queryset: QuerySet, chunk_size: int, start: datetime | None = None,
+                          end: datetime | None = None):
+    """Yield ``(game_id, attempt_number, created_at)`` chunks of archived games' guesses.
+
+    Guesses are inlined in their game's row, so ``chunk_size`` counts games;
+    only guesses made in [start, end) are kept.
+    """
+    for rows in iter_chunks(queryset, ('pk', 'guesses'), ('pk',), chunk_size):
+        chunk = []
+        for pk, guesses in rows:
+            for attempt_number, _, _, created_at in sorted(guesses):
+                created_at = datetime.fromisoformat(created_at)
+                if (start is None or created_at >= start) and (end is None or created_at < end):
+                    chunk.append((pk, attempt_number, created_at))
+        if chunk:
+            yield chunk
+
+
+def _timestamps(values) -> np.ndarray:
+    """Convert datetimes to POSIX seconds."""
+    return np.fromiter((value.timestamp() for value in values), dtype=np.float64, count=len(values))
+
+
+def _add_counts(total: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Add one to total[row, col] for each pair, growing the columns as needed."""
+    if cols.size and cols.max() >= total.shape[1]:
+        total = np.pad(total, ((0, 0), (0, cols.max() + 1 - total.shape[1])))
+    np.add.at(total, (rows, cols), 1)
+    return total
+
+
+def simulate_binary_search(low: int, high: int) -> np.ndarray:
+    """Attempts binary search needs for every target in [low, high]."""
+    targets = np.arange(low, high + 1)
+    lo = np.full_like(targets, low)
+    hi = np.full_like(targets, high)
+    attempts = np.zeros_like(targets)
+    active = np.ones(targets.shape, dtype=bool)
+    while active.any():
+        guess = (lo + hi) // 2
+        attempts += active
+        active &= guess != targets
+        lo = np.where(guess < targets, guess + 1, lo)
+        hi = np.where(guess > targets, guess - 1, hi)
+    return attempts
+
+
+def simulate_random_pivot(low: int, high: int, trials: int = 20, seed: int = 0) -> np.ndarray:
+    """Attempts a player guessing uniformly within the remaining range needs.
+
+    Every target in [low, high] is played ``trials`` times.
+    """
+    rng = np.random.default_rng(seed)
+    targets = np.repeat(np.arange(low, high + 1), trials)
+    lo = np.full_like(targets, low)
+    hi = np.full_like(targets, high)
+    attempts = np.zeros_like(targets)
+    active = np.ones(targets.shape, dtype=bool)
+    while active.any():
+        guess = lo + (rng.random(targets.shape) * (hi - lo + 1)).astype(targets.dtype)
+        attempts += active
+        active &= guess != targets
+        lo = np.where(guess < targets, guess + 1, lo)
+        hi = np.where(guess > targets, guess - 1, hi)
+    return attempts
+
+
+def _strategy_summary(attempts: np.ndarray, max_attempts: int) -> dict:
+    """Summarize a simulated attempts distribution."""
+    return {
+        'mean_attempts': round(float(attempts.mean()), 3),
+        'worst_case': int(attempts.max()),
+        'win_rate': round(float((attempts <= max_attempts).mean()) * 100, 2),
+    }
+
+
+def simulate_strategies(max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> dict:
+    """Simulate ideal and naive strategies for every difficulty range."""
+    return {
+        difficulty: {
+            'binary_search': _strategy_summary(simulate_binary_search(low, high), max_attempts),
+            'random_pivot': _strategy_summary(simulate_random_pivot(low, high), max_attempts),
+        }
+        for difficulty, (low, high) in Game.DIFFICULTY_RANGES.items()
+    }
+
+
+def analyze_games(queryset: QuerySet, chunk_size: int, archived: QuerySet | None = None) -> dict:
+    """Win rate, attempt distribution and distance from optimal play per difficulty.
+
+    ``archived`` is an optional ``ArchivedGame`` queryset scanned after ``queryset``.
+    """
+    optimal = {
+        DIFFICULTY_CODES[difficulty]: (low, simulate_binary_search(low, high))
+        for difficulty, (low, high) in Game.DIFFICULTY_RANGES.items()
+    }
+    count = len(DIFFICULTIES)
+    played = np.zeros(count, dtype=np.int64)
+    won = np.zeros(count, dtype=np.int64)
+    abandoned = np.zeros(count, dtype=np.int64)
+    excess_sum = np.zeros(count, dtype=np.int64)
+    at_optimal = np.zeros(count, dtype=np.int64)
+    attempts_hist = np.zeros((count, DEFAULT_MAX_ATTEMPTS + 1), dtype=np.int64)
+
+    fields = ('pk', 'difficulty_level', 'target_number', 'attempts_made', 'max_attempts', 'is_won', 'completed_at')
+    sources = [queryset] if archived is None else [queryset, archived]
+    for rows in chain.from_iterable(iter_chunks(source, fields, ('pk',), chunk_size) for source in sources):
+        _, difficulty, target, attempts, max_attempts, is_won, completed_at = zip(*rows)
+        codes = np.fromiter((DIFFICULTY_CODES.get(value, -1) for value in difficulty), np.int64, len(rows))
+        target = np.array(target, dtype=np.int64)
+        attempts = np.array(attempts, dtype=np.int64)
+        max_attempts = np.array(max_attempts, dtype=np.int64)
+        is_won = np.array(is_won, dtype=bool)
+        completed = np.fromiter((value is not None for value in completed_at), bool, len(rows))
+
+        known = codes >= 0
+        exhausted = attempts >= max_attempts
+        finished = known & (is_won | completed | exhausted)
+        wins = known & is_won
+        np.add.at(played, codes[finished], 1)
+        np.add.at(won, codes[wins], 1)
+        np.add.at(abandoned, codes[known & completed & ~is_won & ~exhausted], 1)
+        attempts_hist = _add_counts(attempts_hist, codes[wins], attempts[wins])
+
+        for code, (low, optimal_attempts) in optimal.items():
+            selected = wins & (codes == code)
+            offsets = np.clip(target[selected] - low, 0, optimal_attempts.size - 1)
+            excess = attempts[selected] - optimal_attempts[offsets]
+            excess_sum[code] += excess.sum()
+            at_optimal[code] += np.count_nonzero(excess <= 0)
+
+    report = {}
+    for code, difficulty in enumerate(DIFFICULTIES):
+        hist = attempts_hist[code]
+        wins = int(won[code])
+        report[difficulty] = {
+            'played': int(played[code]),
+            'won': wins,
+            'abandoned': int(abandoned[code]),
+            'win_rate': round(wins / played[code] * 100, 2) if played[code] else 0.0,
+            'attempts_distribution': {str(n): int(hist[n]) for n in np.flatnonzero(hist)},
+            'mean_attempts': round(float((hist * np.arange(hist.size)).sum() / wins), 3) if wins else None,
+            'mean_excess_over_optimal': round(float(excess_sum[code] / wins), 3) if wins else None,
+            'at_or_below_optimal_rate': round(float(at_optimal[code] / wins) * 100, 2) if wins else None,
+        }
+    return report
+
+
+def analyze_guesses(queryset: QuerySet, chunk_size: int, archived: Iterable[list[tuple]] = ()) -> dict:
+    """Guess timing by hour and weekday, and time between consecutive guesses.
+
+    ``archived`` yields further chunks of ``(game_id, attempt_number,
+    created_at)`` rows, such as ``archived_guess_chunks``; a game's guesses
+    must all come from one source.
+    """
+    by_hour = np.zeros(24, dtype=np.int64)
+    by_weekday = np.zeros(7, dtype=np.int64)
+    intervals = np.zeros(len(INTERVAL_LABELS), dtype=np.int64)
+    interval_sum = 0.0
+    total = 0
+    previous = None
+
+    fields = ('game_id', 'attempt_number', 'created_at')
+    for rows in chain(iter_chunks(queryset, fields, ('game_id', 'attempt_number'), chunk_size), archived):
+        game_ids, _, created_at = zip(*rows)
+        game_ids = np.array(game_ids, dtype=np.int64)
+        seconds = _timestamps(created_at)
+        total += len(rows)
+
+        days, day_seconds = np.divmod(seconds, 86400)
+        by_hour += np.bincount((day_seconds // 3600).astype(np.int64), minlength=24)
+        # 1970-01-01 was a Thursday.
+        by_weekday += np.bincount(((days + 3) % 7).astype(np.int64), minlength=7)
+
+        # Carry the last guess of the previous chunk so pairs spanning a chunk
+        # boundary are still measured.
+        if previous is not None:
+            game_ids = np.concatenate(([previous[0]], game_ids))
+            seconds = np.concatenate(([previous[1]], seconds))
+        same_game = game_ids[1:] == game_ids[:-1]
+        deltas = np.diff(seconds)[same_game]
+        intervals += np.bincount(np.searchsorted(INTERVAL_BUCKETS, deltas, side='right'), minlength=len(INTERVAL_LABELS))
+        interval_sum += float(deltas.sum())
+        previous = (game_ids[-1], seconds[-1])
+
+    measured = int(intervals.sum())
+    return {
+        'total': total,
+        'by_hour_utc': by_hour.tolist(),
+        'by_weekday': dict(zip(WEEKDAYS, by_weekday.tolist())),
+        'interval_seconds': {
+            'count': measured,
+            'mean': round(interval_sum / measured, 2) if measured else None,
+            'buckets': dict(zip(INTERVAL_LABELS, intervals.tolist())),
+        },
+    }
+
+
+def build_report(start: datetime | None = None, end: datetime | None = None, chunk_size: int = 100_000) -> dict:
+    """Build the full analytics report for games started and guesses made in [start, end)."""
+    games = Game.objects.all()
+    archived_games = ArchivedGame.objects.all()
+    guesses = Guess.objects.all()
+    # Archived games whose play overlaps the period, for their inlined guesses.
+    guessed_games = ArchivedGame.objects.all()
+    if start is not None:
+        games = games.filter(started_at__gte=start)
+        archived_games = archived_games.filter(started_at__gte=start)
+        guesses = guesses.filter(created_at__gte=start)
+        guessed_games = guessed_games.filter(completed_at__gte=start)
+    if end is not None:
+        games = games.filter(started_at__lt=end)
+        archived_games = archived_games.filter(started_at__lt=end)
+        guesses = guesses.filter(created_at__lt=end)
+        guessed_games = guessed_games.filter(started_at__lt=end)
+    return {
+        'period': {
+            'start': start.isoformat() if start else None,
+            'end': end.isoformat() if end else None,
+        },
+        'games': analyze_games(games, chunk_size, archived_games),
+        'guesses': analyze_guesses(guesses, chunk_size, archived_guess_chunks(guessed_games, chunk_size, start, end)),
+        'simulation': simulate_strategies(),
+    }
+
+
+def flatten_report(report: dict, prefix: str = '') -> list[tuple[str, object]]:
+    """Flatten a nested report into (dotted metric name, value) rows."""
+    rows = []
+    for key, value in report.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            rows.extend(flatten_report(value, f'{name}.'))
+        elif isinstance(value, list):
+            rows.extend((f'{name}.{index}', item) for index, item in enumerate(value))
+        else:
+            rows.append((name, value))
+    return rows
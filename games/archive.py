@@ -0,0 +1,95 @@
+"""Cold storage for old completed games.
+
+``archive_chunk`` moves completed games started before a cutoff, with their
+guesses inlined, from ``Game`` and ``Guess`` into ``ArchivedGame`` one chunk
+per transaction, keeping the hot tables and their indexes small. The
+accessors below read through to the archive, so profiles and result pages
+see a player's whole history whichever table a game lives in.
+"""
+from collections import Counter, defaultdict
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import ArchivedGame, Game, Guess, ScoreBucket
+from .projections import GameRow, Projection
+
+
+@transaction.atomic
+def archive_chunk(cutoff, chunk_size: int, include_wins: bool = False, after_pk: int = 0) -> list[int]:
+    """Archive one chunk of games with a primary key above ``after_pk``.
+
+    Games are walked in primary key order, which follows their start time,
+    so each chunk is a short range scan of the primary key. Rows locked by
+    an in-flight request are skipped. Returns the archived primary keys.
+    """
+    games = Game.objects.select_for_update(skip_locked=True).filter(
+        pk__gt=after_pk, completed_at__isnull=False, started_at__lt=cutoff,
+    )
+    if not include_wins:
+        games = games.filter(is_won=False)
+    games = list(games.order_by('pk')[:chunk_size])
+    if not games:
+        return []
+    game_ids = [game.pk for game in games]
+    guesses = defaultdict(list)
+    for guess in Guess.objects.filter(game_id__in=game_ids).order_by('game_id', 'attempt_number'):
+        guesses[guess.game_id].append(guess)
+    ArchivedGame.objects.bulk_create(
+        [ArchivedGame.from_game(game, guesses[game.pk]) for game in games],
+        batch_size=500,
+    )
+    Guess.objects.filter(game_id__in=game_ids).delete()
+    Game.objects.filter(pk__in=game_ids).delete()
+    # Archived wins leave the leaderboards; keep the rank counts in step.
+    wins = Counter(
+        (game.difficulty_level, game.score) for game in games
+        if game.is_won and game.score is not None and game.challenge_date is None
+    )
+    for (difficulty, score), count in wins.items():
+        ScoreBucket.record_archived(difficulty, score, count)
+    return game_ids
+
+
+def get_game(pk: int) -> Game | ArchivedGame | None:
+    """Get a game by primary key from the hot table, then the archive."""
+    game = Game.objects.select_related('user').filter(pk=pk).first()
+    if game is None:
+        game = ArchivedGame.objects.select_related('user').filter(pk=pk).first()
+    return game
+
+
+def get_guesses(game: Game | ArchivedGame) -> list[Guess]:
+    """Guesses of a hot or archived game in attempt order."""
+    if isinstance(game, ArchivedGame):
+        return game.get_guesses()
+    return list(game.guesses.order_by('attempt_number'))
+
+
+def recent_games(user: User, limit: int) -> list[GameRow]:
+    """A player's latest games across the hot table and the archive, as ``GameRow``s.
+
+    The archive is only searched for games newer than the oldest hot game
+    returned, which is an empty index range for players whose recent history
+    is all hot.
+    """
+    games = Projection(Game.objects.filter(user=user))[:limit]
+    archived = ArchivedGame.objects.filter(user=user)
+    if len(games) == limit:
+        archived = archived.filter(started_at__gt=games[-1].started_at)
+    games.extend(Projection(archived)[:limit])
+    games.sort(key=lambda game: game.started_at, reverse=True)
+    return games[:limit]
+
+
+def average_attempts_per_win(user: User) -> float:
+    """Mean attempts of a player's won games across the hot table and the archive."""
+    attempts = wins = 0
+    for model in (Game, ArchivedGame):
+        totals = model.objects.filter(user=user, is_won=True).aggregate(
+            attempts=Sum('attempts_made'), wins=Count('pk'),
+        )
+        attempts += totals['attempts'] or 0
+        wins += totals['wins']
+    return round(attempts / wins, 2) if wins else 0
@@ -0,0 +1,32 @@
+"""URL configuration for games app on the ASGI entry point.
+
+Same routes and names as ``games.urls``, with the game create, guess and
+leaderboard endpoints served by their async counterparts, plus the live
+leaderboard streams and race mode, which need an event loop.
+"""
+from django.urls import path
+from . import async_views, views
+
+app_name = 'games'
+
+urlpatterns = [
+    path('game/new/', async_views.game_create_view, name='game_new'),
+    path('game/<int:pk>/play/', async_views.game_play_view, name='game_play'),
+    path('game/<int:pk>/guess/', async_views.game_guess_view, name='game_guess'),
+    path('game/<int:pk>/result/', views.GameResultView.as_view(), name='game_result'),
+    path('challenge/', views.challenge_view, name='challenge'),
+    path('leaderboard/', async_views.leaderboard_view, name='leaderboard'),
+    path('leaderboard/stream/', async_views.leaderboard_stream_view, name='leaderboard_stream'),
+    path(
+        'leaderboard/<str:difficulty>/stream/',
+        async_views.leaderboard_stream_view,
+        name='leaderboard_stream_filtered',
+    ),
+    path('leaderboard/<str:difficulty>/', async_views.leaderboard_view, name='leaderboard_filtered'),
+    path('race/new/', async_views.race_create_view, name='race_new'),
+    path('race/<str:match_id>/', async_views.race_room_view, name='race_room'),
+    path('race/<str:match_id>/join/', async_views.race_join_view, name='race_join'),
+    path('race/<str:match_id>/start/', async_views.race_start_view, name='race_start'),
+    path('race/<str:match_id>/guess/', async_views.race_guess_view, name='race_guess'),
+    path('race/<str:match_id>/stream/', async_views.race_stream_view, name='race_stream'),
+]
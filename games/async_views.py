@@ -0,0 +1,285 @@
+"""Async views for games app, served on the ASGI entry point."""
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, aget_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.contrib.messages.storage.base import Message
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from .models import Game, Guess
+from .forms import GameDifficultyForm, GuessForm, RaceForm
+from .live import board_for, leaderboard_hub
+from .projections import Projection
+from .race import RaceError, match_broker
+from .views import LeaderboardView, guess_message, render_play_fragments, result_redirect_fragment
+from users.models import UserProfile
+
+
+async def _aget_user(request) -> User:
+    """Resolve the request user without blocking and pin it on the request.
+
+    Templates read ``request.user`` through the auth context processor; pinning
+    the already-resolved user keeps them from triggering a synchronous lookup.
+    """
+    user = await request.auser()
+    request.user = user
+    return user
+
+
+async def _aget_profile(user: User) -> UserProfile:
+    """Get the user's profile, reusing the one joined by the auth backend."""
+    if User.profile.related.is_cached(user):
+        return user.profile
+    profile = await UserProfile.objects.aget(user=user)
+    User.profile.related.set_cached_value(user, profile)
+    return profile
+
+
+@login_required
+async def game_create_view(request):
+    """View for creating a new game."""
+    user = await _aget_user(request)
+    if request.method == 'POST':
+        form = GameDifficultyForm(request.POST)
+        if form.is_valid():
+            difficulty = form.cleaned_data['difficulty']
+            game = await Game.acreate_game(user, difficulty)
+            messages.success(request, f'Game started! Difficulty: {game.get_difficulty_level_display()}')
+            return redirect('games:game_play', pk=game.pk)
+    else:
+        form = GameDifficultyForm()
+
+    return render(request, 'games/game_new.html', {'form': form})
+
+
+@login_required
+async def game_play_view(request, pk):
+    """View for playing a game."""
+    user = await _aget_user(request)
+    game = await aget_object_or_404(Game, pk=pk, user=user)
+
+    # Check if game is already over
+    if game.is_game_over():
+        return redirect('games:game_result', pk=game.pk)
+
+    if request.method == 'POST':
+        form = GuessForm(request.POST, game=game)
+        if form.is_valid():
+            guess_value = form.cleaned_data['guess']
+            feedback = await game.acheck_guess(guess_value)
+
+            # Create guess record
+            await Guess.objects.acreate(
+                game=game,
+                guess_number=guess_value,
+                attempt_number=game.attempts_made,
+                feedback=feedback
+            )
+
+            message = guess_message(game, feedback)
+            messages.add_message(request, message.level, message.message)
+            if game.is_game_over():
+                profile = await _aget_profile(user)
+                await profile.arecord_game(game)
+                return redirect('games:game_result', pk=game.pk)
+            return redirect('games:game_play', pk=game.pk)
+    else:
+        form = GuessForm(game=game)
+
+    guesses = [guess async for guess in game.guesses.order_by('attempt_number')]
+
+    min_val, max_val = game.get_range()
+
+    context = {
+        'game': game,
+        'form': form,
+        'guesses': guesses,
+        'remaining_attempts': game.get_remaining_attempts(),
+        'min_val': min_val,
+        'max_val': max_val,
+    }
+
+    return render(request, 'games/game_play.html', context)
+
+
+@login_required
+@require_POST
+async def game_guess_view(request, pk):
+    """Make a guess and return the play screen fragments it changes."""
+    user = await _aget_user(request)
+    game = await aget_object_or_404(Game, pk=pk, user=user)
+    if game.is_game_over():
+        return result_redirect_fragment(game)
+
+    form = GuessForm(request.POST, game=game)
+    if not form.is_valid():
+        return render_play_fragments(request, game, Message(messages.ERROR, form.errors['guess'][0]), status=400)
+
+    guess_value = form.cleaned_data['guess']
+    feedback = await game.acheck_guess(guess_value)
+    guess = await Guess.objects.acreate(
+        game=game,
+        guess_number=guess_value,
+        attempt_number=game.attempts_made,
+        feedback=feedback
+    )
+    message = guess_message(game, feedback)
+    if game.is_game_over():
+        profile = await _aget_profile(user)
+        await profile.arecord_game(game)
+        messages.add_message(request, message.level, message.message)
+        return result_redirect_fragment(game)
+    return render_play_fragments(request, game, message, guess)
+
+
+async def leaderboard_view(request, difficulty=None):
+    """Leaderboard view."""
+    await _aget_user(request)
+    rows = Projection(Game.get_leaderboard(difficulty))
+    per_page = LeaderboardView.paginate_by
+
+    # Paginate over the row count alone; only the visible page is fetched.
+    paginator = Paginator(range(await rows.acount()), per_page)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    offset = (page_obj.number - 1) * per_page
+    games = await rows.aslice(offset, offset + per_page)
+    for idx, game in enumerate(games, start=1):
+        game.rank = offset + idx
+    page_obj.object_list = games
+
+    context = {
+        'games': games,
+        'page_obj': page_obj,
+        'paginator': paginator,
+        'is_paginated': page_obj.has_other_pages(),
+        'difficulty': difficulty,
+        'difficulty_choices': Game.DIFFICULTY_CHOICES,
+        **await sync_to_async(LeaderboardView.search_players)(request.GET.get('player', ''), difficulty),
+    }
+    if page_obj.number == 1:
+        # The live stream covers the top rows, i.e. the first page.
+        context['live_url'] = (
+            reverse('games:leaderboard_stream_filtered', kwargs={'difficulty': difficulty})
+            if difficulty else reverse('games:leaderboard_stream')
+        )
+    return render(request, 'games/leaderboard.html', context)
+
+
+async def leaderboard_stream_view(request, difficulty=None):
+    """Stream top leaderboard changes as server-sent events."""
+    if difficulty not in dict(Game.DIFFICULTY_CHOICES):
+        difficulty = None
+    response = StreamingHttpResponse(
+        leaderboard_hub.watch(board_for(difficulty)),
+        content_type='text/event-stream',
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream.
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _get_match(match_id: str):
+    """Get a live race match or raise Http404."""
+    match = match_broker.get(match_id)
+    if match is None:
+        raise Http404('No such race.')
+    return match
+
+
+@login_required
+async def race_create_view(request):
+    """View for opening a race."""
+    user = await _aget_user(request)
+    if request.method == 'POST':
+        form = RaceForm(request.POST)
+        if form.is_valid():
+            match = match_broker.create(user, form.cleaned_data['difficulty'], form.cleaned_data['players'])
+            messages.success(request, 'Race opened! Share this page with your opponents.')
+            return redirect('games:race_room', match_id=match.id)
+    else:
+        form = RaceForm()
+
+    return render(request, 'games/race_new.html', {'form': form})
+
+
+@login_required
+async def race_room_view(request, match_id):
+    """View for watching and playing a race."""
+    user = await _aget_user(request)
+    match = _get_match(match_id)
+    player = match.players.get(user.pk)
+    min_val, max_val = Game.DIFFICULTY_RANGES[match.difficulty]
+
+    context = {
+        'match': match,
+        'player': player,
+        'form': GuessForm(game=player.game) if player else None,
+        'min_val': min_val,
+        'max_val': max_val,
+        'difficulty_display': dict(Game.DIFFICULTY_CHOICES)[match.difficulty],
+    }
+    return render(request, 'games/race_room.html', context)
+
+
+@login_required
+async def race_join_view(request, match_id):
+    """Join a waiting race."""
+    user = await _aget_user(request)
+    match = _get_match(match_id)
+    if request.method == 'POST':
+        try:
+            match_broker.join(match, user)
+        except RaceError as exc:
+            messages.error(request, str(exc))
+    return redirect('games:race_room', match_id=match.id)
+
+
+@login_required
+async def race_start_view(request, match_id):
+    """Start a race before every seat is taken."""
+    user = await _aget_user(request)
+    match = _get_match(match_id)
+    if request.method == 'POST':
+        try:
+            match_broker.start(match, user)
+        except RaceError as exc:
+            messages.error(request, str(exc))
+    return redirect('games:race_room', match_id=match.id)
+
+
+@login_required
+async def race_guess_view(request, match_id):
+    """Submit a race guess and return the feedback as JSON."""
+    user = await _aget_user(request)
+    match = _get_match(match_id)
+    player = match.players.get(user.pk)
+    if request.method != 'POST' or player is None:
+        return JsonResponse({'error': 'You are not in this race.'}, status=400)
+    form = GuessForm(request.POST, game=player.game)
+    if not form.is_valid():
+        return JsonResponse({'error': form.errors['guess'][0]}, status=400)
+    try:
+        feedback = await match_broker.guess(match, user, form.cleaned_data['guess'])
+    except RaceError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse({
+        'guess': form.cleaned_data['guess'],
+        'feedback': feedback,
+        'attempts': player.game.attempts_made,
+        'remaining': player.game.get_remaining_attempts(),
+    })
+
+
+@login_required
+async def race_stream_view(request, match_id):
+    """Stream a race's progress as server-sent events."""
+    await _aget_user(request)
+    match = _get_match(match_id)
+    response = StreamingHttpResponse(match_broker.watch(match), content_type='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
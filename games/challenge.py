@@ -0,0 +1,86 @@
+"""Daily challenge: one shared game per difficulty and day.
+
+A challenge's target is derived from the server secret and the date, so
+every player gets the same number without it being stored anywhere until a
+game is started. Each player plays a challenge at most once, enforced by a
+partial unique index on ``(user, challenge_date, difficulty_level)`` that
+also serves the "already played" lookups. Challenge boards are computed
+once and cached; a challenge win drops its board from the cache, and past
+days' boards, which no longer change, are kept for a day.
+"""
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from .models import Game
+from .projections import GameRow, Projection
+
+BOARD_SIZE = 20
+# Bounds how long today's board read racing a concurrent win can stay stale.
+CACHE_TIMEOUT = 300
+PAST_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def today() -> date:
+    """Day of the current challenge, in the project time zone."""
+    return timezone.localdate()
+
+
+def challenge_target(difficulty: str, day: date) -> int:
+    """Target number of a difficulty's challenge on a day."""
+    min_val, max_val = Game.DIFFICULTY_RANGES[difficulty]
+    digest = salted_hmac('games.challenge', f'{day.isoformat()}:{difficulty}', algorithm='sha256').digest()
+    return min_val + int.from_bytes(digest[:8], 'big') % (max_val - min_val + 1)
+
+
+def start_challenge(user: User, difficulty: str, day: date | None = None) -> tuple[Game, bool]:
+    """Get the player's game for a challenge, starting it if needed.
+
+    Returns the game and whether it was created; concurrent starts are
+    settled by the unique index.
+    """
+    day = day or today()
+    game, created = Game.objects.get_or_create(
+        user=user,
+        challenge_date=day,
+        difficulty_level=difficulty,
+        defaults={'target_number': challenge_target(difficulty, day)},
+    )
+    if created:
+        game.log_created()
+    return game, created
+
+
+def played_games(user: User, day: date | None = None) -> dict[str, Game]:
+    """The player's challenge games of a day, by difficulty."""
+    games = Game.objects.filter(user=user, challenge_date=day or today())
+    return {game.difficulty_level: game for game in games}
+
+
+def board_cache_key(difficulty: str, day: date) -> str:
+    """Cache key for a challenge board."""
+    return f'games:challenge-board:{day.isoformat()}:{difficulty}'
+
+
+def get_board(difficulty: str, day: date | None = None) -> list[GameRow]:
+    """Top ``BOARD_SIZE`` wins of a challenge, ranked, from the cache when possible."""
+    day = day or today()
+    key = board_cache_key(difficulty, day)
+    rows = cache.get(key)
+    if rows is None:
+        wins = Game.objects.filter(
+            challenge_date=day, difficulty_level=difficulty, is_won=True,
+        ).select_related('user').order_by('-score', 'attempts_made', 'started_at')
+        rows = Projection(wins)[:BOARD_SIZE]
+        for rank, row in enumerate(rows, start=1):
+            row.rank = rank
+        cache.set(key, rows, CACHE_TIMEOUT if day >= today() else PAST_CACHE_TIMEOUT)
+    return rows
+
+
+def invalidate_board(difficulty: str, day: date) -> None:
+    """Drop a challenge board from the cache after a win changed it."""
+    cache.delete(board_cache_key(difficulty, day))
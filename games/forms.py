@@ -1,5 +1,7 @@
 """Forms for games app."""
 from django import forms
+from django.conf import settings
+from django.core.validators import MaxValueValidator
 from .models import Game
 
 
@@ -20,6 +22,25 @@ class GameDifficultyForm(forms.Form):
     )
 
 
+class RaceForm(GameDifficultyForm):
+    """Form for opening a race."""
+    players = forms.IntegerField(
+        min_value=2,
+        initial=2,
+        widget=forms.NumberInput(attrs={
+            'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent',
+        }),
+        label='Number of Players'
+    )
+
+    def __init__(self, *args, **kwargs):
+        """Initialize form with the configured player limit."""
+        super().__init__(*args, **kwargs)
+        players = self.fields['players']
+        players.validators.append(MaxValueValidator(settings.RACE_MAX_PLAYERS))
+        players.widget.attrs['max'] = settings.RACE_MAX_PLAYERS
+
+
 class GuessForm(forms.Form):
     """Form for submitting a guess."""
     guess = forms.IntegerField(
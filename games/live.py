@@ -0,0 +1,182 @@
+"""In-process pub/sub feeding the live leaderboard stream.
+
+Wins are announced with ``leaderboard_hub.notify(game)`` from any thread. The
+hub marks the affected boards dirty and, after a short coalescing window,
+reloads each watched board's top rows once and sends every watcher only the
+ranks that changed. One query per burst serves all watchers of a board in
+this process; a periodic refresh picks up wins recorded by other workers.
+"""
+import asyncio
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import dateformat, timezone
+
+ALL_BOARDS = 'all'
+
+
+def board_for(difficulty: str | None) -> str:
+    """Name of the board for a leaderboard filter."""
+    return difficulty or ALL_BOARDS
+
+
+def serialize_game(game) -> dict:
+    """Leaderboard row for a won game's ``GameRow``."""
+    return {
+        'id': game.pk,
+        'username': game.username,
+        'score': game.score,
+        'difficulty': game.difficulty_level,
+        'difficulty_display': game.get_difficulty_level_display(),
+        'attempts': game.attempts_made,
+        'max_attempts': game.max_attempts,
+        'date': dateformat.format(timezone.localtime(game.started_at), 'M d, Y'),
+    }
+
+
+def diff_rows(old: list[dict], new: list[dict]) -> dict | None:
+    """Ranks whose row changed between two snapshots, or None if none did."""
+    changed = {
+        str(rank): row
+        for rank, row in enumerate(new, start=1)
+        if rank > len(old) or old[rank - 1] != row
+    }
+    if not changed and len(new) == len(old):
+        return None
+    return {'size': len(new), 'rows': changed}
+
+
+def format_event(event: str, data: dict) -> str:
+    """Encode one server-sent event."""
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+class Watcher:
+    """One connected client's queue of pending events."""
+
+    def __init__(self, max_pending: int):
+        """Create an empty queue."""
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def send(self, message: str, resync: str) -> None:
+        """Queue an event; a watcher that fell behind gets ``resync`` instead."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync)
+
+
+class LeaderboardHub:
+    """Fan out top-N leaderboard changes to watchers on one event loop."""
+
+    def __init__(self):
+        """Create an idle hub; it binds to an event loop on first watch."""
+        self._loop = None
+        self._task = None
+        self._wake = None
+        self._dirty = set()
+        self._watchers = defaultdict(set)
+        self._snapshots = {}
+
+    @property
+    def size(self) -> int:
+        """Number of top rows streamed per board."""
+        return settings.LIVE_LEADERBOARD_SIZE
+
+    def notify(self, game) -> None:
+        """Announce a won game; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        key = (game.difficulty_level, game.score, game.attempts_made)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._mark_dirty(*key)
+        else:
+            loop.call_soon_threadsafe(self._mark_dirty, *key)
+
+    def _mark_dirty(self, difficulty: str, score: int, attempts: int) -> None:
+        """Mark watched boards the win could enter as dirty and wake the publisher."""
+        for board in (ALL_BOARDS, difficulty):
+            if not self._watchers.get(board):
+                continue
+            rows = self._snapshots.get(board, [])
+            if len(rows) >= self.size and (-score, attempts) >= (-rows[-1]['score'], rows[-1]['attempts']):
+                continue
+            self._dirty.add(board)
+        if self._dirty:
+            self._wake.set()
+
+    def _ensure_running(self) -> None:
+        """Bind to the running event loop and start the publisher task."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._snapshots.clear()
+            self._task = loop.create_task(self._publish())
+
+    async def _load(self, board: str) -> list[dict]:
+        """Load a board's top rows."""
+        from .models import Game
+        from .projections import Projection
+
+        rows = Projection(Game.get_leaderboard(None if board == ALL_BOARDS else board))
+        return [serialize_game(row) for row in await rows.aslice(0, self.size)]
+
+    async def _publish(self) -> None:
+        """Coalesce wins and broadcast diffs until the loop shuts down."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.LIVE_LEADERBOARD_REFRESH_SECONDS)
+            except TimeoutError:
+                # Wins recorded by other worker processes are only seen here.
+                self._dirty.update(board for board, watchers in self._watchers.items() if watchers)
+            else:
+                await asyncio.sleep(settings.LIVE_LEADERBOARD_COALESCE_SECONDS)
+            self._wake.clear()
+            boards, self._dirty = self._dirty, set()
+            for board in boards:
+                if not self._watchers.get(board):
+                    continue
+                rows = await self._load(board)
+                diff = diff_rows(self._snapshots.get(board, []), rows)
+                self._snapshots[board] = rows
+                if diff is None:
+                    continue
+                message = format_event('diff', diff)
+                resync = format_event('snapshot', {'size': len(rows), 'rows': rows})
+                for watcher in list(self._watchers[board]):
+                    watcher.send(message, resync)
+
+    async def watch(self, board: str):
+        """Yield server-sent events for a board: a snapshot, then diffs."""
+        self._ensure_running()
+        watcher = Watcher(settings.LIVE_LEADERBOARD_MAX_PENDING)
+        self._watchers[board].add(watcher)
+        try:
+            if board not in self._snapshots:
+                self._snapshots[board] = await self._load(board)
+            rows = self._snapshots[board]
+            yield format_event('snapshot', {'size': len(rows), 'rows': rows})
+            while True:
+                try:
+                    yield await asyncio.wait_for(
+                        watcher.queue.get(), settings.LIVE_LEADERBOARD_HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    yield ': keep-alive\n\n'
+        finally:
+            self._watchers[board].discard(watcher)
+            if not self._watchers[board]:
+                del self._watchers[board]
+                self._snapshots.pop(board, None)
+
+
+leaderboard_hub = LeaderboardHub()
@@ -0,0 +1,52 @@
+"""Move old completed games into cold storage."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from games.archive import archive_chunk
+
+
+class Command(BaseCommand):
+    """Archive completed games older than the retention age.
+
+    Games and their guesses are copied into ``ArchivedGame`` and deleted from
+    the hot tables one chunk per transaction, walking the ``Game`` primary
+    key so no chunk rescans rows already visited. Won games stay hot unless
+    ``--include-wins`` is given, because the leaderboards rank them.
+    """
+    help = 'Archive completed games older than the retention age.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'GAME_ARCHIVE_AFTER_DAYS', 180),
+            help='Archive games started more than this many days ago.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of games archived per transaction.',
+        )
+        parser.add_argument(
+            '--include-wins', action='store_true',
+            help='Archive won games too, removing them from the leaderboards.',
+        )
+
+    def handle(self, *args, **options):
+        """Archive chunks until no eligible game is left."""
+        if options['days'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--days and --chunk-size must be positive.')
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        total = 0
+        after_pk = 0
+        while True:
+            archived = archive_chunk(cutoff, options['chunk_size'], options['include_wins'], after_pk)
+            if not archived:
+                break
+            total += len(archived)
+            after_pk = archived[-1]
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Archived games up to id {after_pk}.')
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} games started before {cutoff:%Y-%m-%d}.'))
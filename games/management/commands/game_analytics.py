@@ -0,0 +1,75 @@
+"""Write analytics reports over game and guess history."""
+import csv
+import json
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """Report win rates, attempt distributions, distance from optimal play and
+    guess timing, next to simulated binary-search and random-pivot strategies.
+
+    History, archived games included, is streamed in keyset-paginated chunks
+    into NumPy arrays (see ``games.analytics``); ``--month`` limits the report
+    to one calendar month.
+    """
+    help = 'Write a JSON or CSV analytics report over game and guess history.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--month',
+            help='Report on one calendar month, as YYYY-MM (default: all history).',
+        )
+        parser.add_argument(
+            '--format', choices=['json', 'csv'], default='json',
+            help='Report format.',
+        )
+        parser.add_argument(
+            '--output', default='-',
+            help='File to write the report to (default: stdout).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=100_000,
+            help='Number of rows fetched per query.',
+        )
+
+    def handle(self, *args, **options):
+        """Build and write the report."""
+        try:
+            from games.analytics import build_report, flatten_report
+        except ModuleNotFoundError as exc:
+            if exc.name != 'numpy':
+                raise
+            raise CommandError(
+                'NumPy is required for analytics; install the analytics extra: uv sync --extra analytics'
+            ) from exc
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+
+        start = end = None
+        if options['month']:
+            try:
+                start = timezone.make_aware(datetime.strptime(options['month'], '%Y-%m'))
+            except ValueError as exc:
+                raise CommandError('--month must look like YYYY-MM.') from exc
+            end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+        report = build_report(start, end, options['chunk_size'])
+        report['generated_at'] = timezone.now().isoformat()
+
+        stream = sys.stdout if options['output'] == '-' else open(options['output'], 'w', newline='')
+        try:
+            if options['format'] == 'json':
+                json.dump(report, stream, indent=2)
+                stream.write('\n')
+            else:
+                writer = csv.writer(stream)
+                writer.writerow(['metric', 'value'])
+                writer.writerows(flatten_report(report))
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
@@ -0,0 +1,51 @@
+"""Rebuild the per-difficulty score histograms."""
+from collections import Counter
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from games.models import ArchivedGame, Game, ScoreBucket
+
+
+class Command(BaseCommand):
+    """Regenerate ``ScoreBucket`` rows from the Game and ArchivedGame tables.
+
+    Won games, except daily challenge games, are counted per
+    ``(difficulty_level, score)`` with one grouped query per table, archived
+    wins also into ``archived``, and the histogram table is replaced in a
+    single transaction so percentile and rank lookups never see a partially
+    rebuilt histogram.
+    """
+    help = 'Rebuild per-difficulty score histograms from game history.'
+
+    def handle(self, *args, **options):
+        """Run the rebuild."""
+        counts, archived = Counter(), Counter()
+        for model, tally in ((Game, None), (ArchivedGame, archived)):
+            rows = (
+                model.objects.filter(is_won=True, score__isnull=False, challenge_date__isnull=True)
+                .values_list('difficulty_level', 'score')
+                .annotate(count=Count('pk'))
+                .order_by()
+            )
+            for difficulty, score, count in rows:
+                counts[difficulty, score] += count
+                if tally is not None:
+                    tally[difficulty, score] += count
+        buckets = [
+            ScoreBucket(
+                difficulty_level=difficulty, score=score, count=count,
+                archived=archived[difficulty, score],
+            )
+            for (difficulty, score), count in counts.items()
+        ]
+        with transaction.atomic():
+            ScoreBucket.objects.all().delete()
+            ScoreBucket.objects.bulk_create(buckets, batch_size=500)
+        cache.delete_many([ScoreBucket.cache_key(difficulty) for difficulty in Game.DIFFICULTY_RANGES])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(buckets)} score buckets from {sum(b.count for b in buckets)} won games.'
+        ))
@@ -0,0 +1,118 @@
+"""Finalize games that players abandoned."""
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core import events
+from games.models import Game
+from users.models import UserProfile
+
+
+class Command(BaseCommand):
+    """Finalize active games older than the abandonment TTL in bulk.
+
+    Stale games are found through the partial index on active games
+    (``completed_at IS NULL``), marked completed in chunked ``UPDATE``s and
+    counted towards each player's ``total_games_played`` with one aggregate
+    ``UPDATE`` per distinct increment. Rows locked by an in-flight guess are
+    skipped, so the command is safe to run continuously with ``--loop``.
+    """
+    help = 'Finalize abandoned games past the configured TTL.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--ttl-hours', type=float,
+            default=getattr(settings, 'GAME_ABANDONED_AFTER_HOURS', 24),
+            help='Hours after which an unfinished game counts as abandoned.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Number of games finalized per transaction.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep sweeping until interrupted.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=60,
+            help='Seconds to sleep between sweeps with --loop.',
+        )
+
+    def handle(self, *args, **options):
+        """Run one sweep, or sweep repeatedly with --loop."""
+        ttl = timedelta(hours=options['ttl_hours'])
+        chunk_size = options['chunk_size']
+        try:
+            while True:
+                finalized = self.sweep(ttl, chunk_size)
+                if finalized or options['verbosity'] > 1:
+                    self.stdout.write(f'Finalized {finalized} abandoned games.')
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Sweeper stopped.')
+
+    def sweep(self, ttl: timedelta, chunk_size: int) -> int:
+        """Finalize all games abandoned before now - ttl and return the count."""
+        cutoff = timezone.now() - ttl
+        total = 0
+        while True:
+            finalized = self.sweep_chunk(cutoff, chunk_size)
+            total += finalized
+            if finalized < chunk_size:
+                return total
+
+    @transaction.atomic
+    def sweep_chunk(self, cutoff, chunk_size: int) -> int:
+        """Finalize one chunk of abandoned games and update profile counters."""
+        rows = list(
+            Game.objects.select_for_update(skip_locked=True)
+            .filter(completed_at__isnull=True, started_at__lt=cutoff)
+            .order_by('started_at')
+            .values_list('pk', 'user_id', 'difficulty_level', 'attempts_made', 'max_attempts')[:chunk_size]
+        )
+        if not rows:
+            return 0
+
+        now = timezone.now()
+        Game.objects.filter(pk__in=[row[0] for row in rows]).update(completed_at=now)
+
+        # Games that ran out of attempts before this sweeper existed were
+        # already counted by the play view; only count the abandoned ones.
+        abandoned = Counter(
+            user_id for _, user_id, _, attempts_made, max_attempts in rows
+            if attempts_made < max_attempts
+        )
+        users_by_increment = defaultdict(list)
+        for user_id, increment in abandoned.items():
+            users_by_increment[increment].append(user_id)
+        for increment, user_ids in users_by_increment.items():
+            UserProfile.objects.filter(user_id__in=user_ids).update(
+                total_games_played=F('total_games_played') + increment,
+                updated_at=now,
+            )
+        transaction.on_commit(lambda: self.log_abandoned(rows))
+        return len(rows)
+
+    def log_abandoned(self, rows: list[tuple]) -> None:
+        """Log finalized games that were abandoned as lost."""
+        for pk, user_id, difficulty, attempts_made, max_attempts in rows:
+            if attempts_made < max_attempts:
+                events.emit(
+                    events.GAME_LOST,
+                    game_id=pk,
+                    user_id=user_id,
+                    difficulty=difficulty,
+                    attempts=attempts_made,
+                    max_attempts=max_attempts,
+                    score=None,
+                    abandoned=True,
+                )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('completed_at__isnull', True)), fields=['started_at'], name='games_game_active_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_game_active_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty_level', models.CharField(choices=[('easy', 'Easy (1-99)'), ('moderate', 'Moderate (1-999)'), ('expert', 'Expert (1-9999)')], max_length=20)),
+                ('score', models.IntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['difficulty_level', 'score'],
+                'constraints': [models.UniqueConstraint(fields=('difficulty_level', 'score'), name='games_scorebucket_unique_score')],
+            },
+        ),
+    ]
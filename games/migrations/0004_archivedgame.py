@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_scorebucket'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGame',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('difficulty_level', models.CharField(choices=[('easy', 'Easy (1-99)'), ('moderate', 'Moderate (1-999)'), ('expert', 'Expert (1-9999)')], max_length=20)),
+                ('target_number', models.IntegerField()),
+                ('attempts_made', models.IntegerField()),
+                ('max_attempts', models.IntegerField()),
+                ('score', models.IntegerField(blank=True, null=True)),
+                ('is_won', models.BooleanField(default=False)),
+                ('started_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('guesses', models.JSONField(default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_games', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['user', '-started_at'], name='games_archi_user_id_6c4a90_idx')],
+            },
+        ),
+    ]
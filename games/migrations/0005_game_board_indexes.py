@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_archivedgame'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='game',
+            name='games_game_difficu_c9f916_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='game',
+            name='games_game_is_won_064987_idx',
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('is_won', True), ('score__isnull', False)), fields=['-score', 'attempts_made', 'started_at'], name='games_game_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('is_won', True), ('score__isnull', False)), fields=['difficulty_level', '-score', 'attempts_made', 'started_at'], name='games_game_board_diff_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_game_board_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedgame',
+            name='challenge_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='challenge_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('challenge_date__isnull', False), ('is_won', True)), fields=['challenge_date', 'difficulty_level', '-score', 'attempts_made', 'started_at'], name='games_game_challenge_board_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='game',
+            constraint=models.UniqueConstraint(condition=models.Q(('challenge_date__isnull', False)), fields=('user', 'challenge_date', 'difficulty_level'), name='games_game_one_challenge_per_day'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:32
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_archived_wins(apps, schema_editor):
+    """Tally wins already archived, which the leaderboards no longer rank."""
+    ArchivedGame = apps.get_model('games', 'ArchivedGame')
+    ScoreBucket = apps.get_model('games', 'ScoreBucket')
+    rows = (
+        ArchivedGame.objects.filter(is_won=True, score__isnull=False, challenge_date__isnull=True)
+        .values_list('difficulty_level', 'score')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    for difficulty, score, count in rows:
+        ScoreBucket.objects.filter(difficulty_level=difficulty, score=score).update(archived=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_daily_challenge'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scorebucket',
+            name='archived',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_archived_wins, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('is_won', True), ('score__isnull', False)), fields=['user', '-score', 'attempts_made', 'started_at'], name='games_game_board_user_idx'),
+        ),
+    ]
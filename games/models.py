@@ -1,11 +1,19 @@
 """Game models for the guessing game application."""
 import random
-from django.db import models
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.contrib.auth.models import User
 from django.utils import timezone
+from core import events
+from core.models import DirtyFieldsMixin
+from .live import leaderboard_hub
 
 
-class Game(models.Model):
+class Game(DirtyFieldsMixin, models.Model):
     """Game instance model."""
     
     DIFFICULTY_CHOICES = [
@@ -35,33 +43,205 @@ class Game(models.Model):
     is_won = models.BooleanField(default=False)
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Day of the daily challenge this game plays; null for regular games.
+    challenge_date = models.DateField(null=True, blank=True)
 
     class Meta:
         """Meta options for Game."""
         ordering = ['-started_at']
         indexes = [
             models.Index(fields=['user', '-started_at']),
-            models.Index(fields=['difficulty_level', '-score']),
-            models.Index(fields=['is_won', '-score']),
+            # Leaderboard pages, including their tie-breakers, read straight
+            # off these partial indexes of won games.
+            models.Index(
+                fields=['-score', 'attempts_made', 'started_at'],
+                name='games_game_board_idx',
+                condition=models.Q(is_won=True, score__isnull=False),
+            ),
+            models.Index(
+                fields=['difficulty_level', '-score', 'attempts_made', 'started_at'],
+                name='games_game_board_diff_idx',
+                condition=models.Q(is_won=True, score__isnull=False),
+            ),
+            # A player's wins in leaderboard order, for their best entry.
+            models.Index(
+                fields=['user', '-score', 'attempts_made', 'started_at'],
+                name='games_game_board_user_idx',
+                condition=models.Q(is_won=True, score__isnull=False),
+            ),
+            models.Index(
+                fields=['started_at'],
+                name='games_game_active_idx',
+                condition=models.Q(completed_at__isnull=True),
+            ),
+            models.Index(
+                fields=['challenge_date', 'difficulty_level', '-score', 'attempts_made', 'started_at'],
+                name='games_game_challenge_board_idx',
+                condition=models.Q(is_won=True, challenge_date__isnull=False),
+            ),
+        ]
+        constraints = [
+            # One daily challenge per player, day and difficulty; also serves
+            # the "already played" lookups.
+            models.UniqueConstraint(
+                fields=['user', 'challenge_date', 'difficulty_level'],
+                name='games_game_one_challenge_per_day',
+                condition=models.Q(challenge_date__isnull=False),
+            ),
         ]
 
     def __str__(self) -> str:
         """String representation of Game."""
         return f"Game {self.id} - {self.user.username} - {self.difficulty_level}"
 
+    @classmethod
+    def random_target(cls, difficulty: str) -> int:
+        """Pick a random target number for the difficulty."""
+        min_val, max_val = cls.DIFFICULTY_RANGES.get(difficulty, (1, 99))
+        return random.randint(min_val, max_val)
+
     @classmethod
     def create_game(cls, user: User, difficulty: str) -> 'Game':
         """Create a new game with random target number."""
-        min_val, max_val = cls.DIFFICULTY_RANGES.get(difficulty, (1, 99))
-        target = random.randint(min_val, max_val)
-        return cls.objects.create(
+        game = cls.objects.create(
+            user=user,
+            difficulty_level=difficulty,
+            target_number=cls.random_target(difficulty)
+        )
+        game.log_created()
+        return game
+
+    @classmethod
+    async def acreate_game(cls, user: User, difficulty: str) -> 'Game':
+        """Create a new game with random target number (async)."""
+        game = await cls.objects.acreate(
             user=user,
             difficulty_level=difficulty,
-            target_number=target
+            target_number=cls.random_target(difficulty)
         )
+        game.log_created()
+        return game
+
+    @classmethod
+    def get_leaderboard(cls, difficulty: str = None) -> models.QuerySet:
+        """Get won games in leaderboard order, optionally for one difficulty.
+
+        Daily challenge games have their own boards (see ``games.challenge``):
+        their shared target can be passed around for a whole day.
+        """
+        queryset = cls.objects.filter(
+            is_won=True,
+            score__isnull=False,
+            challenge_date__isnull=True,
+        ).select_related('user').order_by('-score', 'attempts_made', 'started_at')
+
+        if difficulty and difficulty in dict(cls.DIFFICULTY_CHOICES):
+            queryset = queryset.filter(difficulty_level=difficulty)
+
+        return queryset
+
+    @classmethod
+    def leaderboard_rank(cls, entry, difficulty: str = None) -> int:
+        """Rank of a won game (or ``GameRow``) on the overall or one difficulty's leaderboard."""
+        return cls.leaderboard_ranks([entry], difficulty)[0]
+
+    @classmethod
+    def leaderboard_ranks(cls, entries: list, difficulty: str = None) -> list[int]:
+        """Ranks of won games (or ``GameRow``s) on the overall or one difficulty's leaderboard.
+
+        Entries with a higher score are summed from the cached score
+        histograms, so only ties at the entries' own scores are counted in the
+        database, with one query over those scores' range of the leaderboard
+        index.
+        """
+        if not entries:
+            return []
+        if difficulty not in cls.DIFFICULTY_RANGES:
+            difficulty = None
+        board_counts = [
+            ScoreBucket.get_board_counts(board)
+            for board in ([difficulty] if difficulty else cls.DIFFICULTY_RANGES)
+        ]
+        ties = cls.get_leaderboard(difficulty).filter(score__in={entry.score for entry in entries}).aggregate(**{
+            f'entry_{index}': models.Count('pk', filter=models.Q(score=entry.score) & (
+                models.Q(attempts_made__lt=entry.attempts_made)
+                | models.Q(attempts_made=entry.attempts_made, started_at__lt=entry.started_at)
+            ))
+            for index, entry in enumerate(entries)
+        })
+        return [
+            sum(count for counts in board_counts for score, count in counts.items() if score > entry.score)
+            + ties[f'entry_{index}'] + 1
+            for index, entry in enumerate(entries)
+        ]
+
+    @classmethod
+    def best_entries(cls, user_ids: list[int], difficulty: str = None) -> models.QuerySet:
+        """Each of these players' best leaderboard entry, in one query over the per-player index."""
+        return cls.get_leaderboard(difficulty).filter(user_id__in=user_ids).annotate(
+            player_position=Window(
+                RowNumber(),
+                partition_by=[F('user_id')],
+                order_by=[F('score').desc(), F('attempts_made').asc(), F('started_at').asc()],
+            ),
+        ).filter(player_position=1).order_by()
+
+    @classmethod
+    def search_leaderboard(cls, query: str, difficulty: str = None, limit: int = 10) -> list:
+        """Best leaderboard entry, as a ``GameRow`` with its rank, of each player matching ``query``.
+
+        Players are found by username prefix through the profile index, and
+        their best entries and rank ties are each fetched in one query, so the
+        lookup never scans the game or user tables.
+        """
+        from users.models import UserProfile
+        from .projections import Projection
+
+        user_ids = UserProfile.search_user_ids(query, limit)
+        if not user_ids:
+            return []
+        entries = list(Projection(cls.best_entries(user_ids, difficulty)))
+        for row, rank in zip(entries, cls.leaderboard_ranks(entries, difficulty)):
+            row.rank = rank
+        entries.sort(key=lambda game: game.rank)
+        return entries
 
     def check_guess(self, guess: int) -> str:
         """Check guess against target number and return feedback."""
+        feedback = self.apply_guess(guess)
+        # Always save the increment (and any updated fields) so the next
+        # request will read the correct attempts_made from the database.
+        # Only the changed columns are written.
+        self.save()
+        if self.is_won:
+            self.record_win()
+        self.log_guess(guess, self.attempts_made, feedback)
+        if self.is_game_over():
+            self.log_outcome()
+        return feedback
+
+    async def acheck_guess(self, guess: int) -> str:
+        """Check guess against target number and return feedback (async)."""
+        feedback = self.apply_guess(guess)
+        await self.asave()
+        if self.is_won:
+            await sync_to_async(self.record_win)()
+        self.log_guess(guess, self.attempts_made, feedback)
+        if self.is_game_over():
+            self.log_outcome()
+        return feedback
+
+    def record_win(self) -> None:
+        """Put a saved win on its leaderboard and score histogram, or its challenge board."""
+        if self.challenge_date is not None:
+            from .challenge import invalidate_board
+            invalidate_board(self.difficulty_level, self.challenge_date)
+            return
+        ScoreBucket.record_score(self.difficulty_level, self.score)
+        leaderboard_hub.notify(self)
+
+    def apply_guess(self, guess: int) -> str:
+        """Record a guess on this game and return feedback; mutates, does not save."""
         # Increment attempts and persist so subsequent requests see the updated
         # attempts_made value. Previously we only saved when the guess was
         # correct which meant the DB value remained stale and all guesses
@@ -73,10 +253,10 @@ class Game(models.Model):
             self.completed_at = timezone.now()
             # Calculate score after marking as won (calculate_score checks is_won)
             self.score = self.calculate_score()
-
-        # Always save the increment (and any updated fields) so the next
-        # request will read the correct attempts_made from the database.
-        self.save()
+        elif self.attempts_made >= self.max_attempts:
+            # Lost games are finalized too, so only games still in play keep a
+            # NULL completed_at and stay in the active-games index.
+            self.completed_at = timezone.now()
 
         if guess == self.target_number:
             return 'correct'
@@ -85,6 +265,40 @@ class Game(models.Model):
         else:
             return 'too_low'
 
+    def log_created(self) -> None:
+        """Log the game's creation to the event log."""
+        events.emit(
+            events.GAME_CREATED,
+            game_id=self.pk,
+            user_id=self.user_id,
+            difficulty=self.difficulty_level,
+            max_attempts=self.max_attempts,
+        )
+
+    def log_guess(self, guess: int, attempt_number: int, feedback: str) -> None:
+        """Log a guess to the event log."""
+        events.emit(
+            events.GUESS_MADE,
+            game_id=self.pk,
+            user_id=self.user_id,
+            difficulty=self.difficulty_level,
+            attempt=attempt_number,
+            guess=guess,
+            feedback=feedback,
+        )
+
+    def log_outcome(self) -> None:
+        """Log the game's win or loss to the event log."""
+        events.emit(
+            events.GAME_WON if self.is_won else events.GAME_LOST,
+            game_id=self.pk,
+            user_id=self.user_id,
+            difficulty=self.difficulty_level,
+            attempts=self.attempts_made,
+            max_attempts=self.max_attempts,
+            score=self.score,
+        )
+
     def calculate_score(self) -> int:
         """Calculate score based on attempts and difficulty."""
         if not self.is_won:
@@ -95,8 +309,20 @@ class Game(models.Model):
         return base_score * multiplier
 
     def is_game_over(self) -> bool:
-        """Check if game is over (won or attempts exhausted)."""
-        return self.is_won or self.attempts_made >= self.max_attempts
+        """Check if game is over (won, attempts exhausted or abandoned)."""
+        return (
+            self.is_won
+            or self.attempts_made >= self.max_attempts
+            or self.completed_at is not None
+        )
+
+    def is_abandoned(self) -> bool:
+        """Check if game was finalized without being won or played out."""
+        return (
+            not self.is_won
+            and self.completed_at is not None
+            and self.attempts_made < self.max_attempts
+        )
 
     def get_remaining_attempts(self) -> int:
         """Get remaining attempts."""
@@ -107,6 +333,114 @@ class Game(models.Model):
         return self.DIFFICULTY_RANGES.get(self.difficulty_level, (1, 99))
 
 
+class ScoreBucket(models.Model):
+    """Number of won games per difficulty and score.
+
+    Scores take at most ``max_attempts`` distinct values per difficulty, so a
+    difficulty's whole histogram is a handful of rows; it is cached until the
+    next win changes it, which makes percentile lookups constant time. Wins
+    moved to the archive stay counted but are tallied in ``archived`` too,
+    since they leave the leaderboards, which rank from ``count - archived``.
+    """
+
+    # Bounds how long a histogram read racing a concurrent win can stay stale.
+    CACHE_TIMEOUT = 300
+
+    difficulty_level = models.CharField(max_length=20, choices=Game.DIFFICULTY_CHOICES)
+    score = models.IntegerField()
+    count = models.PositiveIntegerField(default=0)
+    archived = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """Meta options for ScoreBucket."""
+        ordering = ['difficulty_level', 'score']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['difficulty_level', 'score'],
+                name='games_scorebucket_unique_score',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of ScoreBucket."""
+        return f"{self.difficulty_level} {self.score}: {self.count}"
+
+    @staticmethod
+    def cache_key(difficulty: str) -> str:
+        """Cache key for a difficulty's buckets."""
+        return f'games:score-buckets:{difficulty}'
+
+    @classmethod
+    def record_score(cls, difficulty: str, score: int) -> None:
+        """Count one won game with this score."""
+        bucket = cls.objects.filter(difficulty_level=difficulty, score=score)
+        if not bucket.update(count=F('count') + 1):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(difficulty_level=difficulty, score=score, count=1)
+            except IntegrityError:
+                # Another request created the bucket first.
+                bucket.update(count=F('count') + 1)
+        cache.delete(cls.cache_key(difficulty))
+
+    @classmethod
+    def record_archived(cls, difficulty: str, score: int, count: int) -> None:
+        """Count archived won games with this score, which leave the leaderboards."""
+        bucket = cls.objects.filter(difficulty_level=difficulty, score=score)
+        if not bucket.update(archived=F('archived') + count):
+            try:
+                with transaction.atomic():
+                    # The wins predate the histogram; count them as archived history.
+                    cls.objects.create(difficulty_level=difficulty, score=score, count=count, archived=count)
+            except IntegrityError:
+                bucket.update(archived=F('archived') + count)
+        cache.delete(cls.cache_key(difficulty))
+
+    @classmethod
+    async def arecord_score(cls, difficulty: str, score: int) -> None:
+        """Count one won game with this score (async)."""
+        await sync_to_async(cls.record_score)(difficulty, score)
+
+    @classmethod
+    def get_buckets(cls, difficulty: str) -> dict[int, tuple[int, int]]:
+        """Get the won and archived won game counts per score for a difficulty."""
+        key = cls.cache_key(difficulty)
+        buckets = cache.get(key)
+        if buckets is None:
+            buckets = {
+                score: (count, archived)
+                for score, count, archived in cls.objects.filter(difficulty_level=difficulty)
+                .values_list('score', 'count', 'archived')
+            }
+            cache.set(key, buckets, cls.CACHE_TIMEOUT)
+        return buckets
+
+    @classmethod
+    def get_histogram(cls, difficulty: str) -> dict[int, int]:
+        """Get the number of won games per score for a difficulty."""
+        return {score: count for score, (count, archived) in cls.get_buckets(difficulty).items()}
+
+    @classmethod
+    def get_board_counts(cls, difficulty: str) -> dict[int, int]:
+        """Get the number of leaderboard entries per score for a difficulty."""
+        return {score: count - archived for score, (count, archived) in cls.get_buckets(difficulty).items()}
+
+    @classmethod
+    def percent_beaten(cls, difficulty: str, score: int | None) -> float | None:
+        """Percentage of won games at this difficulty with a lower score.
+
+        Returns None when there is no score or no history to compare against.
+        """
+        if score is None:
+            return None
+        histogram = cls.get_histogram(difficulty)
+        total = sum(histogram.values())
+        if not total:
+            return None
+        below = sum(count for bucket_score, count in histogram.items() if bucket_score < score)
+        return round(below / total * 100, 1)
+
+
 class Guess(models.Model):
     """Individual guess record."""
     
@@ -133,3 +467,74 @@ class Guess(models.Model):
     def __str__(self) -> str:
         """String representation of Guess."""
         return f"Guess {self.guess_number} (Attempt {self.attempt_number}) - {self.feedback}"
+
+
+class ArchivedGame(models.Model):
+    """Completed game moved out of the hot tables, with its guesses inlined.
+
+    Rows keep the primary key of the game they replace, so links to a game
+    keep working after it is archived; guesses are stored as compact
+    ``[attempt_number, guess_number, feedback, created_at]`` lists.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_games')
+    difficulty_level = models.CharField(max_length=20, choices=Game.DIFFICULTY_CHOICES)
+    target_number = models.IntegerField()
+    attempts_made = models.IntegerField()
+    max_attempts = models.IntegerField()
+    score = models.IntegerField(null=True, blank=True)
+    is_won = models.BooleanField(default=False)
+    started_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+    challenge_date = models.DateField(null=True, blank=True)
+    guesses = models.JSONField(default=list)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta options for ArchivedGame."""
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['user', '-started_at']),
+        ]
+
+    is_game_over = Game.is_game_over
+    is_abandoned = Game.is_abandoned
+
+    def __str__(self) -> str:
+        """String representation of ArchivedGame."""
+        return f"Archived game {self.id} - {self.user.username} - {self.difficulty_level}"
+
+    @classmethod
+    def from_game(cls, game: Game, guesses: list[Guess]) -> 'ArchivedGame':
+        """Build the archive row of a game and its guesses."""
+        return cls(
+            id=game.pk,
+            user_id=game.user_id,
+            difficulty_level=game.difficulty_level,
+            target_number=game.target_number,
+            attempts_made=game.attempts_made,
+            max_attempts=game.max_attempts,
+            score=game.score,
+            is_won=game.is_won,
+            started_at=game.started_at,
+            completed_at=game.completed_at,
+            challenge_date=game.challenge_date,
+            guesses=[
+                [guess.attempt_number, guess.guess_number, guess.feedback, guess.created_at.isoformat()]
+                for guess in guesses
+            ],
+        )
+
+    def get_guesses(self) -> list[Guess]:
+        """Unsaved ``Guess`` objects for the archived guesses, in attempt order."""
+        return [
+            Guess(
+                game_id=self.pk,
+                attempt_number=attempt_number,
+                guess_number=guess_number,
+                feedback=feedback,
+                created_at=datetime.fromisoformat(created_at),
+            )
+            for attempt_number, guess_number, feedback, created_at in sorted(self.guesses)
+        ]
@@ -0,0 +1,94 @@
+"""Slim read models for the game list views.
+
+List pages show a handful of columns per game. ``GameRow`` holds exactly
+those in ``__slots__`` and is built from ``values_list`` tuples, so a page
+fetches no unused ``Game`` columns and only the username from ``User``, and
+skips model instantiation and per-instance ``__dict__``s.
+"""
+from django.db.models import QuerySet
+
+from .models import Game
+
+
+class GameRow:
+    """Read-only projection of a game for list views and templates."""
+
+    FIELDS = {
+        'id': 'pk',
+        'user_id': 'user_id',
+        'username': 'user__username',
+        'difficulty_level': 'difficulty_level',
+        'attempts_made': 'attempts_made',
+        'max_attempts': 'max_attempts',
+        'score': 'score',
+        'is_won': 'is_won',
+        'started_at': 'started_at',
+    }
+    __slots__ = (*FIELDS, 'rank', 'page')
+
+    DIFFICULTY_DISPLAY = dict(Game.DIFFICULTY_CHOICES)
+
+    def __init__(self, values: tuple):
+        """Build a row from a ``values_list`` tuple in ``FIELDS`` order."""
+        for name, value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+        self.rank = None
+        self.page = None
+
+    @property
+    def pk(self) -> int:
+        """Primary key of the projected game."""
+        return self.id
+
+    def get_difficulty_level_display(self) -> str:
+        """Human-readable difficulty, like the model's choices display."""
+        return self.DIFFICULTY_DISPLAY.get(self.difficulty_level, self.difficulty_level)
+
+    @classmethod
+    def values(cls, queryset: QuerySet) -> QuerySet:
+        """Narrow a Game or ArchivedGame queryset to the projected columns."""
+        return queryset.values_list(*cls.FIELDS.values())
+
+
+class Projection:
+    """Lazy, sliceable sequence of ``GameRow``s over a queryset.
+
+    Supports what ``Paginator`` and templates need: ``count()``, ``len()``,
+    slicing and iteration, each running one narrow query.
+    """
+
+    def __init__(self, queryset: QuerySet, row_class: type[GameRow] = GameRow):
+        """Wrap a queryset; nothing is fetched until the projection is read."""
+        self.queryset = row_class.values(queryset)
+        self.row_class = row_class
+
+    def count(self) -> int:
+        """Number of rows, counted in the database."""
+        return self.queryset.count()
+
+    async def acount(self) -> int:
+        """Number of rows, counted in the database (async)."""
+        return await self.queryset.acount()
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return self.count()
+
+    def __getitem__(self, key):
+        """Fetch one row or a slice of rows."""
+        if isinstance(key, slice):
+            return [self.row_class(values) for values in self.queryset[key]]
+        return self.row_class(self.queryset[key])
+
+    def __iter__(self):
+        """Fetch and yield every row."""
+        return (self.row_class(values) for values in self.queryset)
+
+    async def aslice(self, start: int, stop: int) -> list[GameRow]:
+        """Fetch rows[start:stop] (async)."""
+        return [self.row_class(values) async for values in self.queryset[start:stop]]
+
+    def first(self) -> GameRow | None:
+        """Fetch the first row, or None."""
+        rows = self[:1]
+        return rows[0] if rows else None
@@ -0,0 +1,258 @@
+"""Head-to-head race matches held in memory by a per-process broker.
+
+Every player in a match gets an unsaved ``Game`` for the shared target, and
+guesses are applied to it with the same rules as single-player games. Moves
+touch only memory; opponents see each other's progress through a server-sent
+event stream, and all games, guesses and profile statistics of a match are
+written in one batch when it ends. Matches live in the worker process that
+created them, so the ASGI deployment must route a match's requests to one
+worker (a single worker, or sticky sessions).
+"""
+import asyncio
+import secrets
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .live import Watcher, format_event, leaderboard_hub
+from .models import Game, Guess, ScoreBucket
+
+WAITING, RUNNING, FINISHED = 'waiting', 'running', 'finished'
+
+
+class RaceError(Exception):
+    """A race action that is not allowed in the match's current state."""
+
+
+@dataclass
+class RacePlayer:
+    """One player's state in a match."""
+    user_id: int
+    username: str
+    game: Game
+    guesses: list[Guess] = field(default_factory=list)
+
+    def progress(self) -> dict:
+        """Progress visible to opponents; guess values stay private."""
+        return {
+            'user_id': self.user_id,
+            'username': self.username,
+            'attempts': self.game.attempts_made,
+            'won': self.game.is_won,
+            'finished': self.game.is_game_over(),
+            'game_id': self.game.pk,
+        }
+
+
+@dataclass
+class Match:
+    """A race between players chasing the same target."""
+    id: str
+    host_id: int
+    difficulty: str
+    target: int
+    capacity: int
+    status: str = WAITING
+    players: dict[int, RacePlayer] = field(default_factory=dict)
+    watchers: set[Watcher] = field(default_factory=set)
+    created_at: object = field(default_factory=timezone.now)
+    started_at: object = None
+    winner_id: int | None = None
+    timer: asyncio.TimerHandle | None = None
+
+    def state(self) -> dict:
+        """Full match state sent to watchers."""
+        return {
+            'status': self.status,
+            'capacity': self.capacity,
+            'host_id': self.host_id,
+            'winner_id': self.winner_id,
+            'players': [player.progress() for player in self.players.values()],
+        }
+
+
+def persist_match(match: Match) -> None:
+    """Write a finished match's games, guesses and profile statistics in one batch."""
+    from users.models import UserProfile
+
+    players = list(match.players.values())
+    with transaction.atomic():
+        games = Game.objects.bulk_create([player.game for player in players])
+        # started_at is auto_now_add; restore the real start of the match.
+        Game.objects.filter(pk__in=[game.pk for game in games]).update(started_at=match.started_at)
+        guesses = []
+        for player in players:
+            player.game.started_at = match.started_at
+            for guess in player.guesses:
+                guess.game = player.game
+                guesses.append(guess)
+        # created_at is auto_now_add too; keep the time each guess was made.
+        made_at = [guess.created_at for guess in guesses]
+        Guess.objects.bulk_create(guesses)
+        for guess, created_at in zip(guesses, made_at):
+            guess.created_at = created_at
+        Guess.objects.bulk_update(guesses, ['created_at'], batch_size=500)
+
+        losers = [player.user_id for player in players if not player.game.is_won]
+        UserProfile.objects.filter(user_id__in=losers).update(
+            total_games_played=F('total_games_played') + 1,
+            updated_at=timezone.now(),
+        )
+        for player in players:
+            if player.game.is_won:
+                UserProfile.objects.get(user_id=player.user_id).record_game(player.game)
+                ScoreBucket.record_score(player.game.difficulty_level, player.game.score)
+    for player in players:
+        if player.game.is_won:
+            leaderboard_hub.notify(player.game)
+        player.game.log_created()
+        for guess in player.guesses:
+            player.game.log_guess(guess.guess_number, guess.attempt_number, guess.feedback)
+        player.game.log_outcome()
+
+
+class MatchBroker:
+    """Holds live matches for one event loop and pushes their progress."""
+
+    def __init__(self):
+        """Create an empty broker."""
+        self.matches: dict[str, Match] = {}
+
+    def get(self, match_id: str) -> Match | None:
+        """Get a live or recently finished match."""
+        return self.matches.get(match_id)
+
+    def create(self, user, difficulty: str, capacity: int) -> Match:
+        """Open a match and seat its host."""
+        match = Match(
+            id=secrets.token_urlsafe(6),
+            host_id=user.pk,
+            difficulty=difficulty,
+            target=Game.random_target(difficulty),
+            capacity=capacity,
+        )
+        self.matches[match.id] = match
+        self._schedule(match, settings.RACE_JOIN_TIMEOUT_SECONDS, self._discard)
+        self.join(match, user)
+        return match
+
+    def join(self, match: Match, user) -> None:
+        """Seat a player; the match starts when it is full."""
+        if user.pk in match.players:
+            return
+        if match.status != WAITING:
+            raise RaceError('This race has already started.')
+        game = Game(
+            user=user,
+            difficulty_level=match.difficulty,
+            target_number=match.target,
+        )
+        match.players[user.pk] = RacePlayer(user.pk, user.username, game)
+        self._broadcast(match, 'state', match.state())
+        if len(match.players) >= match.capacity:
+            self.start(match, user)
+
+    def start(self, match: Match, user) -> None:
+        """Start a waiting match once at least two players are seated."""
+        if match.status != WAITING:
+            return
+        if user.pk != match.host_id and len(match.players) < match.capacity:
+            raise RaceError('Only the host can start the race early.')
+        if len(match.players) < 2:
+            raise RaceError('A race needs at least two players.')
+        match.status = RUNNING
+        match.started_at = timezone.now()
+        self._schedule(match, settings.RACE_MATCH_TIMEOUT_SECONDS, self.finish)
+        self._broadcast(match, 'state', match.state())
+
+    async def guess(self, match: Match, user, value: int) -> str:
+        """Apply a guess for a player and return the feedback."""
+        player = match.players.get(user.pk)
+        if player is None:
+            raise RaceError('You are not in this race.')
+        if match.status != RUNNING:
+            raise RaceError('This race is not running.')
+        if player.game.is_game_over():
+            raise RaceError('You have no attempts left.')
+        feedback = player.game.apply_guess(value)
+        player.guesses.append(Guess(
+            guess_number=value,
+            attempt_number=player.game.attempts_made,
+            feedback=feedback,
+            created_at=timezone.now(),
+        ))
+        self._broadcast(match, 'progress', player.progress())
+        if player.game.is_won:
+            match.winner_id = player.user_id
+            await self.finish(match)
+        elif all(other.game.is_game_over() for other in match.players.values()):
+            await self.finish(match)
+        return feedback
+
+    async def finish(self, match: Match) -> None:
+        """End a match, finalize unfinished players and persist the results."""
+        if match.status == FINISHED:
+            return
+        was_running = match.status == RUNNING
+        match.status = FINISHED
+        if not was_running:
+            self._discard(match)
+            return
+        now = timezone.now()
+        for player in match.players.values():
+            if player.game.completed_at is None:
+                player.game.completed_at = now
+        await sync_to_async(persist_match)(match)
+        self._broadcast(match, 'state', match.state())
+        self._schedule(match, settings.RACE_RESULT_TTL_SECONDS, self._discard)
+
+    async def watch(self, match: Match):
+        """Yield server-sent events for a match: its state, then every change."""
+        watcher = Watcher(settings.LIVE_LEADERBOARD_MAX_PENDING)
+        match.watchers.add(watcher)
+        try:
+            yield format_event('state', match.state())
+            while match.id in self.matches:
+                try:
+                    yield await asyncio.wait_for(
+                        watcher.queue.get(), settings.LIVE_LEADERBOARD_HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    yield ': keep-alive\n\n'
+        finally:
+            match.watchers.discard(watcher)
+
+    def _broadcast(self, match: Match, event: str, data: dict) -> None:
+        """Push an event to every watcher of a match."""
+        message = format_event(event, data)
+        resync = format_event('state', match.state())
+        for watcher in list(match.watchers):
+            watcher.send(message, resync)
+
+    def _schedule(self, match: Match, delay: float, callback) -> None:
+        """Replace the match's timer with one that runs callback(match)."""
+        if match.timer is not None:
+            match.timer.cancel()
+        loop = asyncio.get_running_loop()
+
+        def fire():
+            result = callback(match)
+            if asyncio.iscoroutine(result):
+                loop.create_task(result)
+
+        match.timer = loop.call_later(delay, fire)
+
+    def _discard(self, match: Match) -> None:
+        """Forget a match and close its streams."""
+        if match.timer is not None:
+            match.timer.cancel()
+        self.matches.pop(match.id, None)
+        for watcher in list(match.watchers):
+            watcher.send(format_event('closed', {}), format_event('closed', {}))
+
+
+match_broker = MatchBroker()
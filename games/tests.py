@@ -1,3 +1,510 @@
+"""Tests for games app."""
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import QueryPlanTestCase
+from users.models import UserProfile
+from . import challenge
+from .archive import archive_chunk, get_game, get_guesses, recent_games
+from .models import ArchivedGame, Game, Guess, ScoreBucket
+from .projections import Projection
+from .race import FINISHED, RUNNING, WAITING, MatchBroker, RaceError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class HotQueryPlanTests(QueryPlanTestCase):
+    """The hottest game queries are served by indexes, without temporary sorts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a player with a won and an active game."""
+        cls.user = User.objects.create_user('player', password='pw')
+        cls.game = Game.objects.create(
+            user=cls.user, difficulty_level='easy', target_number=5,
+            attempts_made=3, is_won=True, score=800,
+        )
+        Game.objects.create(user=cls.user, difficulty_level='easy', target_number=7)
+
+    def test_leaderboard(self):
+        """The overall leaderboard page follows the leaderboard index."""
+        self.assertIndexedPlan(Projection(Game.get_leaderboard()).queryset[:20], 'leaderboard')
+
+    def test_leaderboard_by_difficulty(self):
+        """A difficulty's leaderboard page follows the difficulty leaderboard index."""
+        for difficulty in Game.DIFFICULTY_RANGES:
+            with self.subTest(difficulty=difficulty):
+                self.assertIndexedPlan(
+                    Projection(Game.get_leaderboard(difficulty)).queryset[:20], f'leaderboard ({difficulty})'
+                )
+
+    def test_leaderboard_rank(self):
+        """Counting the games ranked above an entry stays on the leaderboard index."""
+        ahead = Game.get_leaderboard('easy').filter(score__gt=self.game.score)
+        self.assertIndexedPlan(ahead.values('pk'), 'leaderboard rank')
+
+    def test_recent_games(self):
+        """A player's recent games, hot and archived, are an index range."""
+        self.assertIndexedPlan(Projection(Game.objects.filter(user=self.user)).queryset[:10], 'recent games')
+        self.assertIndexedPlan(
+            Projection(ArchivedGame.objects.filter(user=self.user)).queryset[:10], 'recent archived games'
+        )
+
+    def test_guesses_by_game(self):
+        """A game's guesses are read in attempt order from the game index."""
+        self.assertIndexedPlan(Guess.objects.filter(game=self.game).order_by('attempt_number'), 'guesses by game')
+
+    def test_abandoned_games(self):
+        """The sweeper finds stale active games through the partial index."""
+        cutoff = timezone.now() - timedelta(hours=24)
+        stale = Game.objects.filter(completed_at__isnull=True, started_at__lt=cutoff).order_by('started_at')
+        self.assertIndexedPlan(stale.values_list('pk')[:500], 'abandoned games')
+
+    def test_challenge_board(self):
+        """A challenge board is a range of the challenge board index."""
+        wins = Game.objects.filter(
+            challenge_date=challenge.today(), difficulty_level='easy', is_won=True,
+        ).order_by('-score', 'attempts_made', 'started_at')
+        self.assertIndexedPlan(Projection(wins).queryset[:challenge.BOARD_SIZE], 'challenge board')
+
+    def test_challenge_played(self):
+        """A player's challenge games of a day come from the one-per-day unique index."""
+        self.assertIndexedPlan(Game.objects.filter(user=self.user, challenge_date=challenge.today()), 'challenges played')
+
+    def test_best_entries(self):
+        """Players' best entries are found through the per-player index."""
+        self.assertIndexedPlan(Game.best_entries([self.user.pk], 'easy'), 'best entries')
+
+    def test_rank_ties(self):
+        """Ties at the searched entries' scores are a range of the leaderboard index."""
+        ties = Game.get_leaderboard('easy').filter(score__in=[800, 900])
+        self.assertIndexedPlan(ties.values('pk'), 'rank ties')
+
+
+class LeaderboardSearchTests(TestCase):
+    """Player search finds each player's best entry with its leaderboard rank."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Win games for several players through check_guess, which keeps the histograms."""
+        cls.players = {}
+        for name, attempts in (('alice', [3, 1]), ('albert', [2]), ('bob', [1, 2]), ('carol', [2])):
+            user = User.objects.create_user(name, password='pw')
+            cls.players[name] = user
+            for count in attempts:
+                game = Game.objects.create(user=user, difficulty_level='easy', target_number=5)
+                for _ in range(count - 1):
+                    game.check_guess(6)
+                game.check_guess(5)
+
+    def setUp(self):
+        """Start from an empty histogram cache."""
+        cache.clear()
+
+    def ranks(self, query: str, difficulty: str = None) -> dict[str, tuple[int, int]]:
+        """Search and return each found player's best score and rank."""
+        return {row.username: (row.score, row.rank) for row in Game.search_leaderboard(query, difficulty)}
+
+    def test_best_entry_and_rank(self):
+        """Each match shows the player's best win ranked among all wins."""
+        # Scores: alice 1000 and 800, bob 1000 and 900, albert 900, carol 900.
+        self.assertEqual(self.ranks('al'), {'alice': (1000, 1), 'albert': (900, 3)})
+        self.assertEqual(self.ranks('BO', 'easy'), {'bob': (1000, 2)})
+        self.assertEqual(self.ranks('nobody'), {})
+
+    def test_lookup_query_count(self):
+        """A search costs the player lookup, the best entries and one tie count, whatever it finds."""
+        for difficulty in ('easy', None):
+            Game.search_leaderboard('a', difficulty)
+            with self.assertNumQueries(3):
+                self.assertEqual(len(Game.search_leaderboard('a', difficulty)), 2)
+
+    def test_rank_matches_leaderboard_order(self):
+        """Ranks agree with positions on the full leaderboard."""
+        order = list(Game.get_leaderboard('easy').values_list('pk', flat=True))
+        for game in Game.get_leaderboard('easy'):
+            self.assertEqual(Game.leaderboard_rank(game, 'easy'), order.index(game.pk) + 1)
+
+    def test_archived_wins_leave_the_ranks(self):
+        """Wins moved to the archive no longer count towards ranks."""
+        archive_chunk(timezone.now() + timedelta(days=1), 1, include_wins=True)
+        order = list(Game.get_leaderboard().values_list('pk', flat=True))
+        for game in Game.get_leaderboard():
+            self.assertEqual(Game.leaderboard_rank(game), order.index(game.pk) + 1)
+
+
+class DailyChallengeTests(TestCase):
+    """Everyone plays the same daily target once, and boards are cached until a win."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create two players."""
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+
+    def setUp(self):
+        """Start from an empty board cache."""
+        cache.clear()
+
+    def test_shared_target(self):
+        """Every player gets the day's target, which changes from day to day."""
+        alice_game, _ = challenge.start_challenge(self.alice, 'moderate')
+        bob_game, _ = challenge.start_challenge(self.bob, 'moderate')
+        today = challenge.today()
+        self.assertEqual(alice_game.target_number, challenge.challenge_target('moderate', today))
+        self.assertEqual(bob_game.target_number, alice_game.target_number)
+        targets = {challenge.challenge_target('moderate', today + timedelta(days=offset)) for offset in range(10)}
+        self.assertGreater(len(targets), 1)
+        self.assertTrue(all(1 <= target <= 999 for target in targets))
+
+    def test_one_game_per_day(self):
+        """Starting a challenge again resumes the same game until the next day."""
+        game, created = challenge.start_challenge(self.alice, 'easy')
+        self.assertTrue(created)
+        self.assertEqual(challenge.start_challenge(self.alice, 'easy'), (game, False))
+        self.assertEqual(challenge.played_games(self.alice), {'easy': game})
+        tomorrow, created = challenge.start_challenge(self.alice, 'easy', challenge.today() + timedelta(days=1))
+        self.assertTrue(created)
+        self.assertNotEqual(tomorrow.pk, game.pk)
+
+    def test_view_sends_finished_players_to_their_result(self):
+        """A finished challenge cannot be replayed from the challenge page."""
+        self.client.force_login(self.alice)
+        response = self.client.post(reverse('games:challenge'), {'difficulty': 'easy'})
+        game = Game.objects.get(user=self.alice, challenge_date=challenge.today())
+        self.assertRedirects(response, reverse('games:game_play', args=[game.pk]))
+        game.check_guess(game.target_number)
+        response = self.client.post(reverse('games:challenge'), {'difficulty': 'easy'})
+        self.assertRedirects(response, reverse('games:game_result', args=[game.pk]))
+        self.assertEqual(Game.objects.filter(user=self.alice).count(), 1)
+
+    def test_board_is_cached_until_a_win(self):
+        """The board is computed once and recomputed after a challenge win."""
+        self.assertEqual(challenge.get_board('easy'), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(challenge.get_board('easy'), [])
+
+        bob_game, _ = challenge.start_challenge(self.bob, 'easy')
+        bob_game.check_guess(bob_game.target_number + 1 if bob_game.target_number < 99 else 1)
+        bob_game.check_guess(bob_game.target_number)
+        alice_game, _ = challenge.start_challenge(self.alice, 'easy')
+        alice_game.check_guess(alice_game.target_number)
+        board = challenge.get_board('easy')
+        self.assertEqual([(row.username, row.rank) for row in board], [('alice', 1), ('bob', 2)])
+        with self.assertNumQueries(0):
+            challenge.get_board('easy')
+
+    def test_challenge_wins_stay_off_the_leaderboard(self):
+        """Challenge wins only appear on their challenge board."""
+        game, _ = challenge.start_challenge(self.alice, 'easy')
+        game.check_guess(game.target_number)
+        self.assertFalse(Game.get_leaderboard().exists())
+        self.assertEqual(ScoreBucket.get_histogram('easy'), {})
+
+
+class GameResultViewTests(TestCase):
+    """The result page of a win shows the player's standing."""
+
+    def test_percentile_uses_difficulty_label(self):
+        """The percentile names the difficulty by its display label."""
+        cache.clear()
+        user = User.objects.create_user('player', password='pw')
+        for guesses in ([5], [1, 5]):
+            game = Game.objects.create(user=user, difficulty_level='easy', target_number=5)
+            for guess in guesses:
+                game.check_guess(guess)
+        self.client.force_login(user)
+        response = self.client.get(reverse('games:game_result', args=[game.pk]))
+        self.assertContains(response, '% of winning Easy (1-99) games.')
+
+
+class RaceBrokerTests(TestCase):
+    """Races are played in memory and written in one batch when they end."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create three players."""
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+        cls.carol = User.objects.create_user('carol', password='pw')
+
+    def setUp(self):
+        """Start from an empty histogram cache."""
+        cache.clear()
+
+    def miss(self, match) -> int:
+        """A wrong guess for the match's target."""
+        return match.target + 1 if match.target < Game.DIFFICULTY_RANGES[match.difficulty][1] else match.target - 1
+
+    async def test_race_is_won_and_persisted(self):
+        """The first correct guess wins; games, guesses and statistics are saved when the race ends."""
+        broker = MatchBroker()
+        match = broker.create(self.alice, 'easy', 2)
+        self.assertEqual(match.status, WAITING)
+        with self.assertRaisesMessage(RaceError, 'at least two players'):
+            broker.start(match, self.alice)
+        broker.join(match, self.bob)
+        self.assertEqual(match.status, RUNNING)
+        with self.assertRaisesMessage(RaceError, 'already started'):
+            broker.join(match, self.carol)
+        with self.assertRaisesMessage(RaceError, 'not in this race'):
+            await broker.guess(match, self.carol, match.target)
+
+        self.assertNotEqual(await broker.guess(match, self.bob, self.miss(match)), 'correct')
+        self.assertEqual(await Game.objects.acount(), 0)
+        self.assertEqual(await broker.guess(match, self.alice, match.target), 'correct')
+        self.assertEqual((match.status, match.winner_id), (FINISHED, self.alice.pk))
+        with self.assertRaisesMessage(RaceError, 'not running'):
+            await broker.guess(match, self.bob, match.target)
+
+        games = {game.user_id: game async for game in Game.objects.filter(target_number=match.target)}
+        self.assertEqual(set(games), {self.alice.pk, self.bob.pk})
+        won, lost = games[self.alice.pk], games[self.bob.pk]
+        self.assertEqual((won.is_won, won.attempts_made, won.score), (True, 1, 1000))
+        self.assertEqual((lost.is_won, lost.attempts_made), (False, 1))
+        self.assertIsNotNone(lost.completed_at)
+        self.assertEqual(won.started_at, match.started_at)
+        guess = await Guess.objects.aget(game=lost)
+        self.assertEqual(guess.created_at, match.players[self.bob.pk].guesses[0].created_at)
+        alice = await UserProfile.objects.aget(user=self.alice)
+        bob = await UserProfile.objects.aget(user=self.bob)
+        self.assertEqual((alice.total_games_played, alice.total_wins, alice.best_score_easy), (1, 1, 1000))
+        self.assertEqual((bob.total_games_played, bob.total_wins), (1, 0))
+
+    async def test_race_without_winner(self):
+        """A race ends once every player is out of attempts, and nobody wins."""
+        broker = MatchBroker()
+        match = broker.create(self.alice, 'easy', 3)
+        broker.join(match, self.bob)
+        with self.assertRaisesMessage(RaceError, 'Only the host'):
+            broker.start(match, self.bob)
+        broker.start(match, self.alice)
+        for _ in range(10):
+            for user in (self.alice, self.bob):
+                await broker.guess(match, user, self.miss(match))
+        self.assertEqual((match.status, match.winner_id), (FINISHED, None))
+        self.assertEqual(await Guess.objects.acount(), 20)
+        self.assertEqual(await UserProfile.objects.filter(total_games_played=1, total_wins=0).acount(), 2)
+
+    async def test_unstarted_race_is_discarded(self):
+        """Finishing a race that never started forgets it without saving anything."""
+        broker = MatchBroker()
+        match = broker.create(self.alice, 'easy', 2)
+        await broker.finish(match)
+        self.assertIsNone(broker.get(match.id))
+        self.assertEqual(await Game.objects.acount(), 0)
+
+
+class SweepAbandonedGamesTests(TestCase):
+    """The sweeper finalizes stale games and counts the abandoned ones once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create stale, exhausted, finished and fresh games for two players."""
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+        stale = timezone.now() - timedelta(hours=48)
+        cls.abandoned = [
+            Game.objects.create(user=cls.alice, difficulty_level='easy', target_number=5, attempts_made=2),
+            Game.objects.create(user=cls.bob, difficulty_level='easy', target_number=5),
+            Game.objects.create(user=cls.bob, difficulty_level='easy', target_number=5, attempts_made=9),
+        ]
+        cls.exhausted = Game.objects.create(user=cls.alice, difficulty_level='easy', target_number=5, attempts_made=10)
+        cls.finished = Game.objects.create(
+            user=cls.alice, difficulty_level='easy', target_number=5,
+            attempts_made=1, is_won=True, score=1000, completed_at=stale,
+        )
+        Game.objects.update(started_at=stale)
+        cls.fresh = Game.objects.create(user=cls.alice, difficulty_level='easy', target_number=5)
+
+    def sweep(self, *args: str) -> str:
+        """Run one sweep and return its output."""
+        out = StringIO()
+        call_command('sweep_abandoned_games', *args, stdout=out)
+        return out.getvalue()
+
+    def test_sweep_counts(self):
+        """Stale unfinished games are finalized in chunks and abandoned ones counted per player."""
+        self.assertEqual(self.sweep('--chunk-size', '2'), 'Finalized 4 abandoned games.\n')
+        self.assertEqual(
+            set(Game.objects.filter(completed_at__isnull=True).values_list('pk', flat=True)), {self.fresh.pk},
+        )
+        self.assertEqual(UserProfile.objects.get(user=self.alice).total_games_played, 1)
+        self.assertEqual(UserProfile.objects.get(user=self.bob).total_games_played, 2)
+        self.assertEqual(self.sweep('-v', '2'), 'Finalized 0 abandoned games.\n')
+
+    def test_exhausted_and_finished_games_are_not_counted(self):
+        """Games that ran out of attempts were counted by the play view; finished games are left alone."""
+        Game.objects.filter(pk__in=[game.pk for game in self.abandoned]).delete()
+        self.assertEqual(self.sweep(), 'Finalized 1 abandoned games.\n')
+        self.exhausted.refresh_from_db()
+        self.assertIsNotNone(self.exhausted.completed_at)
+        self.assertEqual(Game.objects.get(pk=self.finished.pk).completed_at, self.finished.completed_at)
+        self.assertEqual(UserProfile.objects.get(user=self.alice).total_games_played, 0)
+
+    def test_ttl(self):
+        """Games younger than the TTL are left in play."""
+        self.assertEqual(self.sweep('--ttl-hours', '72', '-v', '2'), 'Finalized 0 abandoned games.\n')
+
+
+class ArchiveTests(TestCase):
+    """Archiving moves completed games and their guesses, and reads fall through to the archive."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create an old loss, an old win and a game in play."""
+        cls.user = User.objects.create_user('player', password='pw')
+        cls.cutoff = timezone.now() + timedelta(days=1)
+        cls.lost = Game.objects.create(user=cls.user, difficulty_level='easy', target_number=5, max_attempts=2)
+        cls.won = Game.objects.create(user=cls.user, difficulty_level='easy', target_number=5)
+        for game, numbers in ((cls.lost, [1, 9]), (cls.won, [5])):
+            for number in numbers:
+                feedback = game.check_guess(number)
+                Guess.objects.create(game=game, guess_number=number, attempt_number=game.attempts_made, feedback=feedback)
+        cls.active = Game.objects.create(user=cls.user, difficulty_level='easy', target_number=5)
+
+    def test_archive_chunk_moves_losses(self):
+        """Completed losses move with their guesses inlined; wins and games in play stay hot."""
+        self.assertEqual(archive_chunk(self.cutoff, 10), [self.lost.pk])
+        self.assertEqual(set(Game.objects.values_list('pk', flat=True)), {self.won.pk, self.active.pk})
+        self.assertFalse(Guess.objects.filter(game_id=self.lost.pk).exists())
+        archived = ArchivedGame.objects.get()
+        self.assertEqual((archived.pk, archived.attempts_made, archived.completed_at), (self.lost.pk, 2, self.lost.completed_at))
+        self.assertEqual([(g.attempt_number, g.guess_number, g.feedback) for g in archived.get_guesses()],
+                         [(1, 1, 'too_low'), (2, 9, 'too_high')])
+        self.assertEqual(archive_chunk(self.cutoff, 10), [])
+
+    def test_archive_chunk_resumes_after_pk(self):
+        """Chunks walk primary keys upwards and include wins on request."""
+        self.assertEqual(archive_chunk(self.cutoff, 1, include_wins=True), [self.lost.pk])
+        self.assertEqual(archive_chunk(self.cutoff, 1, include_wins=True, after_pk=self.lost.pk), [self.won.pk])
+        self.assertEqual(archive_chunk(timezone.now() - timedelta(days=1), 10, include_wins=True), [])
+
+    def test_get_game_falls_through(self):
+        """Games and their guesses are found by primary key after archiving."""
+        archive_chunk(self.cutoff, 10)
+        game = get_game(self.lost.pk)
+        self.assertIsInstance(game, ArchivedGame)
+        self.assertEqual([guess.guess_number for guess in get_guesses(game)], [1, 9])
+        self.assertIsInstance(get_game(self.won.pk), Game)
+        self.assertEqual([guess.guess_number for guess in get_guesses(get_game(self.won.pk))], [5])
+        self.assertIsNone(get_game(0))
+
+    def test_recent_games_falls_through(self):
+        """Recent games merge both tables newest first, and the archive only fills the gaps."""
+        archive_chunk(self.cutoff, 10)
+        self.assertEqual([row.pk for row in recent_games(self.user, 10)], [self.active.pk, self.won.pk, self.lost.pk])
+        self.assertEqual([row.pk for row in recent_games(self.user, 2)], [self.active.pk, self.won.pk])
+        Game.objects.filter(pk=self.lost.pk).delete()
+        ArchivedGame.objects.filter(pk=self.lost.pk).update(started_at=timezone.now() + timedelta(hours=1))
+        self.assertEqual([row.pk for row in recent_games(self.user, 2)], [self.lost.pk, self.active.pk])
+
+
+@skipUnless(numpy, 'NumPy is not installed (analytics extra).')
+class AnalyticsTests(TestCase):
+    """Strategy simulators and chunked history analysis."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create two games with guesses at known times."""
+        cls.user = User.objects.create_user('player', password='pw')
+        start = timezone.now().replace(microsecond=0) - timedelta(days=1)
+        cls.start = start
+        end = start + timedelta(minutes=5)
+        won = Game.objects.create(
+            user=cls.user, difficulty_level='easy', target_number=50,
+            attempts_made=3, is_won=True, score=800, completed_at=end,
+        )
+        lost = Game.objects.create(
+            user=cls.user, difficulty_level='easy', target_number=10,
+            attempts_made=10, completed_at=end,
+        )
+        Game.objects.create(user=cls.user, difficulty_level='easy', target_number=20)
+        Game.objects.update(started_at=start)
+        for game, offsets in ((won, [0, 3, 20]), (lost, [100, 200])):
+            for attempt, offset in enumerate(offsets, start=1):
+                guess = Guess.objects.create(game=game, guess_number=attempt, attempt_number=attempt, feedback='too_low')
+                Guess.objects.filter(pk=guess.pk).update(created_at=start + timedelta(seconds=offset))
+
+    def test_binary_search(self):
+        """Binary search finds every target within the optimal number of attempts."""
+        from .analytics import simulate_binary_search
+
+        self.assertEqual(simulate_binary_search(1, 7).tolist(), [3, 2, 3, 1, 3, 2, 3])
+        self.assertEqual(int(simulate_binary_search(1, 99).max()), 7)
+        self.assertEqual(int(simulate_binary_search(1, 9999).max()), 14)
+
+    def test_random_pivot(self):
+        """The random-pivot player is seeded, finds every target and does no better than binary search."""
+        from .analytics import simulate_binary_search, simulate_random_pivot
+
+        attempts = simulate_random_pivot(1, 99, trials=5, seed=1)
+        self.assertEqual(attempts.shape, (99 * 5,))
+        self.assertGreaterEqual(int(attempts.min()), 1)
+        self.assertEqual(attempts.tolist(), simulate_random_pivot(1, 99, trials=5, seed=1).tolist())
+        self.assertGreater(attempts.mean(), simulate_binary_search(1, 99).mean())
+
+    def test_strategy_win_rates(self):
+        """Binary search always wins within ten attempts except on expert."""
+        from .analytics import simulate_strategies
+
+        strategies = simulate_strategies()
+        self.assertEqual(strategies['easy']['binary_search']['win_rate'], 100.0)
+        self.assertEqual(strategies['moderate']['binary_search']['win_rate'], 100.0)
+        self.assertLess(strategies['expert']['binary_search']['win_rate'], 100.0)
+
+    def test_iter_chunks_covers_every_row_once(self):
+        """Keyset pagination on a composite key yields each row exactly once."""
+        from .analytics import iter_chunks
+
+        rows = [
+            row for chunk in iter_chunks(Guess.objects.all(), ('game_id', 'attempt_number'), ('game_id', 'attempt_number'), 2)
+            for row in chunk
+        ]
+        self.assertEqual(rows, list(Guess.objects.order_by('game_id', 'attempt_number').values_list('game_id', 'attempt_number')))
+
+    def test_guess_intervals_span_chunk_boundaries(self):
+        """Intervals between guesses are measured across chunks, but never across games."""
+        from .analytics import analyze_guesses
+
+        report = analyze_guesses(Guess.objects.all(), chunk_size=1)
+        self.assertEqual(report, analyze_guesses(Guess.objects.all(), chunk_size=1000))
+        self.assertEqual(report['total'], 5)
+        intervals = report['interval_seconds']
+        self.assertEqual(intervals['count'], 3)
+        self.assertEqual(intervals['mean'], round((3 + 17 + 100) / 3, 2))
+        self.assertEqual(intervals['buckets']['<5s'], 1)
+        self.assertEqual(intervals['buckets']['15-30s'], 1)
+        self.assertEqual(intervals['buckets']['1-5m'], 1)
+
+    def test_game_report(self):
+        """Finished games count towards the win rate; games in play do not."""
+        from .analytics import analyze_games
+
+        easy = analyze_games(Game.objects.all(), chunk_size=2)['easy']
+        self.assertEqual((easy['played'], easy['won'], easy['win_rate']), (2, 1, 50.0))
+        self.assertEqual(easy['attempts_distribution'], {'3': 1})
+
+    def test_report_includes_archived_games(self):
+        """Archiving games does not change the report."""
+        from .analytics import build_report
 
-# Create your tests here.
+        before = build_report(self.start - timedelta(hours=1), self.start + timedelta(hours=1), chunk_size=1)
+        self.assertEqual(before['guesses']['total'], 5)
+        archive_chunk(timezone.now(), 10, include_wins=True)
+        self.assertEqual(ArchivedGame.objects.count(), 2)
+        after = build_report(self.start - timedelta(hours=1), self.start + timedelta(hours=1), chunk_size=1)
+        self.assertEqual(after, before)
+        outside = build_report(self.start + timedelta(minutes=1), self.start + timedelta(hours=1), chunk_size=1)
+        self.assertEqual(outside['guesses']['total'], 2)
@@ -2,11 +2,18 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.contrib.messages.storage.base import Message
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, DetailView
 from django.db.models import Q
 from django.utils import timezone
-from .models import Game, Guess
+from .models import Game, Guess, ScoreBucket
 from .forms import GameDifficultyForm, GuessForm
+from . import challenge
+from .archive import get_game, get_guesses
+from .projections import Projection
 from users.models import UserProfile
 
 
@@ -26,6 +33,37 @@ def game_create_view(request):
     return render(request, 'games/game_new.html', {'form': form})
 
 
+def guess_message(game: Game, feedback: str) -> Message:
+    """Message telling the player how their guess went."""
+    if feedback == 'correct':
+        return Message(messages.SUCCESS, f'Congratulations! You won with a score of {game.score}!')
+    if game.is_game_over():
+        return Message(messages.WARNING, 'Game over! You ran out of attempts.')
+    feedback_msg = 'Too high!' if feedback == 'too_high' else 'Too low!'
+    return Message(messages.INFO, f'{feedback_msg} Try again.')
+
+
+def render_play_fragments(request, game: Game, message: Message, guess: Guess = None, status: int = 200):
+    """Render only the parts of the play screen a guess changes.
+
+    The feedback banner, attempt counters and new guess row come from the
+    same partials as ``game_play.html``, without the page chrome or the
+    rest of the guess history.
+    """
+    context = {
+        'game': game,
+        'remaining_attempts': game.get_remaining_attempts(),
+        'message': message,
+        'guess': guess,
+    }
+    return render(request, 'games/game_play_fragments.html', context, status=status)
+
+
+def result_redirect_fragment(game: Game) -> HttpResponse:
+    """Tell the play script to leave for the result page of a finished game."""
+    return HttpResponse(status=204, headers={'X-Redirect': reverse('games:game_result', args=[game.pk])})
+
+
 @login_required
 def game_play_view(request, pk):
     """View for playing a game."""
@@ -49,29 +87,13 @@ def game_play_view(request, pk):
                 feedback=feedback
             )
             
-            if feedback == 'correct':
-                # Update user profile stats
-                profile = request.user.profile
-                profile.total_games_played += 1
-                profile.total_wins += 1
-                profile.update_best_score(game.score, game.difficulty_level)
-                profile.save()
-                
-                messages.success(request, f'Congratulations! You won with a score of {game.score}!')
+            message = guess_message(game, feedback)
+            messages.add_message(request, message.level, message.message)
+            if game.is_game_over():
+                # Won or out of attempts - update user profile stats
+                request.user.profile.record_game(game)
                 return redirect('games:game_result', pk=game.pk)
-            elif game.is_game_over():
-                # Game over - no more attempts
-                profile = request.user.profile
-                profile.total_games_played += 1
-                profile.save()
-                
-                messages.warning(request, 'Game over! You ran out of attempts.')
-                return redirect('games:game_result', pk=game.pk)
-            else:
-                # Continue game
-                feedback_msg = 'Too high!' if feedback == 'too_high' else 'Too low!'
-                messages.info(request, f'{feedback_msg} Try again.')
-                return redirect('games:game_play', pk=game.pk)
+            return redirect('games:game_play', pk=game.pk)
     else:
         form = GuessForm(game=game)
     
@@ -92,12 +114,74 @@ def game_play_view(request, pk):
     return render(request, 'games/game_play.html', context)
 
 
+@login_required
+@require_POST
+def game_guess_view(request, pk):
+    """Make a guess and return the play screen fragments it changes."""
+    game = get_object_or_404(Game, pk=pk, user=request.user)
+    if game.is_game_over():
+        return result_redirect_fragment(game)
+
+    form = GuessForm(request.POST, game=game)
+    if not form.is_valid():
+        return render_play_fragments(request, game, Message(messages.ERROR, form.errors['guess'][0]), status=400)
+
+    guess_value = form.cleaned_data['guess']
+    feedback = game.check_guess(guess_value)
+    guess = Guess.objects.create(
+        game=game,
+        guess_number=guess_value,
+        attempt_number=game.attempts_made,
+        feedback=feedback
+    )
+    message = guess_message(game, feedback)
+    if game.is_game_over():
+        request.user.profile.record_game(game)
+        messages.add_message(request, message.level, message.message)
+        return result_redirect_fragment(game)
+    return render_play_fragments(request, game, message, guess)
+
+
+@login_required
+def challenge_view(request):
+    """Today's daily challenges: start or resume one, and see their boards."""
+    if request.method == 'POST':
+        form = GameDifficultyForm(request.POST)
+        if form.is_valid():
+            game, created = challenge.start_challenge(request.user, form.cleaned_data['difficulty'])
+            if game.is_game_over():
+                messages.info(request, 'You have already played this challenge today.')
+                return redirect('games:game_result', pk=game.pk)
+            if created:
+                messages.success(request, f'Daily challenge started! Difficulty: {game.get_difficulty_level_display()}')
+            return redirect('games:game_play', pk=game.pk)
+
+    played = challenge.played_games(request.user)
+    challenges = [
+        {
+            'difficulty': difficulty,
+            'label': label,
+            'game': played.get(difficulty),
+            'board': challenge.get_board(difficulty),
+        }
+        for difficulty, label in Game.DIFFICULTY_CHOICES
+    ]
+    return render(request, 'games/challenge.html', {'challenges': challenges, 'day': challenge.today()})
+
+
 class GameResultView(DetailView):
     """View for displaying game results."""
     model = Game
     template_name = 'games/game_result.html'
     context_object_name = 'game'
 
+    def get_object(self, queryset=None):
+        """Get the game, reading through to the archive."""
+        game = get_game(self.kwargs['pk'])
+        if game is None:
+            raise Http404('No game found.')
+        return game
+
     def dispatch(self, request, *args, **kwargs):
         """Ensure user owns the game."""
         game = self.get_object()
@@ -110,7 +194,9 @@ class GameResultView(DetailView):
         """Add additional context data."""
         context = super().get_context_data(**kwargs)
         game = self.get_object()
-        context['guesses'] = game.guesses.all().order_by('attempt_number')
+        context['guesses'] = get_guesses(game)
+        if game.is_won:
+            context['percent_beaten'] = ScoreBucket.percent_beaten(game.difficulty_level, game.score)
         return context
 
 
@@ -122,17 +208,8 @@ class LeaderboardView(ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        """Get queryset filtered by difficulty if provided."""
-        queryset = Game.objects.filter(
-            is_won=True,
-            score__isnull=False
-        ).select_related('user').order_by('-score', 'attempts_made', 'started_at')
-        
-        difficulty = self.kwargs.get('difficulty')
-        if difficulty and difficulty in dict(Game.DIFFICULTY_CHOICES):
-            queryset = queryset.filter(difficulty_level=difficulty)
-        
-        return queryset
+        """Get slim leaderboard rows filtered by difficulty if provided."""
+        return Projection(Game.get_leaderboard(self.kwargs.get('difficulty')))
 
     def get_context_data(self, **kwargs):
         """Add additional context data."""
@@ -143,5 +220,18 @@ class LeaderboardView(ListView):
         # Add rank numbers
         for idx, game in enumerate(context['games'], start=1):
             game.rank = (context['page_obj'].number - 1) * self.paginate_by + idx
+
+        context.update(self.search_players(self.request.GET.get('player', ''), context['difficulty']))
         
         return context
+
+    @classmethod
+    def search_players(cls, query: str, difficulty: str = None) -> dict:
+        """Context for the player search: best entries with their rank and page."""
+        query = query.strip()[:150]
+        if not query:
+            return {}
+        results = Game.search_leaderboard(query, difficulty)
+        for game in results:
+            game.page = (game.rank - 1) // cls.paginate_by + 1
+        return {'player_query': query, 'player_results': results}
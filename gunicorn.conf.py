@@ -0,0 +1,73 @@
+"""Gunicorn configuration for the_guess_game.
+
+Gunicorn loads this file automatically when started from the project root::
+
+    gunicorn
+
+Every setting can be overridden through ``GUNICORN_*`` environment variables.
+The application is imported once in the master (``preload_app``) and shared
+with workers copy-on-write; sync workers with persistent database connections
+open them at boot instead of on their first request.
+"""
+import gc
+import multiprocessing
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    return int(os.environ.get(name, default))
+
+
+wsgi_app = os.environ.get('GUNICORN_APP', 'the_guess_game.wsgi:application')
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+workers = _env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 1)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+
+# Recycle workers after a bounded number of requests; the jitter keeps them
+# from restarting all at once.
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+if os.path.isdir('/dev/shm'):
+    # Keep worker heartbeat files off disk.
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    """Prepare the preloaded master for forking."""
+    from django.db import connections
+
+    # Connections opened while importing the app must not be shared by workers.
+    connections.close_all()
+    # Move everything imported so far out of the collector's reach, so garbage
+    # collection in workers does not touch (and copy) the shared pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Open database connections as soon as a sync worker boots.
+
+    Django keeps one connection per thread, and this hook runs on the worker's
+    main thread. Only sync workers serve requests on that thread, and the
+    connection only outlives the first request when ``CONN_MAX_AGE`` is not 0,
+    so other workers and non-persistent connections are left to connect on
+    first use.
+    """
+    if server.cfg.worker_class_str != 'sync':
+        return
+    from django.db import connections
+
+    for connection in connections.all():
+        if connection.settings_dict['CONN_MAX_AGE'] != 0:
+            connection.ensure_connection()
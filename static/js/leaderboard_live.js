@@ -0,0 +1,81 @@
+// Live leaderboard: applies server-sent snapshots and rank diffs to the table.
+(function () {
+    const container = document.getElementById('leaderboard-live');
+    if (!container || !window.EventSource) {
+        return;
+    }
+    const tbody = document.getElementById('leaderboard-rows');
+    const badgeClasses = {
+        easy: 'bg-green-100 text-green-800',
+        moderate: 'bg-yellow-100 text-yellow-800',
+        expert: 'bg-red-100 text-red-800',
+    };
+
+    function cell(className, child) {
+        const td = document.createElement('td');
+        td.className = 'px-6 py-4 whitespace-nowrap' + (className ? ' ' + className : '');
+        td.append(child);
+        return td;
+    }
+
+    function span(className, text) {
+        const element = document.createElement('span');
+        element.className = className;
+        element.textContent = text;
+        return element;
+    }
+
+    function buildRow(rank, row) {
+        const tr = document.createElement('tr');
+        tr.className = 'hover:bg-gray-50';
+        tr.id = 'rank-' + rank;
+        tr.dataset.rank = rank;
+        tr.append(
+            cell('', span('text-lg font-bold text-gray-800', '#' + rank)),
+            cell('', span('font-semibold text-gray-800', row.username)),
+            cell('', span('text-lg font-bold text-blue-600', row.score)),
+            cell('', span('px-3 py-1 rounded text-sm font-semibold ' + (badgeClasses[row.difficulty] || badgeClasses.expert), row.difficulty_display)),
+            cell('text-gray-700', row.attempts + '/' + row.max_attempts),
+            cell('text-gray-600', row.date),
+        );
+        return tr;
+    }
+
+    function apply(size, rows) {
+        if (!tbody) {
+            // The page was rendered without a table; reload once rows exist.
+            if (size > 0) {
+                window.location.reload();
+            }
+            return;
+        }
+        Object.entries(rows).forEach(function ([rank, row]) {
+            const replacement = buildRow(rank, row);
+            const current = tbody.querySelector('tr[data-rank="' + rank + '"]');
+            if (current) {
+                current.replaceWith(replacement);
+            } else {
+                tbody.append(replacement);
+            }
+        });
+        tbody.querySelectorAll('tr[data-rank]').forEach(function (tr) {
+            if (Number(tr.dataset.rank) > size) {
+                tr.remove();
+            }
+        });
+    }
+
+    const source = new EventSource(container.dataset.liveUrl);
+    source.addEventListener('snapshot', function (event) {
+        const data = JSON.parse(event.data);
+        const rows = {};
+        data.rows.forEach(function (row, index) {
+            rows[index + 1] = row;
+        });
+        apply(data.size, rows);
+    });
+    source.addEventListener('diff', function (event) {
+        const data = JSON.parse(event.data);
+        apply(data.size, data.rows);
+    });
+})();
@@ -0,0 +1,88 @@
+// Play screen: submits guesses to the fragment endpoint and swaps in the parts that changed.
+// Without this script, or if a request cannot reach the server, the form posts and reloads
+// the full page. Rate limiting and server errors are reported in the feedback banner instead,
+// since the guess may already have been counted.
+(function () {
+    const form = document.getElementById('guess-form');
+    if (!form || !window.fetch || !('content' in document.createElement('template'))) {
+        return;
+    }
+    const button = form.querySelector('button[type="submit"]');
+
+    function applyFragments(html) {
+        const fragments = document.createElement('template');
+        fragments.innerHTML = html;
+        Array.from(fragments.content.children).forEach(function (fragment) {
+            if (fragment.dataset.appendTo) {
+                const list = document.getElementById(fragment.dataset.appendTo);
+                list.append(fragment.content);
+                list.closest('.hidden')?.classList.remove('hidden');
+                return;
+            }
+            document.getElementById(fragment.id)?.replaceWith(fragment);
+        });
+    }
+
+    function showError(text) {
+        const feedback = document.getElementById('play-feedback');
+        feedback.textContent = text;
+        feedback.className = 'mb-6 p-4 rounded-lg bg-red-100 text-red-800';
+    }
+
+    // Retry-After is either a number of seconds or an HTTP date.
+    function retryDelay(response) {
+        const value = response.headers.get('Retry-After');
+        if (!value) {
+            return 0;
+        }
+        const seconds = Number(value);
+        const delay = isNaN(seconds) ? Date.parse(value) - Date.now() : seconds * 1000;
+        return isNaN(delay) ? 0 : Math.max(0, delay);
+    }
+
+    function enableAfter(delay) {
+        window.setTimeout(function () {
+            button.disabled = false;
+        }, delay);
+    }
+
+    form.addEventListener('submit', function (event) {
+        event.preventDefault();
+        button.disabled = true;
+        fetch(form.dataset.fragmentUrl, {method: 'POST', body: new FormData(form), credentials: 'same-origin'})
+            .then(function (response) {
+                const next = response.headers.get('X-Redirect');
+                if (next) {
+                    window.location.assign(next);
+                    return;
+                }
+                if (response.status === 429) {
+                    const delay = retryDelay(response);
+                    const wait = Math.max(1, Math.ceil(delay / 1000));
+                    showError('Too many guesses. Please wait ' + wait + (wait === 1 ? ' second' : ' seconds') + ' and try again.');
+                    enableAfter(delay);
+                    return;
+                }
+                if (!response.ok && response.status !== 400) {
+                    showError('Your guess could not be checked right now. Please try again.');
+                    enableAfter(0);
+                    return;
+                }
+                return response.text().then(function (html) {
+                    applyFragments(html);
+                    if (response.ok) {
+                        form.reset();
+                    }
+                    form.querySelector('input[name="guess"]')?.focus();
+                    enableAfter(0);
+                });
+            }, function () {
+                // The request never reached the server: fall back to a regular full-page submission.
+                form.submit();
+            })
+            .catch(function () {
+                showError('Your guess could not be checked right now. Please try again.');
+                enableAfter(0);
+            });
+    });
+})();
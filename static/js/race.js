@@ -0,0 +1,123 @@
+// Race room: renders opponents' progress from the match stream and submits guesses.
+(function () {
+    const room = document.getElementById('race-room');
+    if (!room || !window.EventSource) {
+        return;
+    }
+    const userId = Number(room.dataset.userId);
+    const statusLine = document.getElementById('race-status');
+    const playerList = document.getElementById('race-players');
+    const playPanel = document.getElementById('race-play');
+    const startForm = document.getElementById('race-start-form');
+    const players = new Map();
+    let capacity = 0;
+
+    function describe(progress) {
+        if (progress.won) {
+            return 'Won in ' + progress.attempts + ' attempts';
+        }
+        if (progress.finished) {
+            return 'Out after ' + progress.attempts + ' attempts';
+        }
+        return progress.attempts + ' attempts';
+    }
+
+    function renderPlayers() {
+        playerList.replaceChildren();
+        players.forEach(function (progress) {
+            const item = document.createElement('li');
+            item.className = 'flex justify-between items-center p-3 bg-gray-50 rounded-lg';
+            const name = document.createElement('span');
+            name.className = 'font-semibold text-gray-800';
+            name.textContent = progress.username + (progress.user_id === userId ? ' (you)' : '');
+            const detail = document.createElement('span');
+            detail.className = progress.won ? 'text-green-600 font-semibold' : 'text-gray-600';
+            detail.textContent = describe(progress);
+            item.append(name, detail);
+            playerList.append(item);
+        });
+    }
+
+    function showResult(state) {
+        const winner = players.get(state.winner_id);
+        document.getElementById('race-result-title').textContent =
+            winner ? (winner.user_id === userId ? 'You won the race!' : winner.username + ' won the race.') : 'Nobody found the number.';
+        const mine = players.get(userId);
+        const link = document.getElementById('race-result-link');
+        if (mine && mine.game_id) {
+            link.href = room.dataset.resultUrl.replace('/0/', '/' + mine.game_id + '/');
+            link.classList.remove('hidden');
+        }
+        document.getElementById('race-result').classList.remove('hidden');
+    }
+
+    const source = new EventSource(room.dataset.streamUrl);
+    source.addEventListener('state', function (event) {
+        const state = JSON.parse(event.data);
+        capacity = state.capacity;
+        players.clear();
+        state.players.forEach(function (progress) {
+            players.set(progress.user_id, progress);
+        });
+        renderPlayers();
+        if (state.status === 'waiting') {
+            statusLine.textContent = 'Waiting for players (' + players.size + '/' + capacity + ')...';
+        } else if (state.status === 'running') {
+            statusLine.textContent = 'Race in progress!';
+            startForm?.classList.add('hidden');
+            playPanel?.classList.remove('hidden');
+        } else {
+            statusLine.textContent = 'Race finished.';
+            playPanel?.classList.add('hidden');
+            showResult(state);
+            source.close();
+        }
+    });
+    source.addEventListener('progress', function (event) {
+        const progress = JSON.parse(event.data);
+        players.set(progress.user_id, progress);
+        renderPlayers();
+    });
+    source.addEventListener('closed', function () {
+        source.close();
+    });
+
+    const form = document.getElementById('race-guess-form');
+    if (!form) {
+        return;
+    }
+    const feedbackLabels = {correct: 'Correct', too_high: 'Too High', too_low: 'Too Low'};
+    const error = document.getElementById('race-guess-error');
+    form.addEventListener('submit', function (event) {
+        event.preventDefault();
+        fetch(form.action, {method: 'POST', body: new FormData(form), credentials: 'same-origin'})
+            .then(function (response) {
+                return response.json().then(function (data) {
+                    return {ok: response.ok, data: data};
+                });
+            })
+            .then(function (result) {
+                if (!result.ok) {
+                    error.textContent = result.data.error || 'Please try again in a moment.';
+                    error.classList.remove('hidden');
+                    return;
+                }
+                error.classList.add('hidden');
+                const row = document.createElement('div');
+                row.className = 'flex justify-between items-center p-3 bg-gray-50 rounded-lg';
+                const guess = document.createElement('span');
+                guess.className = 'font-semibold text-gray-800';
+                guess.textContent = 'Attempt ' + result.data.attempts + ': ' + result.data.guess;
+                const feedback = document.createElement('span');
+                feedback.className = 'text-gray-600';
+                feedback.textContent = feedbackLabels[result.data.feedback];
+                row.append(guess, feedback);
+                document.getElementById('race-guesses').prepend(row);
+                form.reset();
+            })
+            .catch(function () {
+                error.textContent = 'Please try again in a moment.';
+                error.classList.remove('hidden');
+            });
+    });
+})();
@@ -2,6 +2,12 @@
 ASGI config for the_guess_game project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Under ASGI the game create, guess and leaderboard endpoints are served by the
+async views in ``games.async_views``; set ``ASYNC_GAME_VIEWS=0`` to opt out.
+
+Run it with any ASGI server, e.g.::
+
+    uvicorn the_guess_game.asgi:application --workers 4
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +18,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'the_guess_game.settings')
+os.environ.setdefault('ASYNC_GAME_VIEWS', '1')
 
 application = get_asgi_application()
@@ -8,24 +8,40 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
+
+The settings profile is selected with the ``DJANGO_ENV`` environment variable:
+``development`` (default) or ``production``. The production profile drops the
+dev-only apps and middleware and turns on the cached template loader,
+persistent database connections, a shared cache and manifest static storage.
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Settings profile
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'development')
+PRODUCTION = DJANGO_ENV == 'production'
+
+# Deployment checklist
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-1ia!ins6yk-u(f1lcdi97_01t=8khi%ijr-(^d$pp6ue(oi8%w'
+SECRET_KEY = os.environ.get('SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured('SECRET_KEY must be set in production.')
+    SECRET_KEY = 'django-insecure-1ia!ins6yk-u(f1lcdi97_01t=8khi%ijr-(^d$pp6ue(oi8%w'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', str(not PRODUCTION)).lower() in ('1', 'true', 'yes')
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -37,7 +53,6 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'django_browser_reload',
     'users',
     'games',
     'feedback',
@@ -51,10 +66,21 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.RateLimitMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_browser_reload.middleware.BrowserReloadMiddleware',
 ]
 
+# Serve collected static files (precompressed, immutable caching) from Django
+# itself; turn off when a front-end server or CDN serves STATIC_ROOT
+SERVE_STATIC = os.environ.get('SERVE_STATIC', str(PRODUCTION)).lower() in ('1', 'true', 'yes')
+if SERVE_STATIC:
+    MIDDLEWARE.insert(1, 'core.middleware.PrecompressedStaticMiddleware')
+
+if not PRODUCTION:
+    # Live reload for template and static edits during development
+    INSTALLED_APPS.append('django_browser_reload')
+    MIDDLEWARE.append('django_browser_reload.middleware.BrowserReloadMiddleware')
+
 ROOT_URLCONF = 'the_guess_game.urls'
 
 TEMPLATES = [
@@ -73,7 +99,24 @@ TEMPLATES = [
     },
 ]
 
+if PRODUCTION:
+    # Compile each template once per process; skip the debug context processor
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+        'django.template.context_processors.debug'
+    )
+
 WSGI_APPLICATION = 'the_guess_game.wsgi.application'
+ASGI_APPLICATION = 'the_guess_game.asgi.application'
+
+# Serve the game endpoints from games.async_views; enabled by the ASGI entry point
+ASYNC_GAME_VIEWS = os.environ.get('ASYNC_GAME_VIEWS', '0') == '1'
 
 
 # Database
@@ -83,8 +126,69 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Persistent connections in production, checked before reuse
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600 if PRODUCTION else 0)),
+        'CONN_HEALTH_CHECKS': PRODUCTION,
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif PRODUCTION:
+    # Shared by all workers on the host
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', '/var/tmp/the_guess_game_cache'),
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Full-page cache for anonymous visitors to the core pages
+PAGE_CACHE_ALIAS = os.environ.get('PAGE_CACHE_ALIAS', 'default')
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+# Release identifier mixed into page cache keys; derived from template mtimes if unset
+TEMPLATE_VERSION = os.environ.get('TEMPLATE_VERSION', '')
+
+# Token-bucket rate limits for write endpoints, keyed by URL name. Each scope
+# ("user", "ip") gets its own bucket holding "<requests>/<s|m|h|d>" tokens.
+RATE_LIMITS = {
+    'games:game_play': {'user': '60/m', 'ip': '120/m'},
+    'games:game_guess': {'user': '60/m', 'ip': '120/m'},
+    'feedback:feedback': {'user': '5/h', 'ip': '10/h'},
+    'users:register': {'ip': '10/h'},
+    'games:race_guess': {'user': '60/m', 'ip': '120/m'},
 }
+RATE_LIMIT_METHODS = ('POST',)
+# Cache alias holding the buckets; empty keeps them in process (tests only)
+RATE_LIMIT_CACHE_ALIAS = os.environ.get('RATE_LIMIT_CACHE_ALIAS', 'default')
+# META key with the client address when behind a trusted proxy, e.g. HTTP_X_FORWARDED_FOR
+RATE_LIMIT_IP_HEADER = os.environ.get('RATE_LIMIT_IP_HEADER') or None
+
+if PRODUCTION:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+
+# Authentication backends
+# https://docs.djangoproject.com/en/5.2/ref/settings/#authentication-backends
+
+AUTHENTICATION_BACKENDS = [
+    'users.backends.ProfileModelBackend',
+]
 
 
 # Password validation
@@ -123,7 +227,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
-STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_ROOT = Path(os.environ.get('STATIC_ROOT', BASE_DIR / 'staticfiles'))
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        # Fingerprinted, precompressed files in production; run collectstatic on deploy
+        'BACKEND': (
+            'core.storage.CompressedManifestStaticFilesStorage'
+            if PRODUCTION else
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -133,6 +251,37 @@ LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
+# Games left unfinished for this long are finalized by sweep_abandoned_games
+GAME_ABANDONED_AFTER_HOURS = 24
+
+# Completed games older than this are moved to cold storage by archive_games
+GAME_ARCHIVE_AFTER_DAYS = 180
+
+# Live leaderboard stream (ASGI only): rows per board, seconds to coalesce a
+# burst of wins, fallback refresh for wins seen by other workers, keep-alive
+# interval, and events a slow watcher may queue before it is resynced
+LIVE_LEADERBOARD_SIZE = 20
+LIVE_LEADERBOARD_COALESCE_SECONDS = 1.0
+LIVE_LEADERBOARD_REFRESH_SECONDS = 15.0
+LIVE_LEADERBOARD_HEARTBEAT_SECONDS = 20.0
+LIVE_LEADERBOARD_MAX_PENDING = 16
+
+# Race mode (ASGI only, matches live in one worker's memory): most players per
+# match, seconds a match may wait for players, run, and keep its results
+RACE_MAX_PLAYERS = 4
+RACE_JOIN_TIMEOUT_SECONDS = 600
+RACE_MATCH_TIMEOUT_SECONDS = 900
+RACE_RESULT_TTL_SECONDS = 600
+
+# Append-only gameplay event log: directory of NDJSON segments (empty disables
+# it; off by default outside production so tests and the dev server don't write
+# into the tree), segment size before rotation, events buffered for the writer
+# thread, and seconds an emitter waits on a full buffer before the event is dropped
+EVENT_LOG_DIR = os.environ.get('EVENT_LOG_DIR', str(BASE_DIR / 'var' / 'events') if PRODUCTION else '')
+EVENT_LOG_MAX_BYTES = 64 * 1024 * 1024
+EVENT_LOG_QUEUE_SIZE = 10000
+EVENT_LOG_BLOCK_SECONDS = 0.05
+
 # Email configuration (console backend for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@guessgame.com'
@@ -23,11 +23,14 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
     path('', include('users.urls')),
-    path('', include('games.urls')),
+    path('', include('games.async_urls' if settings.ASYNC_GAME_VIEWS else 'games.urls')),
     path('', include('feedback.urls')),
-    path('__reload__/', include('django_browser_reload.urls')),
 ]
 
+if 'django_browser_reload' in settings.INSTALLED_APPS:
+    urlpatterns.append(path('__reload__/', include('django_browser_reload.urls')))
+
+# Static files are served by runserver in development and by
+# core.middleware.PrecompressedStaticMiddleware (or the front-end server) in production.
 if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -5,6 +5,29 @@ from django.contrib.auth.models import User
 from .models import UserProfile
 
 
+class PlayerSearchMixin:
+    """Admin search that matches usernames through the profile username column.
+
+    Usernames are matched case-insensitively on ``UserProfile.username_normalized``,
+    which the trigram index serves on PostgreSQL, instead of an ``icontains``
+    over the user table; the remaining ``search_fields`` (emails, names) are
+    searched as usual and both sets of matches are shown.
+    ``player_search_lookup`` names the field holding the user id.
+    """
+    player_search_lookup = 'user_id'
+    search_help_text = 'Search by username or email.'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Combine username matches with the ``search_fields`` matches."""
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip():
+            players = queryset.filter(**{
+                f'{self.player_search_lookup}__in': UserProfile.username_matches(search_term),
+            })
+            results = results | players
+        return results, may_have_duplicates
+
+
 class UserProfileInline(admin.StackedInline):
     """Inline admin for UserProfile."""
     model = UserProfile
@@ -16,10 +39,13 @@ class UserProfileInline(admin.StackedInline):
     readonly_fields = ('win_rate', 'created_at', 'updated_at')
 
 
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(PlayerSearchMixin, BaseUserAdmin):
     """Custom User admin with profile inline."""
+    player_search_lookup = 'pk'
+    search_fields = ('first_name', 'last_name', 'email')
     inlines = (UserProfileInline,)
     list_display = ('username', 'email', 'is_active', 'date_joined', 'get_total_games')
+    list_select_related = ('profile',)
     
     def get_total_games(self, obj):
         """Get total games played by user."""
@@ -0,0 +1,34 @@
+"""Authentication backends for users app."""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """Model backend that loads the user's profile alongside the user.
+
+    The auth middleware resolves the session user through ``get_user`` on every
+    request, and most views then touch ``request.user.profile``. Joining the
+    profile here turns those two queries into one.
+    """
+
+    def _get_user_queryset(self):
+        """Return the user queryset with the profile joined in."""
+        return UserModel._default_manager.select_related('profile')
+
+    def get_user(self, user_id):
+        """Get user with profile by primary key."""
+        try:
+            user = self._get_user_queryset().get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        """Get user with profile by primary key (async)."""
+        try:
+            user = await self._get_user_queryset().aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
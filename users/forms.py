@@ -3,9 +3,48 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from .models import UserProfile, normalize_email
 
+EMAIL_IN_USE_MESSAGE = "A user with this email already exists."
 
-class UserRegistrationForm(UserCreationForm):
+
+class UniqueEmailMixin:
+    """Enforce case-insensitive email uniqueness through the indexed profile column."""
+
+    def email_in_use(self, email: str) -> bool:
+        """Check whether another user already has this email."""
+        email_normalized = normalize_email(email)
+        if email_normalized is None:
+            return False
+        others = UserProfile.objects.filter(email_normalized=email_normalized)
+        if self.instance.pk is not None:
+            others = others.exclude(user_id=self.instance.pk)
+        return others.exists()
+
+    def clean_email(self) -> str:
+        """Validate email uniqueness."""
+        email = self.cleaned_data.get('email')
+        if self.email_in_use(email):
+            raise ValidationError(EMAIL_IN_USE_MESSAGE)
+        return email
+
+    def save(self, commit: bool = True) -> User | None:
+        """Save the user; return None if the email was claimed since validation."""
+        if not commit:
+            return super().save(commit=False)
+        email = self.cleaned_data['email']
+        try:
+            with transaction.atomic():
+                return super().save()
+        except IntegrityError:
+            if not self.email_in_use(email):
+                raise
+            self.add_error('email', EMAIL_IN_USE_MESSAGE)
+            return None
+
+
+class UserRegistrationForm(UniqueEmailMixin, UserCreationForm):
     """User registration form with email and password confirmation."""
     email = forms.EmailField(
         required=True,
@@ -41,13 +80,6 @@ class UserRegistrationForm(UserCreationForm):
             }),
         }
 
-    def clean_email(self) -> str:
-        """Validate email uniqueness."""
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise ValidationError("A user with this email already exists.")
-        return email
-
     def clean_password1(self) -> str:
         """Validate password strength."""
         password1 = self.cleaned_data.get('password1')
@@ -67,7 +99,7 @@ class UserRegistrationForm(UserCreationForm):
         return cleaned_data
 
 
-class ProfileEditForm(forms.ModelForm):
+class ProfileEditForm(UniqueEmailMixin, forms.ModelForm):
     """Form for editing user profile."""
     email = forms.EmailField(
         required=True,
@@ -0,0 +1,157 @@
+"""Rebuild UserProfile statistics from game history."""
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count, F, Max, Min, Q
+
+from games.models import ArchivedGame, Game
+from users.models import UserProfile
+
+STAT_FIELDS = [
+    'total_games_played', 'total_wins', 'best_score',
+    'best_score_easy', 'best_score_moderate', 'best_score_expert',
+]
+
+
+def _init_worker() -> None:
+    """Prepare a pool worker process for database access."""
+    if not apps.ready:
+        django.setup()
+
+
+def aggregate_game_stats(first_user_id: int, last_user_id: int) -> dict[int, dict]:
+    """Aggregate game statistics per user for a user-id range with grouped SQL."""
+    won = Q(is_won=True)
+    finished = won | Q(completed_at__isnull=False) | Q(attempts_made__gte=F('max_attempts'))
+    best_scores = {
+        f'best_score_{difficulty}': Max('score', filter=won & Q(difficulty_level=difficulty))
+        for difficulty in Game.DIFFICULTY_RANGES
+    }
+    stats = {}
+    # Archived games are all finished, so the same filters apply to both tables.
+    for model in (Game, ArchivedGame):
+        rows = (
+            model.objects.filter(user_id__gte=first_user_id, user_id__lte=last_user_id)
+            .values('user_id')
+            .annotate(
+                total_games_played=Count('pk', filter=finished),
+                total_wins=Count('pk', filter=won),
+                best_score=Max('score', filter=won),
+                **best_scores,
+            )
+            .order_by()
+        )
+        for row in rows:
+            user_stats = stats.setdefault(row.pop('user_id'), {})
+            for field, value in row.items():
+                if field.startswith('best_score'):
+                    user_stats[field] = max(user_stats.get(field) or 0, value or 0)
+                else:
+                    user_stats[field] = user_stats.get(field, 0) + value
+    return stats
+
+
+def rebuild_range(first_user_id: int, last_user_id: int) -> tuple[int, int, int]:
+    """Recompute and bulk-write profile statistics for a user-id range."""
+    stats = aggregate_game_stats(first_user_id, last_user_id)
+    profiles = list(
+        UserProfile.objects.filter(user_id__gte=first_user_id, user_id__lte=last_user_id)
+        .only('pk', 'user_id', *STAT_FIELDS)
+    )
+    for profile in profiles:
+        user_stats = stats.get(profile.user_id, {})
+        for field in STAT_FIELDS:
+            setattr(profile, field, user_stats.get(field) or 0)
+    with transaction.atomic():
+        UserProfile.objects.bulk_update(profiles, STAT_FIELDS, batch_size=500)
+    return first_user_id, last_user_id, len(profiles)
+
+
+class Command(BaseCommand):
+    """Recompute profile statistics from the Game and ArchivedGame tables.
+
+    Users are split into contiguous user-id ranges. Each range is aggregated
+    with one grouped query over the ``(user, -started_at)`` index and written
+    back with ``bulk_update``; ranges are spread across a process pool. The
+    highest user id below which every range has finished is stored in the
+    watermark file, so an interrupted rebuild can continue with ``--resume``.
+    """
+    help = 'Rebuild UserProfile statistics from game history.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Number of user ids per range.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Number of worker processes (1 runs in-process).',
+        )
+        parser.add_argument(
+            '--watermark-file', default='rebuild_profile_stats.json',
+            help='File recording the last fully rebuilt user id.',
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continue after the user id stored in the watermark file.',
+        )
+
+    def handle(self, *args, **options):
+        """Run the rebuild."""
+        chunk_size = options['chunk_size']
+        if chunk_size < 1 or options['workers'] < 1:
+            raise CommandError('--chunk-size and --workers must be positive.')
+        watermark_file = Path(options['watermark_file'])
+
+        bounds = UserProfile.objects.aggregate(first=Min('user_id'), last=Max('user_id'))
+        if bounds['first'] is None:
+            self.stdout.write('No profiles to rebuild.')
+            return
+        start = bounds['first']
+        if options['resume'] and watermark_file.exists():
+            start = max(start, json.loads(watermark_file.read_text())['last_user_id'] + 1)
+
+        ranges = [
+            (first, min(first + chunk_size - 1, bounds['last']))
+            for first in range(start, bounds['last'] + 1, chunk_size)
+        ]
+        if not ranges:
+            self.stdout.write('Profile statistics are already rebuilt.')
+            return
+
+        pending = {first: last for first, last in ranges}
+        next_start = start
+        updated = 0
+        for first, last, count in self.run_ranges(ranges, options['workers']):
+            updated += count
+            pending[first] = None
+            # Advance the watermark over the contiguous prefix of finished ranges.
+            while next_start in pending and pending[next_start] is None:
+                watermark = min(next_start + chunk_size - 1, bounds['last'])
+                watermark_file.write_text(json.dumps({'last_user_id': watermark}))
+                del pending[next_start]
+                next_start += chunk_size
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Rebuilt users {first}-{last} ({count} profiles).')
+
+        watermark_file.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {updated} profiles.'))
+
+    def run_ranges(self, ranges: list[tuple[int, int]], workers: int):
+        """Yield rebuild results for each range as it finishes."""
+        if workers == 1:
+            for first, last in ranges:
+                yield rebuild_range(first, last)
+            return
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(rebuild_range, first, last) for first, last in ranges]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 23:53
+
+from django.db import migrations, models
+
+
+def populate_email_normalized(apps, schema_editor):
+    """Copy lower-cased user emails onto profiles, first claimant wins."""
+    UserProfile = apps.get_model('users', 'UserProfile')
+    seen = set()
+    profiles = []
+    for profile in UserProfile.objects.select_related('user').order_by('user_id').iterator():
+        email = (profile.user.email or '').strip().lower()
+        if email and email not in seen:
+            seen.add(email)
+            profile.email_normalized = email
+            profiles.append(profile)
+    UserProfile.objects.bulk_update(profiles, ['email_normalized'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='email_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True, unique=True),
+        ),
+        migrations.RunPython(populate_email_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Lower
+
+
+def populate_username_normalized(apps, schema_editor):
+    """Copy lower-cased usernames onto profiles in one UPDATE."""
+    UserProfile = apps.get_model('users', 'UserProfile')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    username = User.objects.filter(pk=OuterRef('user_id')).values('username')[:1]
+    UserProfile.objects.update(username_normalized=Lower(Subquery(username)))
+
+
+def create_trigram_index(apps, schema_editor):
+    """Index usernames for substring search where pg_trgm is available."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS users_profile_username_trgm '
+        'ON users_userprofile USING gin (username_normalized gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    """Drop the PostgreSQL trigram index."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS users_profile_username_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_profile_email_normalized'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='username_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['username_normalized'], name='users_profile_username_idx'),
+        ),
+        migrations.RunPython(populate_username_normalized, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
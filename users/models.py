@@ -1,11 +1,13 @@
 """User profile models for the guessing game application."""
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import connection, models
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from core.models import DirtyFieldsMixin
 
 
-class UserProfile(models.Model):
+class UserProfile(DirtyFieldsMixin, models.Model):
     """Extended user profile with game statistics."""
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -15,6 +17,12 @@ class UserProfile(models.Model):
     best_score_easy = models.IntegerField(default=0, null=True, blank=True)
     best_score_moderate = models.IntegerField(default=0, null=True, blank=True)
     best_score_expert = models.IntegerField(default=0, null=True, blank=True)
+    # Lower-cased copy of user.email; the unique index enforces case-insensitive
+    # email uniqueness, which auth_user.email itself does not.
+    email_normalized = models.CharField(max_length=254, unique=True, null=True, blank=True, editable=False)
+    # Lower-cased copy of user.username, indexed for case-insensitive prefix
+    # search (plus a trigram index for substring search on PostgreSQL).
+    username_normalized = models.CharField(max_length=150, blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -23,6 +31,9 @@ class UserProfile(models.Model):
         verbose_name = 'User Profile'
         verbose_name_plural = 'User Profiles'
         ordering = ['-best_score']
+        indexes = [
+            models.Index(fields=['username_normalized'], name='users_profile_username_idx'),
+        ]
 
     def __str__(self) -> str:
         """String representation of UserProfile."""
@@ -46,16 +57,90 @@ class UserProfile(models.Model):
             setattr(self, difficulty_field, score)
         self.save()
 
+    def record_game(self, game) -> None:
+        """Count a finished game towards the profile statistics."""
+        self.total_games_played += 1
+        if game.is_won:
+            self.total_wins += 1
+            self.update_best_score(game.score, game.difficulty_level)
+        else:
+            self.save()
+
+    async def arecord_game(self, game) -> None:
+        """Count a finished game towards the profile statistics (async)."""
+        await sync_to_async(self.record_game)(game)
+
+    @classmethod
+    def search_user_ids(cls, query: str, limit: int) -> list[int]:
+        """Ids of users whose username starts with ``query``, case-insensitively.
+
+        Prefix matches are an index range scan on ``username_normalized``. On
+        PostgreSQL, remaining slots are filled with substring matches served
+        by the trigram index.
+        """
+        term = query.strip().lower()
+        if not term:
+            return []
+        user_ids = list(
+            cls.objects.filter(username_normalized__gte=term, username_normalized__lt=term + '\uffff')
+            .order_by('username_normalized')
+            .values_list('user_id', flat=True)[:limit]
+        )
+        if len(user_ids) < limit and len(term) >= 3 and connection.vendor == 'postgresql':
+            user_ids += (
+                cls.objects.filter(username_normalized__contains=term)
+                .exclude(user_id__in=user_ids)
+                .order_by('username_normalized')
+                .values_list('user_id', flat=True)[:limit - len(user_ids)]
+            )
+        return user_ids
+
+    @classmethod
+    def username_matches(cls, query: str) -> models.QuerySet:
+        """User ids, as a subquery, of every user whose username contains ``query``, case-insensitively.
+
+        On PostgreSQL the match is served by the trigram index.
+        """
+        return cls.objects.filter(username_normalized__contains=query.strip().lower()).values('user_id')
+
+
+def normalize_email(email: str) -> str | None:
+    """Normalize an email for the case-insensitive unique index (None if blank)."""
+    return (email or '').strip().lower() or None
+
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """Create UserProfile when a User is created."""
     if created:
-        UserProfile.objects.create(user=instance)
+        UserProfile.objects.create(
+            user=instance,
+            email_normalized=normalize_email(instance.email),
+            username_normalized=instance.username.lower(),
+        )
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save UserProfile when User is saved."""
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+def save_user_profile(sender, instance, created, update_fields=None, **kwargs):
+    """Save UserProfile when User is saved and the profile has changed."""
+    # Partial user saves that leave the email and username alone (e.g. the
+    # last_login update on every login) never carry profile changes, and a
+    # profile that was never loaded can only need those copies refreshed.
+    if update_fields is not None and not {'email', 'username'} & set(update_fields):
+        return
+    normalized = {
+        'email_normalized': normalize_email(instance.email),
+        'username_normalized': instance.username.lower(),
+    }
+    profile_rel = User.profile.related
+    if not profile_rel.is_cached(instance):
+        if not created:
+            UserProfile.objects.filter(user=instance).exclude(**normalized).update(**normalized)
+        return
+    profile = profile_rel.get_cached_value(instance)
+    if profile is None:
+        return
+    for field, value in normalized.items():
+        setattr(profile, field, value)
+    if profile.is_dirty():
+        profile.save()
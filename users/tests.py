@@ -1,3 +1,186 @@
+"""Tests for users app."""
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from games.archive import archive_chunk
+from games.models import Game
+from .forms import EMAIL_IN_USE_MESSAGE, ProfileEditForm, UserRegistrationForm
+from .models import UserProfile
+
+
+class AdminPlayerSearchTests(TestCase):
+    """Admin search matches usernames and the original search fields."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create an admin and two players with games."""
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.alice = User.objects.create_user('Alice', 'alice@example.com', 'pw', last_name='Liddell')
+        cls.bob = User.objects.create_user('bob', 'robert@example.org', 'pw')
+        for user in (cls.alice, cls.bob):
+            Game.objects.create(user=user, difficulty_level='easy', target_number=5)
+
+    def setUp(self):
+        """Log in as the admin."""
+        self.client.force_login(self.admin)
+
+    def search(self, url_name: str, term: str) -> set:
+        """Primary keys of the changelist rows matching a search term."""
+        response = self.client.get(reverse(url_name), {'q': term})
+        return {obj.pk for obj in response.context['cl'].result_list}
+
+    def test_user_search(self):
+        """Users are found by username substring, email and name."""
+        self.assertEqual(self.search('admin:auth_user_changelist', 'lic'), {self.alice.pk})
+        self.assertEqual(self.search('admin:auth_user_changelist', 'robert@example.org'), {self.bob.pk})
+        self.assertEqual(self.search('admin:auth_user_changelist', 'liddell'), {self.alice.pk})
+
+    def test_game_search(self):
+        """Games are found by their player's username or email."""
+        alice_games = set(self.alice.games.values_list('pk', flat=True))
+        self.assertEqual(self.search('admin:games_game_changelist', 'ALI'), alice_games)
+        self.assertEqual(self.search('admin:games_game_changelist', 'alice@example.com'), alice_games)
+
+
+class RebuildProfileStatsTests(TestCase):
+    """Profile statistics are recomputed from hot and archived games, resuming from the watermark."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create two players with wins, a loss and a game in play."""
+        cls.alice = User.objects.create_user('alice', password='pw')
+        cls.bob = User.objects.create_user('bob', password='pw')
+        Game.objects.create(user=cls.alice, difficulty_level='easy', target_number=5,
+                            attempts_made=1, is_won=True, score=1000)
+        Game.objects.create(user=cls.alice, difficulty_level='expert', target_number=5,
+                            attempts_made=3, is_won=True, score=800)
+        Game.objects.create(user=cls.alice, difficulty_level='easy', target_number=5, attempts_made=10)
+        Game.objects.create(user=cls.alice, difficulty_level='easy', target_number=5, attempts_made=2)
+        Game.objects.create(user=cls.bob, difficulty_level='moderate', target_number=5,
+                            attempts_made=2, is_won=True, score=900)
+
+    def setUp(self):
+        """Use a temporary watermark file and start from stale statistics."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.watermark = Path(directory.name) / 'watermark.json'
+        UserProfile.objects.update(total_games_played=99, total_wins=99, best_score=1)
+
+    def rebuild(self, *args: str) -> str:
+        """Run the rebuild with one user per range and return its output."""
+        out = StringIO()
+        call_command('rebuild_profile_stats', '--chunk-size', '1', '--watermark-file', str(self.watermark),
+                     *args, stdout=out)
+        return out.getvalue()
+
+    def stats(self, user: User) -> tuple:
+        """Games played, wins and best scores of a player."""
+        return UserProfile.objects.filter(user=user).values_list(
+            'total_games_played', 'total_wins', 'best_score',
+            'best_score_easy', 'best_score_moderate', 'best_score_expert',
+        ).get()
+
+    def test_rebuild(self):
+        """Finished games, wins and best scores are counted; games in play are not."""
+        self.assertIn('Rebuilt statistics for 2 profiles.', self.rebuild())
+        self.assertEqual(self.stats(self.alice), (3, 2, 1000, 1000, 0, 800))
+        self.assertEqual(self.stats(self.bob), (1, 1, 900, 0, 900, 0))
+        self.assertFalse(self.watermark.exists())
+
+    def test_archived_games_are_counted(self):
+        """Games moved to the archive still count towards the statistics."""
+        now = timezone.now()
+        Game.objects.filter(user=self.alice).exclude(attempts_made=2).update(completed_at=now)
+        self.assertEqual(len(archive_chunk(now + timedelta(days=1), 10, include_wins=True)), 3)
+        self.rebuild()
+        self.assertEqual(self.stats(self.alice), (3, 2, 1000, 1000, 0, 800))
+
+    def test_resume_from_watermark(self):
+        """With --resume, users up to the watermark are left as they are."""
+        self.watermark.write_text(json.dumps({'last_user_id': self.alice.pk}))
+        self.assertIn('Rebuilt statistics for 1 profiles.', self.rebuild('--resume'))
+        self.assertEqual(self.stats(self.alice)[:2], (99, 99))
+        self.assertEqual(self.stats(self.bob), (1, 1, 900, 0, 900, 0))
+        self.assertFalse(self.watermark.exists())
+
+    def test_resume_when_finished(self):
+        """Resuming past the last user rebuilds nothing."""
+        self.watermark.write_text(json.dumps({'last_user_id': self.bob.pk}))
+        self.assertEqual(self.rebuild('--resume'), 'Profile statistics are already rebuilt.\n')
+        self.assertEqual(self.stats(self.bob)[:2], (99, 99))
+
+
+class UniqueEmailTests(TestCase):
+    """Emails are unique regardless of case, through the indexed profile column."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a player with an email."""
+        cls.alice = User.objects.create_user('alice', 'alice@example.com', 'pw')
+
+    def setUp(self):
+        """Start from full rate-limit buckets."""
+        cache.clear()
+
+    def registration(self, username: str, email: str) -> UserRegistrationForm:
+        """Build a registration form with a valid password."""
+        return UserRegistrationForm({
+            'username': username, 'email': email, 'password1': 'correct horse', 'password2': 'correct horse',
+        })
+
+    def test_profile_column_is_normalized(self):
+        """The profile keeps the lower-cased email, and the index rejects a duplicate in another case."""
+        self.assertEqual(self.alice.profile.email_normalized, 'alice@example.com')
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user('alice2', 'ALICE@example.com', 'pw')
+
+    def test_registration_rejects_duplicate_in_other_case(self):
+        """Registering with another case of a used email is a form error."""
+        form = self.registration('bob', 'Alice@Example.COM')
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['email'], [EMAIL_IN_USE_MESSAGE])
+        self.assertTrue(self.registration('bob', 'bob@example.com').is_valid())
+
+    def test_profile_edit(self):
+        """Players may change the case of their own email but not take someone else's."""
+        bob = User.objects.create_user('bob', 'bob@example.com', 'pw')
+        self.assertTrue(ProfileEditForm({'email': 'ALICE@example.com'}, instance=self.alice).is_valid())
+        form = ProfileEditForm({'email': 'ALICE@example.com'}, instance=bob)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['email'], [EMAIL_IN_USE_MESSAGE])
+
+    def test_email_claimed_after_validation(self):
+        """Losing the race for an email after validation becomes a form error instead of a 500."""
+        form = self.registration('bob', 'carol@example.com')
+        self.assertTrue(form.is_valid())
+        User.objects.create_user('carol', 'Carol@Example.com', 'pw')
+        self.assertIsNone(form.save())
+        self.assertEqual(form.errors['email'], [EMAIL_IN_USE_MESSAGE])
+        self.assertFalse(User.objects.filter(username='bob').exists())
+
+    def test_other_integrity_errors_are_raised(self):
+        """Unique-constraint failures unrelated to the email are not reported as one."""
+        form = self.registration('bob', 'bob@example.com')
+        self.assertTrue(form.is_valid())
+        User.objects.create_user('bob', 'robert@example.com', 'pw')
+        with self.assertRaises(IntegrityError):
+            form.save()
 
-# Create your tests here.
+    def test_register_view(self):
+        """The registration page shows the duplicate email error."""
+        response = self.client.post(reverse('users:register'), {
+            'username': 'bob', 'email': 'ALICE@EXAMPLE.COM', 'password1': 'correct horse', 'password2': 'correct horse',
+        })
+        self.assertContains(response, EMAIL_IN_USE_MESSAGE)
+        self.assertFalse(User.objects.filter(username='bob').exists())
@@ -8,7 +8,8 @@ from django.contrib import messages
 from django.urls import reverse_lazy
 from .forms import UserRegistrationForm, ProfileEditForm
 from .models import UserProfile
-from games.models import Game
+from games.archive import average_attempts_per_win, recent_games
+from games.models import Game, ScoreBucket
 
 
 class CustomLoginView(LoginView):
@@ -39,8 +40,7 @@ def register_view(request):
     
     if request.method == 'POST':
         form = UserRegistrationForm(request.POST)
-        if form.is_valid():
-            user = form.save()
+        if form.is_valid() and form.save() is not None:
             messages.success(request, 'Registration successful! Please log in.')
             return redirect('users:login')
     else:
@@ -64,17 +64,16 @@ class ProfileView(DetailView):
         context = super().get_context_data(**kwargs)
         profile = self.get_object()
         
-        # Get recent games
-        recent_games = Game.objects.filter(user=self.request.user).select_related('user')[:10]
-        context['recent_games'] = recent_games
+        # Get recent games, including archived ones
+        context['recent_games'] = recent_games(self.request.user, 10)
         
         # Calculate average attempts per win
-        won_games = Game.objects.filter(user=self.request.user, is_won=True)
-        if won_games.exists():
-            total_attempts = sum(game.attempts_made for game in won_games)
-            context['avg_attempts_per_win'] = round(total_attempts / won_games.count(), 2)
-        else:
-            context['avg_attempts_per_win'] = 0
+        context['avg_attempts_per_win'] = average_attempts_per_win(self.request.user)
+
+        context['best_score_percentiles'] = {
+            difficulty: ScoreBucket.percent_beaten(difficulty, getattr(profile, f'best_score_{difficulty}') or None)
+            for difficulty in Game.DIFFICULTY_RANGES
+        }
         
         return context
 
@@ -91,5 +90,7 @@ class ProfileEditView(UpdateView):
 
     def form_valid(self, form):
         """Handle successful form submission."""
+        if form.save() is None:
+            return self.form_invalid(form)
         messages.success(self.request, 'Profile updated successfully!')
-        return super().form_valid(form)
+        return redirect(self.get_success_url())